@@ -3,14 +3,15 @@ Flask 메인 애플리케이션
 실시간 형태 탐지 및 AR 오버레이 웹 애플리케이션
 """
 import os
-import cv2
-import base64
-import numpy as np
-from flask import Flask, render_template, request, jsonify
-from flask_socketio import SocketIO, emit
-from shape_detector import ShapeDetector
-from video_overlay import VideoOverlay
-from hand_detector import HandDetector
+import threading
+import time
+from flask import Flask, Response, render_template, request, jsonify
+from flask_socketio import SocketIO
+from worker_pool import WorkerPool
+from socket_events import SocketEvents
+from metrics import MetricsRegistry
+from warmup import WarmupStatus
+import event_log
 
 # Flask 앱 초기화
 app = Flask(__name__)
@@ -19,62 +20,222 @@ app.config['SECRET_KEY'] = 'shadow-puppet-secret-key-2025'
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
 
 # 전역 변수
-shape_detector = None
-video_overlay = None
-hand_detector = None
-white_background_mode = False  # 흰색 배경 모드 (손 스켈레톤만 표시)
-mirror_mode = True  # 좌우반전 모드 (거울처럼 보이기)
+# 클라이언트별 파이프라인(감지기/오버레이/표시 모드)은 세션 관리자가 보관
+# (워커 모드에서는 WorkerPool이 같은 인터페이스로 워커 프로세스에 위임)
+session_manager = None
+
+# 프레임 처리 단계별 시간 및 프레임 수 지표 (/api/metrics)
+metrics_registry = MetricsRegistry()
+
+# 백그라운드 감지기 초기화(워밍업) 진행 상황
+warmup_status = WarmupStatus()
+_warmup_lock = threading.Lock()
+
+# 유휴 세션 정리 작업 시작 여부 (서버 실행 방식과 관계없이 한 번만 시작)
+_reaper_started = False
+_reaper_lock = threading.Lock()
 
 # 파일 경로
 REFERENCE_IMAGE_PATH = 'files/rabbit reference.png'
 VIDEO_PATH = 'files/rabbit bg.mov'
 
+# 형태 라이브러리 폴더 (지정하면 폴더 안의 참조 이미지도 함께 인식하고,
+# 탐지 결과의 shape_name으로 일치한 형태 이름(파일 이름)을 알려줌)
+REFERENCE_LIBRARY_DIR = os.environ.get('SHADOW_PUPPET_REFERENCE_DIR') or None
+
+# 윤곽선 탐색 피라미드 단계 (0이면 끔, 1이면 1/2 축소 이미지에서 후보를 찾고
+# 후보 영역만 원래 해상도로 다듬음, 고해상도 프레임에서 이진화 비용 절감)
+PYRAMID_LEVELS = int(os.environ.get('SHADOW_PUPPET_PYRAMID_LEVELS', '0'))
+
+# 지연 보상 자세 예측 (1이면 EMA 대신 등속도 칼만 필터로 추적하고, 클라이언트가 보고한
+# 왕복 시간 뒤에 표시될 자세를 예측해 3D 모델이 그림자보다 늦게 따라오는 현상을 줄임)
+MOTION_PREDICTION = os.environ.get('SHADOW_PUPPET_MOTION_PREDICTION', '0') == '1'
+
+# 세션 설정
+SESSION_IDLE_TIMEOUT = 300  # 유휴 세션 제거 시간 (초)
+SESSION_REAP_INTERVAL = 30  # 유휴 세션 검사 주기 (초)
+HAND_DETECTOR_POOL_SIZE = 4  # 재사용할 MediaPipe 손 감지기 최대 개수
+
+# 워커 프로세스 수 (0이면 서버 프로세스에서 직접 처리)
+# 1 이상이면 세션마다 전용 워커 프로세스에 배정하여 여러 코어를 사용
+WORKER_PROCESSES = int(os.environ.get('SHADOW_PUPPET_WORKERS', '0'))
+
+# 세션 녹화 폴더 (지정하면 세션마다 수신 프레임/제어 이벤트를 .sprec 파일로 기록,
+# replay_benchmark.py로 재생)
+RECORD_DIR = os.environ.get('SHADOW_PUPPET_RECORD_DIR') or None
+
+# 적응형 품질 조절 목표 FPS (기본 0: 끄고 고정 품질 사용, 예: 15로 켜기)
+# 처리/왕복 시간이 목표를 넘으면 캡처 해상도, JPEG 품질, 전송 간격을 단계적으로 낮춤
+TARGET_FPS = float(os.environ.get('SHADOW_PUPPET_TARGET_FPS', '0')) or None
 
-def initialize_detector():
+# 로그 레벨 (DEBUG면 제어 이벤트 값까지 기록)
+# 로그는 큐에 넣고 백그라운드 스레드가 출력하며, 최근 이벤트는 /api/logs로 조회
+LOG_LEVEL = os.environ.get('SHADOW_PUPPET_LOG_LEVEL', 'INFO').upper()
+event_log.setup_logging(LOG_LEVEL)
+log = event_log.get_logger('app')
+
+
+def initialize_detector(progress=None):
     """
-    형태 감지기, 비디오 오버레이, 손 감지기 초기화
+    형태 감지기, 비디오 오버레이, 손 감지기 초기화 및 첫 추론 워밍업
+    
+    여기서 만든 인스턴스는 세션별 감지기의 템플릿으로 사용되며,
+    참조 윤곽선과 비디오 정보는 모든 세션이 공유합니다.
+    OpenCV/MediaPipe는 무거우므로 서버 시작을 늦추지 않도록 여기서 임포트합니다.
+    
+    Args:
+        progress: progress(진행률, 단계 설명) 형태의 진행 보고 함수 (선택적)
     """
-    global shape_detector, video_overlay, hand_detector
+    global session_manager
+    
+    if progress is None:
+        progress = lambda fraction, message: None
     
     try:
         # 파일 존재 확인
         if not os.path.exists(REFERENCE_IMAGE_PATH):
-            print(f"경고: 참조 이미지를 찾을 수 없습니다: {REFERENCE_IMAGE_PATH}")
-            print("files/ 폴더에 'rabbit reference.png' 파일을 추가해주세요.")
+            log.warning('missing_file', "참조 이미지를 찾을 수 없습니다. files/ 폴더에 'rabbit reference.png' 파일을 추가해주세요.",
+                        path=REFERENCE_IMAGE_PATH)
             return False
         
         if not os.path.exists(VIDEO_PATH):
-            print(f"경고: 비디오 파일을 찾을 수 없습니다: {VIDEO_PATH}")
-            print("files/ 폴더에 'rabbit bg.mov' 파일을 추가해주세요.")
+            log.warning('missing_file', "비디오 파일을 찾을 수 없습니다. files/ 폴더에 'rabbit bg.mov' 파일을 추가해주세요.",
+                        path=VIDEO_PATH)
             return False
         
+        # 워커 모드: 감지기는 각 워커 프로세스 안에서 생성
+        if WORKER_PROCESSES > 0:
+            progress(0.1, f'워커 프로세스 {WORKER_PROCESSES}개 시작 중')
+            pool = WorkerPool(
+                WORKER_PROCESSES,
+                REFERENCE_IMAGE_PATH,
+                VIDEO_PATH,
+                library_dir=REFERENCE_LIBRARY_DIR,
+                pyramid_levels=PYRAMID_LEVELS,
+                motion_prediction=MOTION_PREDICTION,
+                idle_timeout=SESSION_IDLE_TIMEOUT,
+                max_pool_size=HAND_DETECTOR_POOL_SIZE
+            )
+            pool.start()
+            
+            progress(0.8, '첫 추론 워밍업 중')
+            _warm_up_inference(pool, [f'__warmup_{index}__' for index in range(WORKER_PROCESSES)])
+            session_manager = pool
+            log.info('init_workers', '워커 프로세스 초기화 완료', workers=WORKER_PROCESSES)
+            return True
+        
+        progress(0.05, '모듈 로드 중')
+        from shape_detector import ShapeDetector
+        from video_overlay import VideoOverlay
+        from hand_detector import HandDetector
+        from session_manager import SessionManager
+        
         # 형태 감지기 초기화
-        shape_detector = ShapeDetector(REFERENCE_IMAGE_PATH)
-        print("✓ 형태 감지기 초기화 완료")
+        progress(0.2, '형태 감지기 초기화 중')
+        shape_detector = ShapeDetector(
+            REFERENCE_IMAGE_PATH, REFERENCE_LIBRARY_DIR, PYRAMID_LEVELS, MOTION_PREDICTION
+        )
+        log.info('init_shape_detector', '형태 감지기 초기화 완료', shapes=shape_detector.library.names)
         
         # 비디오 오버레이 초기화
+        progress(0.3, '비디오 오버레이 초기화 중')
         video_overlay = VideoOverlay(VIDEO_PATH)
-        print("✓ 비디오 오버레이 초기화 완료")
+        log.info('init_video_overlay', '비디오 오버레이 초기화 완료')
         
         # 손 감지기 초기화
+        progress(0.6, '손 감지기(MediaPipe) 초기화 중')
         hand_detector = HandDetector()
-        print("✓ 손 감지기 초기화 완료")
+        log.info('init_hand_detector', '손 감지기 초기화 완료')
         
-        return True
+        # 세션 관리자 초기화 (첫 손 감지기는 풀에 넣어 첫 세션이 재사용)
+        manager = SessionManager(
+            shape_detector,
+            video_overlay,
+            HandDetector,
+            idle_timeout=SESSION_IDLE_TIMEOUT,
+            max_pool_size=HAND_DETECTOR_POOL_SIZE
+        )
+        manager.add_to_pool(hand_detector)
+        
+        # 첫 추론 워밍업 (워밍업한 손 감지기는 풀로 돌아가 첫 클라이언트가 재사용)
+        progress(0.8, '첫 추론 워밍업 중')
+        _warm_up_inference(manager, ['__warmup__'])
+        session_manager = manager
+        log.info('init_session_manager', '세션 관리자 초기화 완료')
         
+        return True
+    
     except Exception as e:
-        print(f"초기화 오류: {e}")
+        log.error('init_error', '초기화 오류', error=str(e))
         return False
 
 
+def _warm_up_inference(engine, sids):
+    """
+    빈 프레임으로 전체 파이프라인을 한 번씩 실행 (첫 클라이언트의 지연 방지)
+    
+    Args:
+        engine: SessionManager 또는 WorkerPool
+        sids: 워밍업용 세션 ID 목록 (워커 모드에서는 워커마다 하나)
+    """
+    import cv2
+    import numpy as np
+    
+    frame = np.full((480, 640, 3), 255, np.uint8)
+    _, buffer = cv2.imencode('.jpg', frame)
+    image_bytes = buffer.tobytes()
+    
+    for sid in sids:
+        engine.process_frame(sid, image_bytes)
+    for sid in sids:
+        engine.release(sid)
+
+
+def start_warmup(events):
+    """
+    백그라운드 스레드에서 감지기 초기화 시작 (이미 시작했으면 무시)
+    
+    서버는 바로 연결을 받고, 진행 상황은 /api/status와 status 이벤트로 알립니다.
+    
+    Args:
+        events: 진행 상황을 클라이언트에 알릴 SocketEvents
+    """
+    with _warmup_lock:
+        # 진행 중이거나 완료되었으면 무시 (실패한 경우 파일 추가 후 다시 시도)
+        if warmup_status.state in ('loading', 'ready'):
+            return
+        warmup_status.update(0.0, '초기화 시작')
+    
+    warmup_status.add_listener(events.broadcast_status)
+    events.broadcast_status()
+    
+    def run():
+        started = time.time()
+        if initialize_detector(warmup_status.update):
+            warmup_status.finish(True, f'준비 완료 ({time.time() - started:.1f}초)')
+        else:
+            warmup_status.finish(False, '초기화 실패 - 필수 파일과 서버 로그를 확인해주세요.')
+    
+    threading.Thread(target=run, name='detector-warmup', daemon=True).start()
+
+
+def get_status():
+    """
+    status 이벤트 데이터 (준비 여부 + 워밍업 진행 상황)
+    """
+    return {
+        'ready': session_manager is not None,
+        'warmup': warmup_status.snapshot()
+    }
+
+
 @app.route('/')
 def index():
     """
     메인 페이지
     """
-    # 감지기가 초기화되지 않았으면 시도
-    if shape_detector is None or video_overlay is None:
-        initialize_detector()
+    # 워밍업이 시작되지 않았으면 시작 (app.py 외의 WSGI 서버로 실행한 경우)
+    start_warmup(socket_events)
     
     return render_template('index.html')
 
@@ -84,293 +245,116 @@ def status():
     """
     애플리케이션 상태 확인
     """
-    is_ready = shape_detector is not None and video_overlay is not None
+    is_ready = session_manager is not None
     
     return jsonify({
         'ready': is_ready,
+        'warmup': warmup_status.snapshot(),
         'reference_image': os.path.exists(REFERENCE_IMAGE_PATH),
-        'video_file': os.path.exists(VIDEO_PATH)
+        'video_file': os.path.exists(VIDEO_PATH),
+        'active_sessions': len(session_manager) if is_ready else 0
     })
 
 
-@socketio.on('connect')
-def handle_connect():
+@app.route('/api/metrics')
+def metrics():
     """
-    클라이언트 연결
+    성능 지표 (Prometheus 텍스트 형식)
+    - 단계별 소요 시간 분위수(p50/p95/p99), 전체 및 세션별
+    - 수신/드롭/처리 프레임 수, 활성 세션 수
     """
-    print(f"클라이언트 연결: {request.sid}")
+    active_sessions = len(session_manager) if session_manager is not None else 0
     
-    # 초기화 상태 전송
-    is_ready = shape_detector is not None and video_overlay is not None
-    emit('status', {'ready': is_ready})
+    return Response(
+        metrics_registry.render_prometheus({'active_sessions': active_sessions}),
+        mimetype='text/plain; version=0.0.4'
+    )
 
 
-@socketio.on('disconnect')
-def handle_disconnect():
+@app.route('/api/logs')
+def logs():
     """
-    클라이언트 연결 해제
+    최근 로그 이벤트 (JSON)
+    - limit: 최대 개수 (기본 100)
+    - level: 최소 레벨 (DEBUG / INFO / WARNING / ERROR)
     """
-    print(f"클라이언트 연결 해제: {request.sid}")
+    limit = request.args.get('limit', 100, type=int)
+    level = request.args.get('level', 'NOTSET')
+    
+    return jsonify({'events': event_log.recent_events(limit, level)})
 
 
-@socketio.on('video_frame')
-def handle_video_frame(data):
+def _emit_to(event, payload, to):
     """
-    비디오 프레임 처리
-    
-    Args:
-        data: {
-            'image': base64 인코딩된 이미지 데이터
-        }
+    세션에 이벤트 전송 (요청 컨텍스트 밖의 스레드에서도 사용 가능)
     """
-    global shape_detector, video_overlay, hand_detector
-    
-    # 초기화 확인
-    if shape_detector is None or video_overlay is None or hand_detector is None:
-        emit('error', {'message': '시스템이 초기화되지 않았습니다.'})
-        return
-    
-    try:
-        # Base64 디코딩
-        image_data = data.get('image', '')
-        if not image_data:
-            return
-        
-        # Data URL에서 실제 base64 데이터 추출
-        if ',' in image_data:
-            image_data = image_data.split(',')[1]
-        
-        # Base64 -> 바이트
-        image_bytes = base64.b64decode(image_data)
-        
-        # 바이트 -> NumPy 배열 -> OpenCV 이미지
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        if frame is None:
-            emit('error', {'message': '프레임 디코딩 실패'})
-            return
-        
-        # 좌우반전 (거울 모드)
-        if mirror_mode:
-            frame = cv2.flip(frame, 1)
-        
-        # 손 탐지
-        hand_result = hand_detector.detect(frame)
-        
-        # 충돌 감지 (먼저 형태를 탐지하여 위치 확인)
-        temp_detection = shape_detector.detect(frame)
-        hand_collision_data = None
-        
-        # 탭 감지 플래그
-        tap_detected = False
-        tap_position = None
-        
-        if temp_detection['found'] and temp_detection['frame_corners'] is not None:
-            # 토끼 중심 좌표도 함께 전달
-            rabbit_center = temp_detection.get('center')
-            collision_result = hand_detector.check_collision(
-                hand_result['hand_centers'],
-                temp_detection['frame_corners'],
-                rabbit_center
-            )
-            if collision_result['collision']:
-                hand_collision_data = collision_result
-            
-            # 검지 탭 감지
-            index_tips = hand_result.get('index_finger_tips', [])
-            if hand_detector.check_index_tap(index_tips, temp_detection['frame_corners']):
-                tap_detected = True
-                # 터치 위치 저장 (첫 번째 검지)
-                if index_tips:
-                    tap_position = index_tips[0]
-        
-        # 형태 탐지 (손 충돌 데이터 포함)
-        detection_result = shape_detector.detect(frame, hand_collision_data)
-        
-        # 결과 프레임 생성
-        if white_background_mode:
-            # 흰색 배경 모드: 웹캠 화면 대신 흰색 배경
-            result_frame = np.full_like(frame, 255)  # 흰색 배경
-        else:
-            # 일반 모드: 웹캠 프레임 복사 + 명도/채도 조정
-            result_frame = frame.copy()
-            result_frame = shape_detector.apply_brightness_saturation(result_frame)
-        
-        # 손가락 관절(랜드마크) 그리기
-        if hand_result['landmarks']:
-            result_frame = hand_detector.draw_landmarks(result_frame, hand_result['landmarks'])
-        
-        # 비디오 오버레이 비활성화 - 3D 모델(Three.js)만 사용
-        # if (detection_result['found'] and 
-        #     detection_result['frame_corners'] is not None and
-        #     not detection_result.get('is_pushed_off_screen', False)):
-        #     result_frame = video_overlay.overlay(result_frame, detection_result['frame_corners'])
-        
-        # 결과 프레임을 Base64로 인코딩 (품질 70으로 낮춤 - 속도 향상)
-        _, buffer = cv2.imencode('.jpg', result_frame, [cv2.IMWRITE_JPEG_QUALITY, 70])
-        result_base64 = base64.b64encode(buffer).decode('utf-8')
-        
-        # 결과 전송
-        emit('processed_frame', {
-            'image': f'data:image/jpeg;base64,{result_base64}',
-            'detection': {
-                'found': detection_result['found'],
-                'is_locked': detection_result['is_locked'],
-                'is_permanently_active': detection_result.get('is_permanently_active', False),
-                'score': detection_result['score'],
-                'center': detection_result['center'],
-                'angle': detection_result['angle'],
-                'scale': detection_result['scale'],
-                'is_grabbed': detection_result.get('is_grabbed', False),
-                'is_pushed_off_screen': detection_result.get('is_pushed_off_screen', False),
-                'drag_offset': detection_result.get('drag_offset', (0, 0)),
-                'is_flipped': video_overlay.is_flipped
-            },
-            'hands': {
-                'found': hand_result['hands_found'],
-                'count': len(hand_result['hand_centers']),
-                'index_tips': hand_result.get('index_finger_tips', []),
-                'tap_detected': tap_detected,
-                'tap_position': tap_position,
-                'palm_detected': hand_result.get('palm_detected', False),
-                'palm_center': hand_result.get('palm_center', None),
-                'pinch_active': hand_result.get('pinch_active', False),
-                'pinch_scale': hand_result.get('pinch_scale', 1.0),
-                'pinch_distance': hand_result.get('pinch_distance', 0),
-                'index_only_detected': hand_result.get('index_only_detected', False),
-                'index_only_tip': hand_result.get('index_only_tip', None)
-            }
-        })
-        
-    except Exception as e:
-        print(f"프레임 처리 오류: {e}")
-        emit('error', {'message': f'프레임 처리 오류: {str(e)}'})
+    socketio.emit(event, payload, to=to)
+
+
+# 이벤트 처리 로직 (asgi_app.py의 asyncio 서버와 공유)
+socket_events = SocketEvents(
+    lambda: session_manager,
+    _emit_to,
+    metrics_registry,
+    RECORD_DIR,
+    get_status,
+    TARGET_FPS
+)
 
 
-@socketio.on('set_adjustment')
-def handle_set_adjustment(data):
+@socketio.on('connect')
+def handle_connect():
     """
-    명도/채도 조정 파라미터 설정
-    
-    Args:
-        data: {
-            'brightness': int (-100 ~ +100),
-            'saturation': int (-100 ~ +100)
-        }
+    클라이언트 연결
     """
-    global shape_detector
-    
-    if shape_detector is None:
-        emit('error', {'message': '형태 감지기가 초기화되지 않았습니다.'})
-        return
-    
-    try:
-        # 조정 값 로깅
-        print(f"🎨 명도/채도 조정: brightness={data.get('brightness')}, "
-              f"saturation={data.get('saturation')}")
-        
-        shape_detector.set_adjustment(
-            brightness=data.get('brightness'),
-            saturation=data.get('saturation')
-        )
-        
-        emit('adjustment_updated', {'success': True})
-        
-    except Exception as e:
-        print(f"명도/채도 조정 오류: {e}")
-        emit('error', {'message': f'명도/채도 조정 오류: {str(e)}'})
+    start_session_reaper()
+    socket_events.on_connect(request.sid)
 
 
-@socketio.on('reset_detector')
-def handle_reset_detector():
+@socketio.on('disconnect')
+def handle_disconnect():
     """
-    형태 감지기 리셋
+    클라이언트 연결 해제
     """
-    global shape_detector, video_overlay
-    
-    if shape_detector:
-        shape_detector.reset()
-    
-    if video_overlay:
-        video_overlay.reset()
-    
-    emit('detector_reset', {'success': True})
+    socket_events.on_disconnect(request.sid)
 
 
-@socketio.on('set_thresholds')
-def handle_set_thresholds(data):
+def session_reaper():
     """
-    히스테리시스 임계값 설정
-    
-    Args:
-        data: {
-            'threshold_enter': float,
-            'threshold_exit': float
-        }
+    유휴 세션 정리 백그라운드 작업
     """
-    global shape_detector
-    
-    if shape_detector is None:
-        emit('error', {'message': '형태 감지기가 초기화되지 않았습니다.'})
-        return
-    
-    try:
-        if 'threshold_enter' in data:
-            shape_detector.threshold_enter = float(data['threshold_enter'])
-        
-        if 'threshold_exit' in data:
-            shape_detector.threshold_exit = float(data['threshold_exit'])
-        
-        emit('thresholds_updated', {'success': True})
-        
-    except Exception as e:
-        print(f"임계값 설정 오류: {e}")
-        emit('error', {'message': f'임계값 설정 오류: {str(e)}'})
+    while True:
+        socketio.sleep(SESSION_REAP_INTERVAL)
+        socket_events.reap_idle_sessions()
 
 
-@socketio.on('set_white_background')
-def handle_set_white_background(data):
+def start_session_reaper():
     """
-    흰색 배경 모드 설정 (웹캠 배경 숨기고 손 스켈레톤만 표시)
+    유휴 세션 정리 작업 시작 (이미 시작했으면 무시)
     
-    Args:
-        data: {
-            'enabled': bool
-        }
+    직접 실행(__main__)하지 않고 gunicorn 등 외부 WSGI 서버가 app을 임포트해 구동해도
+    정리되도록 첫 클라이언트 연결에서도 호출합니다.
     """
-    global white_background_mode
-    
-    try:
-        white_background_mode = data.get('enabled', False)
-        print(f"🎨 흰색 배경 모드: {'활성화' if white_background_mode else '비활성화'}")
-        emit('white_background_updated', {'enabled': white_background_mode})
-        
-    except Exception as e:
-        print(f"흰색 배경 모드 설정 오류: {e}")
-        emit('error', {'message': f'흰색 배경 모드 설정 오류: {str(e)}'})
+    global _reaper_started
+    with _reaper_lock:
+        if _reaper_started:
+            return
+        _reaper_started = True
+    socketio.start_background_task(session_reaper)
 
 
-@socketio.on('set_mirror_mode')
-def handle_set_mirror_mode(data):
+def _register_event(event):
     """
-    좌우반전(거울) 모드 설정
-    
-    Args:
-        data: {
-            'enabled': bool
-        }
+    Socket.IO 이벤트를 SocketEvents의 on_<event> 메서드에 연결
     """
-    global mirror_mode
+    def dispatch(data=None):
+        socket_events.dispatch(request.sid, event, data)
     
-    try:
-        mirror_mode = data.get('enabled', True)
-        print(f"🪞 거울 모드: {'활성화' if mirror_mode else '비활성화'}")
-        emit('mirror_mode_updated', {'enabled': mirror_mode})
-        
-    except Exception as e:
-        print(f"거울 모드 설정 오류: {e}")
-        emit('error', {'message': f'거울 모드 설정 오류: {str(e)}'})
+    socketio.on_event(event, dispatch)
+
+
+for _event in SocketEvents.EVENTS:
+    _register_event(_event)
 
 
 if __name__ == '__main__':
@@ -383,21 +367,26 @@ if __name__ == '__main__':
     os.makedirs('uploads', exist_ok=True)
     os.makedirs('static/images', exist_ok=True)
     
-    # 초기화
-    print("\n시스템 초기화 중...")
-    initialized = initialize_detector()
-    
-    if not initialized:
+    # 필수 파일 확인 (감지기 초기화는 아래 워밍업에서 수행)
+    if not (os.path.exists(REFERENCE_IMAGE_PATH) and os.path.exists(VIDEO_PATH)):
         print("\n⚠ 경고: 필수 파일이 없습니다.")
         print("다음 파일을 files/ 폴더에 추가해주세요:")
         print("  - rabbit reference.png (참조 이미지)")
         print("  - rabbit bg.mov (오버레이 비디오)")
         print("\n애플리케이션은 실행되지만 파일이 추가될 때까지 작동하지 않습니다.")
     
+    # 초기화 (백그라운드 워밍업 - 서버는 바로 연결을 받고 진행 상황을 status 이벤트로 알림)
+    print("\n시스템 초기화 중 (백그라운드)...")
+    start_warmup(socket_events)
+    
+    # 유휴 세션 정리 작업 시작
+    start_session_reaper()
+    
     print("\n서버 시작...")
     print("브라우저에서 http://localhost:5000 을 열어주세요.")
     print("=" * 60)
     
-    # 서버 실행
-    socketio.run(app, host='0.0.0.0', port=5000, debug=True)
+    # 서버 실행 (워커 모드에서는 리로더가 워커를 중복 생성하지 않도록 비활성화)
+    socketio.run(app, host='0.0.0.0', port=5000, debug=True,
+                 use_reloader=WORKER_PROCESSES == 0)
 
@@ -0,0 +1,153 @@
+"""
+ASGI 서버 진입점
+python-socketio AsyncServer(asyncio) 위에서 app.py와 같은 이벤트 처리 로직을 실행합니다.
+
+- 연결은 이벤트 루프에서 처리되므로 대기 중인 연결은 스레드를 차지하지 않음
+- 프레임 감지/렌더링 등 CPU 작업만 스레드 풀(실행기)에서 실행
+- HTTP 페이지/API는 Flask 앱을 ASGI로 감싸 그대로 제공
+
+실행: python asgi_app.py
+      (또는 uvicorn asgi_app:application --host 0.0.0.0 --port 5000)
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import socketio
+from asgiref.wsgi import WsgiToAsgi
+
+import app as flask_app
+from socket_events import SocketEvents
+
+# 프레임 처리 스레드 수 (동시에 프레임을 처리할 수 있는 세션 수의 상한)
+EXECUTOR_THREADS = int(os.environ.get(
+    'SHADOW_PUPPET_THREADS', str(min(32, (os.cpu_count() or 1) + 4))
+))
+
+sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins='*')
+executor = ThreadPoolExecutor(max_workers=EXECUTOR_THREADS, thread_name_prefix='frame')
+
+# 서버 시작 시 설정되는 이벤트 루프 (실행기 스레드에서 emit할 때 사용)
+event_loop = None
+
+
+def _emit_to(event, payload, to):
+    """
+    세션에 이벤트 전송 (실행기 스레드에서 호출 - 이벤트 루프로 전달만 하고 반환)
+    """
+    asyncio.run_coroutine_threadsafe(sio.emit(event, payload, to=to), event_loop)
+
+
+# 지표는 Flask 앱의 /api/metrics가 내보내도록 같은 저장소 사용
+socket_events = SocketEvents(
+    lambda: flask_app.session_manager,
+    _emit_to,
+    flask_app.metrics_registry,
+    flask_app.RECORD_DIR,
+    flask_app.get_status,
+    flask_app.TARGET_FPS
+)
+
+
+async def _run_blocking(func, *args):
+    """
+    블로킹 함수를 실행기에서 실행
+    """
+    return await event_loop.run_in_executor(executor, func, *args)
+
+
+@sio.event
+async def connect(sid, environ, auth=None):
+    """
+    클라이언트 연결
+    """
+    socket_events.on_connect(sid)
+
+
+@sio.event
+async def disconnect(sid, *args):
+    """
+    클라이언트 연결 해제 (세션 해제는 처리 중인 프레임을 기다릴 수 있으므로 실행기에서)
+    """
+    await _run_blocking(socket_events.on_disconnect, sid)
+
+
+@sio.on('video_frame')
+async def video_frame(sid, data):
+    """
+    비디오 프레임 처리
+    
+    수신함에 넣는 것은 이벤트 루프에서 바로 처리하고, 이 세션을 처리 중인
+    스레드가 없을 때만 실행기에 처리 작업을 보냅니다. 따라서 프레임을 빠르게
+    보내는 클라이언트도 실행기 스레드를 최대 1개만 사용합니다.
+    """
+    mailbox = socket_events.accept_frame(sid, data)
+    if mailbox is not None:
+        await _run_blocking(socket_events.drain_frames, sid, mailbox)
+
+
+def _register_event(event):
+    """
+    제어 이벤트를 실행기에서 실행되는 SocketEvents의 on_<event> 메서드에 연결
+    """
+    async def dispatch(sid, data=None):
+        await _run_blocking(socket_events.dispatch, sid, event, data)
+    
+    sio.on(event, dispatch)
+
+
+for _event in SocketEvents.EVENTS:
+    if _event != 'video_frame':
+        _register_event(_event)
+
+
+async def session_reaper():
+    """
+    유휴 세션 정리 백그라운드 작업
+    """
+    while True:
+        await sio.sleep(flask_app.SESSION_REAP_INTERVAL)
+        await _run_blocking(socket_events.reap_idle_sessions)
+
+
+async def on_startup():
+    """
+    서버 시작: 감지기 워밍업(백그라운드) 및 유휴 세션 정리 작업 시작
+    """
+    global event_loop
+    event_loop = asyncio.get_running_loop()
+    
+    print("\n시스템 초기화 중 (백그라운드)...")
+    flask_app.start_warmup(socket_events)
+    
+    sio.start_background_task(session_reaper)
+
+
+def on_shutdown():
+    """
+    서버 종료: 워커 프로세스 및 실행기 정리
+    """
+    session_manager = flask_app.session_manager
+    if hasattr(session_manager, 'shutdown'):
+        session_manager.shutdown()
+    executor.shutdown(wait=False)
+
+
+# Socket.IO 요청은 AsyncServer가, 나머지 HTTP 요청은 Flask 앱이 처리
+application = socketio.ASGIApp(
+    sio,
+    other_asgi_app=WsgiToAsgi(flask_app.app),
+    on_startup=on_startup,
+    on_shutdown=on_shutdown
+)
+
+
+if __name__ == '__main__':
+    import uvicorn
+    
+    print("=" * 60)
+    print("Shadow Puppet AR - ASGI(asyncio) 서버")
+    print("=" * 60)
+    print("브라우저에서 http://localhost:5000 을 열어주세요.")
+    
+    uvicorn.run(application, host='0.0.0.0', port=5000)
@@ -0,0 +1,189 @@
+"""
+방송 방 모듈
+발표자(presenter) 세션 1개의 처리 결과를 여러 시청자(viewer) 세션에 그대로 전달하기 위한
+방 구성과 시청자별 전송 상태를 관리합니다.
+
+- 발표자 프레임은 한 번만 감지/인코딩하고, 같은 processed_frame 데이터를 시청자에게 전송
+- 시청자는 프레임을 표시한 뒤 broadcast_ack로 응답하며, 응답하지 않은(느린) 시청자에게는
+  다음 프레임을 보내지 않고 건너뜀 (발표자 처리는 기다리지 않음)
+"""
+import secrets
+import threading
+import time
+
+
+class BroadcastRoom:
+    """
+    방송 방 1개
+    - viewers: {시청자 sid: 응답을 기다리는 프레임의 전송 시각 (None이면 전송 가능)}
+    """
+    
+    def __init__(self, room_id, presenter_sid):
+        """
+        초기화
+        
+        Args:
+            room_id: 방 ID
+            presenter_sid: 발표자 Socket.IO 세션 ID
+        """
+        self.room_id = room_id
+        self.presenter_sid = presenter_sid
+        self.viewers = {}
+
+
+class BroadcastRooms:
+    """
+    방송 방 관리자 (스레드 안전)
+    - 세션은 발표자 또는 시청자로 한 방에만 속할 수 있음
+    """
+    
+    def __init__(self, ack_timeout=2.0):
+        """
+        초기화
+        
+        Args:
+            ack_timeout: 시청자 응답 대기 최대 시간 (초)
+                         응답이 유실되어도 이 시간이 지나면 다시 전송
+        """
+        self.ack_timeout = ack_timeout
+        self._rooms = {}  # room_id -> BroadcastRoom
+        self._presenter_rooms = {}  # 발표자 sid -> room_id
+        self._viewer_rooms = {}  # 시청자 sid -> room_id
+        self._lock = threading.Lock()
+    
+    def create(self, presenter_sid, room_id=None):
+        """
+        방송 방 생성 (발표자가 이미 방을 가지고 있으면 그 방 반환)
+        
+        Args:
+            presenter_sid: 발표자 세션 ID
+            room_id: 사용할 방 ID (None이면 임의 생성)
+        
+        Returns:
+            str: 방 ID
+        
+        Raises:
+            ValueError: 시청 중인 세션이거나 방 ID가 이미 사용 중
+        """
+        with self._lock:
+            existing = self._presenter_rooms.get(presenter_sid)
+            if existing is not None:
+                return existing
+            if presenter_sid in self._viewer_rooms:
+                raise ValueError("시청 중인 세션은 방송할 수 없습니다.")
+            
+            if room_id is None:
+                room_id = secrets.token_urlsafe(6)
+                while room_id in self._rooms:
+                    room_id = secrets.token_urlsafe(6)
+            elif room_id in self._rooms:
+                raise ValueError(f"이미 사용 중인 방입니다: {room_id}")
+            
+            self._rooms[room_id] = BroadcastRoom(room_id, presenter_sid)
+            self._presenter_rooms[presenter_sid] = room_id
+            return room_id
+    
+    def join(self, room_id, viewer_sid):
+        """
+        시청자로 방 참가 (다른 방을 시청 중이면 옮김)
+        
+        Args:
+            room_id: 방 ID
+            viewer_sid: 시청자 세션 ID
+        
+        Returns:
+            tuple: (발표자 sid, 시청자 수)
+        
+        Raises:
+            ValueError: 방이 없거나 발표자 자신
+        """
+        with self._lock:
+            room = self._rooms.get(room_id)
+            if room is None:
+                raise ValueError(f"방송 방을 찾을 수 없습니다: {room_id}")
+            if viewer_sid in self._presenter_rooms:
+                raise ValueError("방송 중인 세션은 시청할 수 없습니다.")
+            
+            self._remove_viewer(viewer_sid)
+            room.viewers[viewer_sid] = None
+            self._viewer_rooms[viewer_sid] = room_id
+            return room.presenter_sid, len(room.viewers)
+    
+    def leave(self, sid):
+        """
+        세션을 방에서 제거 (발표자면 방을 닫음)
+        
+        Args:
+            sid: 세션 ID
+        
+        Returns:
+            tuple: 발표자였으면 ('closed', 방 ID, 시청자 sid 목록),
+                   시청자였으면 ('left', 방 ID, (발표자 sid, 남은 시청자 수)),
+                   방에 없었으면 None
+        """
+        with self._lock:
+            room_id = self._presenter_rooms.pop(sid, None)
+            if room_id is not None:
+                room = self._rooms.pop(room_id)
+                for viewer_sid in room.viewers:
+                    self._viewer_rooms.pop(viewer_sid, None)
+                return 'closed', room_id, list(room.viewers)
+            
+            room = self._remove_viewer(sid)
+            if room is not None:
+                return 'left', room.room_id, (room.presenter_sid, len(room.viewers))
+            return None
+    
+    def _remove_viewer(self, viewer_sid):
+        """
+        시청자 제거 (락을 잡은 상태에서 호출)
+        
+        Returns:
+            BroadcastRoom: 시청하던 방 (없으면 None)
+        """
+        room_id = self._viewer_rooms.pop(viewer_sid, None)
+        if room_id is None:
+            return None
+        room = self._rooms[room_id]
+        room.viewers.pop(viewer_sid, None)
+        return room
+    
+    def ack(self, viewer_sid):
+        """
+        시청자가 프레임 표시를 마침 (다음 프레임 전송 가능)
+        """
+        with self._lock:
+            room_id = self._viewer_rooms.get(viewer_sid)
+            if room_id is not None:
+                self._rooms[room_id].viewers[viewer_sid] = None
+    
+    def take_ready_viewers(self, presenter_sid, now=None):
+        """
+        이번 프레임을 받을 시청자 선택 (선택된 시청자는 응답 대기 상태로 표시)
+        
+        Args:
+            presenter_sid: 발표자 세션 ID
+            now: 현재 시각 (테스트용, 기본값은 time.monotonic())
+        
+        Returns:
+            tuple: (전송할 시청자 sid 목록, 건너뛴 시청자 수)
+                   방송 중이 아니면 ([], 0)
+        """
+        if now is None:
+            now = time.monotonic()
+        
+        with self._lock:
+            room_id = self._presenter_rooms.get(presenter_sid)
+            if room_id is None:
+                return [], 0
+            
+            ready = []
+            skipped = 0
+            viewers = self._rooms[room_id].viewers
+            for viewer_sid, sent_at in viewers.items():
+                if sent_at is not None and now - sent_at < self.ack_timeout:
+                    skipped += 1
+                    continue
+                viewers[viewer_sid] = now
+                ready.append(viewer_sid)
+            return ready, skipped
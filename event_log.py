@@ -0,0 +1,286 @@
+"""
+이벤트 로그 모듈
+프레임 처리 경로에서 표준 출력에 직접 쓰지 않도록, 구조화된 로그를 큐에 넣고
+백그라운드 스레드가 출력합니다.
+
+- 레벨: DEBUG / INFO / WARNING / ERROR (logging 표준 레벨)
+- 구조화: get_logger(name).info('pinch_start', '핀치 시작', distance=42.0)
+  → 이벤트 이름과 필드를 레코드에 함께 보관
+- 이벤트별 출력 빈도 제한: 같은 이벤트가 짧은 시간에 반복되면 버리고, 다음 출력에
+  건너뛴 개수(suppressed)를 함께 기록
+- 최근 이벤트 링 버퍼: /api/logs로 조회
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from collections import deque
+
+
+# 모든 로거의 상위 이름 (이 로거에만 큐 핸들러를 붙임)
+ROOT_LOGGER = 'shadow_puppet'
+
+
+class EventLogger:
+    """
+    이벤트 이름과 필드를 함께 기록하는 로거
+    """
+    
+    def __init__(self, logger):
+        """
+        초기화
+        
+        Args:
+            logger: logging.Logger
+        """
+        self.logger = logger
+    
+    def log(self, level, event, message, **fields):
+        """
+        이벤트 기록 (레벨이 꺼져 있으면 메시지를 만들지 않음)
+        
+        Args:
+            level: logging 레벨
+            event: 이벤트 이름 (빈도 제한 단위)
+            message: 사람이 읽을 메시지
+            **fields: 구조화 필드
+        """
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message, extra={'event': event, 'fields': fields})
+    
+    def debug(self, event, message, **fields):
+        """
+        DEBUG 레벨 이벤트 기록
+        """
+        self.log(logging.DEBUG, event, message, **fields)
+    
+    def info(self, event, message, **fields):
+        """
+        INFO 레벨 이벤트 기록
+        """
+        self.log(logging.INFO, event, message, **fields)
+    
+    def warning(self, event, message, **fields):
+        """
+        WARNING 레벨 이벤트 기록
+        """
+        self.log(logging.WARNING, event, message, **fields)
+    
+    def error(self, event, message, **fields):
+        """
+        ERROR 레벨 이벤트 기록
+        """
+        self.log(logging.ERROR, event, message, **fields)
+
+
+def get_logger(name):
+    """
+    모듈별 이벤트 로거
+    
+    Args:
+        name: 모듈 이름 (예: 'socket_events')
+    
+    Returns:
+        EventLogger
+    """
+    return EventLogger(logging.getLogger(f'{ROOT_LOGGER}.{name}'))
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    이벤트별 출력 빈도 제한 (토큰 버킷)
+    - 이벤트마다 burst개까지 바로 통과, 이후 초당 rate개씩 회복
+    - 버려진 개수는 다음에 통과하는 레코드의 suppressed 속성으로 전달
+    - WARNING 이상도 같은 규칙을 따름 (오류가 프레임마다 반복되는 경우 대비)
+    """
+    
+    def __init__(self, rate=2.0, burst=5):
+        """
+        초기화
+        
+        Args:
+            rate: 이벤트별 초당 허용 개수
+            burst: 이벤트별 연속 허용 개수
+        """
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}  # (logger, event) -> [tokens, last_time, suppressed]
+        self._lock = threading.Lock()
+    
+    def filter(self, record):
+        """
+        레코드 통과 여부 (이벤트 버킷에 토큰이 남아 있으면 통과)
+        """
+        key = (record.name, getattr(record, 'event', record.msg))
+        now = time.monotonic()
+        
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1.0:
+                bucket[0] = tokens
+                bucket[2] += 1
+                return False
+            
+            bucket[0] = tokens - 1.0
+            record.suppressed = bucket[2]
+            bucket[2] = 0
+        return True
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    최근 로그 레코드를 dict로 보관하는 핸들러
+    """
+    
+    def __init__(self, capacity=1000):
+        """
+        초기화
+        
+        Args:
+            capacity: 보관할 최대 레코드 수
+        """
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+    
+    def emit(self, record):
+        """
+        레코드를 dict로 변환하여 보관
+        """
+        self.records.append(record_to_dict(record))
+    
+    def recent(self, limit=100, min_level=logging.NOTSET):
+        """
+        최근 레코드 조회
+        
+        Args:
+            limit: 최대 개수
+            min_level: 최소 레벨
+        
+        Returns:
+            list: 오래된 것부터 정렬된 레코드 dict 목록
+        """
+        # deque 복사는 GIL 안에서 원자적이므로 출력 스레드와 별도 락 없이 조회
+        records = [r for r in list(self.records) if r['levelno'] >= min_level]
+        return records[-limit:] if limit else records
+
+
+def record_to_dict(record):
+    """
+    로그 레코드를 JSON 직렬화 가능한 dict로 변환
+    """
+    entry = {
+        'time': record.created,
+        'level': record.levelname,
+        'levelno': record.levelno,
+        'logger': record.name,
+        'event': getattr(record, 'event', None),
+        'message': record.getMessage(),
+        'fields': getattr(record, 'fields', {}),
+    }
+    suppressed = getattr(record, 'suppressed', 0)
+    if suppressed:
+        entry['suppressed'] = suppressed
+    return entry
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    한 줄 텍스트 형식: 시각 레벨 [이벤트] 메시지 key=value ...
+    """
+    
+    def format(self, record):
+        """
+        레코드를 한 줄 텍스트로 변환
+        """
+        timestamp = time.strftime('%H:%M:%S', time.localtime(record.created))
+        parts = [f'{timestamp}.{int(record.msecs):03d}', f'{record.levelname:<7}']
+        event = getattr(record, 'event', None)
+        if event:
+            parts.append(f'[{event}]')
+        parts.append(record.getMessage())
+        for key, value in getattr(record, 'fields', {}).items():
+            parts.append(f'{key}={value}')
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            parts.append(f'(+{suppressed}개 생략)')
+        return ' '.join(parts)
+
+
+# setup_logging 결과 (프로세스당 한 번만 설정)
+_listener = None
+_ring_buffer = None
+_setup_lock = threading.Lock()
+
+
+def setup_logging(level='INFO', ring_size=1000, rate=2.0, burst=5, stream=None):
+    """
+    큐 기반 비동기 로깅 설정 (여러 번 호출해도 처음 한 번만 적용)
+    
+    호출 스레드는 레코드를 큐에 넣기만 하고, 출력(스트림 쓰기)과 링 버퍼 저장은
+    QueueListener 스레드가 수행합니다.
+    
+    Args:
+        level: 최소 로그 레벨 (이름 또는 숫자)
+        ring_size: 최근 이벤트 링 버퍼 크기 (0이면 보관 안 함)
+        rate: 이벤트별 초당 허용 개수
+        burst: 이벤트별 연속 허용 개수
+        stream: 출력 스트림 (기본값 sys.stdout)
+    
+    Returns:
+        RingBufferHandler: 최근 이벤트 링 버퍼 (ring_size가 0이면 None)
+    """
+    global _listener, _ring_buffer
+    
+    with _setup_lock:
+        if _listener is not None:
+            return _ring_buffer
+        
+        stream_handler = logging.StreamHandler(stream or sys.stdout)
+        stream_handler.setFormatter(StructuredFormatter())
+        handlers = [stream_handler]
+        if ring_size:
+            _ring_buffer = RingBufferHandler(ring_size)
+            handlers.append(_ring_buffer)
+        
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(RateLimitFilter(rate, burst))
+        
+        root = logging.getLogger(ROOT_LOGGER)
+        root.setLevel(level)
+        root.addHandler(queue_handler)
+        root.propagate = False
+        
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+        return _ring_buffer
+
+
+def recent_events(limit=100, min_level=logging.NOTSET):
+    """
+    최근 이벤트 조회 (/api/logs)
+    
+    Args:
+        limit: 최대 개수
+        min_level: 최소 레벨 (이름 또는 숫자)
+    
+    Returns:
+        list: 레코드 dict 목록 (로깅이 설정되지 않았으면 빈 목록)
+    """
+    if _ring_buffer is None:
+        return []
+    if isinstance(min_level, str):
+        min_level = logging.getLevelName(min_level.upper())
+        if not isinstance(min_level, int):
+            min_level = logging.NOTSET
+    return _ring_buffer.recent(limit, min_level)
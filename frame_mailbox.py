@@ -0,0 +1,79 @@
+"""
+프레임 수신함 모듈
+세션별 단일 슬롯 수신함으로 최신 프레임만 처리합니다 (latest-frame-wins).
+"""
+import threading
+
+
+class FrameMailbox:
+    """
+    단일 슬롯 프레임 수신함
+    - 처리 중에 도착한 프레임은 슬롯에 보관하고, 더 새 프레임이 오면 교체(드롭)
+    - 한 번에 하나의 소비자만 처리하므로 대기열이 쌓이지 않음
+    - 지연 시간은 최대 프레임 1장의 처리 시간으로 제한됨
+    """
+    
+    def __init__(self, on_drop=None):
+        """
+        초기화
+        
+        Args:
+            on_drop: 프레임이 처리 전에 교체될 때 호출할 함수 (선택적, 지표 기록용)
+        """
+        self.on_drop = on_drop
+        self._lock = threading.Lock()
+        self._frame = None
+        self._consuming = False
+        
+        # 통계
+        self.received = 0  # 수신한 프레임 수
+        self.dropped = 0   # 처리 전에 교체된 프레임 수
+    
+    def put(self, frame):
+        """
+        프레임 넣기 (처리되지 않은 이전 프레임은 버림)
+        
+        Args:
+            frame: 프레임 데이터
+        
+        Returns:
+            bool: 호출자가 소비자가 되어 take()로 처리해야 하면 True
+                  (이미 다른 스레드가 처리 중이면 False)
+        """
+        with self._lock:
+            self.received += 1
+            replaced = self._frame is not None
+            if replaced:
+                self.dropped += 1
+            self._frame = frame
+            
+            consume = not self._consuming
+            self._consuming = True
+        
+        if replaced and self.on_drop is not None:
+            self.on_drop()
+        return consume
+    
+    def take(self):
+        """
+        대기 중인 프레임 꺼내기 (소비자 전용)
+        
+        Returns:
+            프레임 데이터 (비어 있으면 None - 소비자 역할 종료)
+        """
+        with self._lock:
+            frame = self._frame
+            self._frame = None
+            if frame is None:
+                self._consuming = False
+            return frame
+    
+    def stats(self):
+        """
+        수신/드롭 통계
+        
+        Returns:
+            dict: {'received': int, 'dropped': int}
+        """
+        with self._lock:
+            return {'received': self.received, 'dropped': self.dropped}
@@ -0,0 +1,256 @@
+"""
+프레임 처리 파이프라인 모듈
+디코딩 → 손/형태 탐지 → 결과 프레임 생성 → 인코딩 과정을 Socket.IO와 분리하여
+메인 프로세스와 워커 프로세스에서 동일하게 사용합니다.
+"""
+import cv2
+import numpy as np
+
+from metrics import StageTimer
+from image_payload import jpeg_size
+
+# 축소 디코딩 배율별 imdecode 플래그 (JPEG DCT 단계에서 1/2, 1/4, 1/8로 축소)
+REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2)
+)
+
+
+def process_frame(session, image_bytes, network_latency=None, timestamp=None):
+    """
+    세션 파이프라인으로 프레임 1장 처리
+    
+    Args:
+        session: PipelineSession (호출자가 잠근 상태)
+        image_bytes: 클라이언트가 보낸 JPEG 바이트
+        network_latency: 네트워크 왕복 시간 (초, 선택적 - 클라이언트 왕복 시간에서 서버 처리 시간을 뺀 값)
+        timestamp: 프레임 도착 시각 (초, 선택적 - 자세 예측 측정 시각)
+    
+    Returns:
+        dict: processed_frame 이벤트 데이터 (디코딩 실패 시 None)
+              'timings'에 단계별 소요 시간(초)이 포함되며, 전송 전에 호출자가 제거
+    """
+    timer = StageTimer()
+    shape_detector = session.shape_detector
+    hand_detector = session.hand_detector
+    video_overlay = session.video_overlay
+    
+    # 결과 프레임에 웹캠 화면이 들어가지 않으면(메타데이터 전용/흰색 배경)
+    # 원본 픽셀은 탐지에만 쓰이므로 추론 해상도에 맞춰 축소 디코딩
+    full_size = None
+    decode_flag = cv2.IMREAD_COLOR
+    if session.metadata_only or session.white_background_mode:
+        full_size = jpeg_size(image_bytes)
+        if full_size is not None:
+            decode_flag = reduced_decode_flag(
+                full_size[0],
+                session.hand_inference_width,
+                session.shape_inference_width
+            )
+    
+    # 바이트 -> NumPy 배열 -> OpenCV 이미지
+    nparr = np.frombuffer(image_bytes, np.uint8)
+    frame = cv2.imdecode(nparr, decode_flag)
+    timer.lap('imdecode')
+    
+    if frame is None:
+        return None
+    
+    # 좌우반전 (거울 모드)
+    if session.mirror_mode:
+        frame = cv2.flip(frame, 1)
+    timer.lap('flip')
+    
+    # 좌표 기준은 항상 원본 해상도 (축소 디코딩이면 JPEG 헤더의 크기)
+    if decode_flag == cv2.IMREAD_COLOR:
+        frame_h, frame_w = frame.shape[:2]
+    else:
+        frame_w, frame_h = full_size
+    
+    # 단계별 추론 해상도로 축소 (같은 크기는 한 번만 축소하여 공유)
+    inference_frames = {}
+    hand_frame = downscale_for_inference(frame, session.hand_inference_width, inference_frames)
+    shape_frame = downscale_for_inference(frame, session.shape_inference_width, inference_frames)
+    timer.lap('downscale')
+    
+    # 손 탐지 (좌표는 원본 해상도 기준)
+    hand_result = hand_detector.detect(hand_frame, output_size=(frame_w, frame_h))
+    timer.lap('hand_detect')
+    
+    # 형태 탐지는 프레임당 한 번만 수행 (히스테리시스/EMA도 한 번만 진행)
+    geometry = shape_detector.detect_geometry(
+        shape_frame, output_size=(frame_w, frame_h), network_latency=network_latency,
+        timestamp=timestamp
+    )
+    timer.lap('shape_detect')
+    
+    # 충돌 감지 (이전 프레임까지의 드래그를 적용한 위치 기준)
+    temp_detection = shape_detector.apply_drag(geometry)
+    hand_collision_data = None
+    
+    # 탭 감지 플래그
+    tap_detected = False
+    tap_position = None
+    
+    if temp_detection['found'] and temp_detection['frame_corners'] is not None:
+        # 토끼 중심 좌표도 함께 전달
+        rabbit_center = temp_detection.get('center')
+        collision_result = hand_detector.check_collision(
+            hand_result['hand_centers'],
+            temp_detection['frame_corners'],
+            rabbit_center
+        )
+        if collision_result['collision']:
+            hand_collision_data = collision_result
+        
+        # 검지 탭 감지
+        index_tips = hand_result.get('index_finger_tips', [])
+        if hand_detector.check_index_tap(index_tips, temp_detection['frame_corners']):
+            tap_detected = True
+            # 터치 위치 저장 (첫 번째 검지)
+            if index_tips:
+                tap_position = index_tips[0]
+    
+    # 손 잡기/드래그 업데이트 후 같은 탐지 결과에 새 드래그 오프셋 적용
+    shape_detector.update_interaction(hand_collision_data)
+    detection_result = shape_detector.apply_drag(geometry)
+    
+    landmark_points = hand_detector.landmarks_to_points(hand_result['landmarks'], frame_w, frame_h)
+    timer.lap('interaction')
+    
+    # 메타데이터 전용 모드: 클라이언트가 로컬 비디오 위에 직접 그리므로
+    # 결과 프레임 생성/랜드마크 그리기/JPEG 인코딩을 모두 생략
+    if session.metadata_only:
+        image_payload = None
+    else:
+        image_payload = render_result_frame(session, frame, hand_result, timer, (frame_w, frame_h))
+    
+    return {
+        'image': image_payload,
+        'frame_size': [frame_w, frame_h],
+        'detection': {
+            'found': detection_result['found'],
+            'is_locked': detection_result['is_locked'],
+            'is_permanently_active': detection_result.get('is_permanently_active', False),
+            'score': detection_result['score'],
+            'shape_name': detection_result.get('shape_name'),
+            'center': detection_result['center'],
+            'angle': detection_result['angle'],
+            'scale': detection_result['scale'],
+            'is_grabbed': detection_result.get('is_grabbed', False),
+            'is_pushed_off_screen': detection_result.get('is_pushed_off_screen', False),
+            'drag_offset': detection_result.get('drag_offset', (0, 0)),
+            'is_flipped': video_overlay.is_flipped
+        },
+        'hands': {
+            'found': hand_result['hands_found'],
+            'count': len(hand_result['hand_centers']),
+            'index_tips': hand_result.get('index_finger_tips', []),
+            'tap_detected': tap_detected,
+            'tap_position': tap_position,
+            'palm_detected': hand_result.get('palm_detected', False),
+            'palm_center': hand_result.get('palm_center', None),
+            'pinch_active': hand_result.get('pinch_active', False),
+            'pinch_scale': hand_result.get('pinch_scale', 1.0),
+            'pinch_distance': hand_result.get('pinch_distance', 0),
+            'index_only_detected': hand_result.get('index_only_detected', False),
+            'index_only_tip': hand_result.get('index_only_tip', None),
+            'landmarks': landmark_points
+        },
+        'timings': timer.timings
+    }
+
+
+def reduced_decode_flag(frame_w, *inference_widths):
+    """
+    추론 해상도를 만족하는 가장 작은 축소 디코딩 플래그 선택
+    
+    Args:
+        frame_w: 원본 JPEG 너비
+        inference_widths: 단계별 추론 최대 너비 (None이면 원본 해상도 필요)
+    
+    Returns:
+        cv2.imdecode 플래그 (축소할 수 없으면 IMREAD_COLOR)
+    """
+    if any(width is None for width in inference_widths):
+        return cv2.IMREAD_COLOR
+    
+    # 축소 디코딩 결과가 가장 큰 추론 너비보다 작아지지 않는 배율만 사용
+    required_width = max(inference_widths)
+    for factor, flag in REDUCED_DECODE_FLAGS:
+        if frame_w // factor >= required_width:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+def downscale_for_inference(frame, max_width, cache):
+    """
+    추론용 축소 프레임 생성
+    
+    Args:
+        frame: 원본 프레임
+        max_width: 최대 너비 (None이면 축소 안 함)
+        cache: 같은 크기의 축소 결과를 공유할 dict (프레임마다 새로 생성)
+    
+    Returns:
+        축소된 프레임 (축소가 필요 없으면 frame 그대로)
+    """
+    frame_h, frame_w = frame.shape[:2]
+    if max_width is None or frame_w <= max_width:
+        return frame
+    
+    size = (max_width, max(1, round(frame_h * max_width / frame_w)))
+    small = cache.get(size)
+    if small is None:
+        small = cache[size] = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    return small
+
+
+def render_result_frame(session, frame, hand_result, timer=None, frame_size=None):
+    """
+    결과 프레임 생성 및 인코딩 (배경 + 손 스켈레톤)
+    
+    Args:
+        session: PipelineSession
+        frame: 입력 프레임 (BGR, 거울 모드 적용됨)
+        hand_result: HandDetector.detect 결과
+        timer: 단계별 시간을 기록할 StageTimer (선택적)
+        frame_size: 결과 프레임 크기 (width, height)
+                    흰색 배경 모드에서 축소 디코딩된 frame 대신 사용 (선택적)
+    
+    Returns:
+        bytes: 결과 JPEG 바이트 (전송 형식 변환은 SocketEvents가 클라이언트별로 수행)
+    """
+    if timer is None:
+        timer = StageTimer()
+    
+    if session.white_background_mode:
+        # 흰색 배경 모드: 웹캠 화면 대신 흰색 배경
+        if frame_size is None:
+            result_frame = np.full_like(frame, 255)  # 흰색 배경
+        else:
+            frame_w, frame_h = frame_size
+            result_frame = np.full((frame_h, frame_w, 3), 255, dtype=np.uint8)
+    else:
+        # 일반 모드: 웹캠 프레임 복사 + 명도/채도 조정
+        result_frame = frame.copy()
+        result_frame = session.shape_detector.apply_brightness_saturation(result_frame)
+    timer.lap('adjust')
+    
+    # 손가락 관절(랜드마크) 그리기
+    if hand_result['landmarks']:
+        result_frame = session.hand_detector.draw_landmarks(result_frame, hand_result['landmarks'])
+    timer.lap('draw_landmarks')
+    
+    # 비디오 오버레이 비활성화 - 3D 모델(Three.js)만 사용
+    # if (detection_result['found'] and 
+    #     detection_result['frame_corners'] is not None and
+    #     not detection_result.get('is_pushed_off_screen', False)):
+    #     result_frame = session.video_overlay.overlay(result_frame, detection_result['frame_corners'])
+    
+    # 결과 프레임을 JPEG로 인코딩 (품질은 세션별 적응형 품질 단계에 따름, 기본 70)
+    _, buffer = cv2.imencode('.jpg', result_frame, [cv2.IMWRITE_JPEG_QUALITY, session.encode_quality])
+    timer.lap('imencode')
+    
+    return buffer.tobytes()
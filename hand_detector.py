@@ -6,6 +6,10 @@ import cv2
 import numpy as np
 import mediapipe as mp
 
+from event_log import get_logger
+
+log = get_logger('hand_detector')
+
 
 class HandDetector:
     """
@@ -30,6 +34,15 @@ class HandDetector:
         )
         self.mp_drawing = mp.solutions.drawing_utils
         
+        self.reset()
+    
+    def reset(self):
+        """
+        제스처 상태 리셋 (MediaPipe 그래프는 유지)
+        
+        세션 풀에서 감지기를 재사용할 때 이전 세션의 탭/핀치 상태가
+        남지 않도록 호출합니다.
+        """
         # 검지 탭 감지용 변수
         self.last_index_finger_inside = False  # 이전 프레임에서 검지가 안에 있었는지
         self.tap_cooldown = 0  # 탭 쿨다운 (연속 탭 방지)
@@ -39,13 +52,15 @@ class HandDetector:
         self.pinch_start_distance = 0  # 핀치 시작 시 거리
         self.pinch_threshold = 50  # 핀치 시작 임계 거리 (픽셀)
         self.current_pinch_scale = 1.0  # 현재 핀치 스케일
-        
-    def detect(self, frame):
+    
+    def detect(self, frame, output_size=None):
         """
         프레임에서 손 탐지 (MediaPipe 기반)
         
         Args:
-            frame: 입력 프레임 (BGR)
+            frame: 입력 프레임 (BGR, 추론 해상도로 축소된 프레임일 수 있음)
+            output_size: 결과 좌표 기준 해상도 (width, height)
+                         (기본값: frame 크기, 랜드마크는 정규화 좌표이므로 축소 손실 없음)
         
         Returns:
             dict: {
@@ -65,9 +80,12 @@ class HandDetector:
         index_finger_tips = []
         landmarks_list = []
         
+        if output_size is None:
+            h, w = frame.shape[:2]
+        else:
+            w, h = output_size
+        
         if results.multi_hand_landmarks:
-            h, w, _ = frame.shape
-            
             for hand_landmarks in results.multi_hand_landmarks:
                 # 손바닥 중심 계산 (손목~중지 MCP 중간)
                 # Landmark 0: 손목 (WRIST)
@@ -97,7 +115,7 @@ class HandDetector:
         palm_center = None
         
         # 핀치 감지 (손가락 상태도 확인)
-        pinch_result = self._detect_pinch(landmarks_list, frame.shape[1], frame.shape[0])
+        pinch_result = self._detect_pinch(landmarks_list, w, h)
         
         # 핀치가 활성화되지 않았을 때만 손바닥 감지 (상호 배제)
         if not pinch_result['active'] and results.multi_hand_landmarks:
@@ -105,7 +123,7 @@ class HandDetector:
                 if self._is_palm_open(hand_landmarks):
                     palm_detected = True
                     # 손바닥 중심 계산
-                    palm_center = self._get_palm_center(hand_landmarks, frame.shape[1], frame.shape[0])
+                    palm_center = self._get_palm_center(hand_landmarks, w, h)
                     break
         
         # 검지만 펴진 제스처 감지 (숫자 1)
@@ -260,7 +278,7 @@ class HandDetector:
         if not landmarks_list:
             # 손이 없으면 핀치 해제
             if self.pinch_active:
-                print("👌 핀치 해제 (손 없음)")
+                log.info('pinch_end', '핀치 해제', reason='no_hand')
             self.pinch_active = False
             return {'active': False, 'scale': 1.0, 'distance': 0}
         
@@ -301,7 +319,7 @@ class HandDetector:
                 self.pinch_active = True
                 self.pinch_start_distance = distance
                 self.current_pinch_scale = 1.0
-                print(f"👌 핀치 시작! 거리: {distance:.1f}px, 접힌 손가락: {folded_count}개")
+                log.info('pinch_start', '핀치 시작', distance=round(float(distance), 1), folded=folded_count)
         else:
             # 핀치 중이면 스케일 계산 (손가락 상태와 관계없이 계속)
             if self.pinch_active:
@@ -315,11 +333,11 @@ class HandDetector:
         if self.pinch_active:
             # 조건 1: 거리가 너무 멀어짐
             if distance > 300:
-                print(f"👌 핀치 해제! (거리 초과) 최종 스케일: {self.current_pinch_scale:.2f}")
+                log.info('pinch_end', '핀치 해제', reason='distance', scale=round(self.current_pinch_scale, 2))
                 self.pinch_active = False
             # 조건 2: 모든 손가락이 펴짐 (손바닥 제스처로 전환)
             elif folded_count == 0:
-                print(f"👌 핀치 해제! (손바닥으로 전환) 최종 스케일: {self.current_pinch_scale:.2f}")
+                log.info('pinch_end', '핀치 해제', reason='palm', scale=round(self.current_pinch_scale, 2))
                 self.pinch_active = False
         
         return {
@@ -366,7 +384,7 @@ class HandDetector:
         # 탭이 감지되면 쿨다운 설정 (약 0.5초, 15프레임)
         if tap_detected:
             self.tap_cooldown = 15
-            print("👆 검지 탭 감지!")
+            log.info('index_tap', '검지 탭 감지')
         
         return tap_detected
     
@@ -441,6 +459,24 @@ class HandDetector:
         
         return frame
     
+    def landmarks_to_points(self, landmarks_list, width, height):
+        """
+        MediaPipe 랜드마크를 픽셀 좌표 리스트로 변환
+        
+        Args:
+            landmarks_list: MediaPipe 손 랜드마크 리스트
+            width: 프레임 너비
+            height: 프레임 높이
+        
+        Returns:
+            list: 손마다 21개 [x, y] 좌표 리스트 [[[x, y], ...], ...]
+        """
+        return [
+            [[int(landmark.x * width), int(landmark.y * height)]
+             for landmark in hand_landmarks.landmark]
+            for hand_landmarks in landmarks_list
+        ]
+    
     def draw_landmarks(self, frame, landmarks_list):
         """
         프레임에 손가락 관절(21개 랜드마크) 그리기 - 미니멀 스타일
@@ -475,13 +511,8 @@ class HandDetector:
         joint_color = (255, 255, 255)  # 흰색 관절
         tip_color = (255, 255, 255)    # 흰색 손가락 끝
         
-        for hand_landmarks in landmarks_list:
-            # 랜드마크 좌표 추출
-            points = []
-            for landmark in hand_landmarks.landmark:
-                x = int(landmark.x * w)
-                y = int(landmark.y * h)
-                points.append((x, y))
+        for points in self.landmarks_to_points(landmarks_list, w, h):
+            points = [tuple(point) for point in points]
             
             # 연결선 그리기 (얇은 흰색 선)
             for start_idx, end_idx in connections:
@@ -0,0 +1,102 @@
+"""
+이미지 페이로드 변환 모듈
+Socket.IO로 주고받는 이미지 데이터(바이너리 첨부 또는 base64 Data URL)와 JPEG 바이트를
+변환하고, 디코딩 전에 JPEG 헤더에서 이미지 크기를 읽습니다.
+OpenCV에 의존하지 않으므로 서버 시작 시 가볍게 임포트할 수 있습니다.
+"""
+import base64
+
+
+def decode_image_payload(image_data):
+    """
+    video_frame 이미지 데이터를 JPEG 바이트로 변환
+    
+    Args:
+        image_data: 바이너리 첨부(bytes) 또는 base64 Data URL 문자열
+    
+    Returns:
+        bytes (데이터가 없으면 None)
+    """
+    if not image_data:
+        return None
+    
+    # 바이너리 전송: Socket.IO 첨부 바이트를 복사 없이 그대로 사용
+    if isinstance(image_data, bytes):
+        return image_data
+    if isinstance(image_data, (bytearray, memoryview)):
+        return bytes(image_data)
+    
+    # 문자열 전송 (기존 방식): Data URL에서 실제 base64 데이터 추출
+    if ',' in image_data:
+        image_data = image_data.split(',', 1)[1]
+    
+    # Base64 -> 바이트
+    return base64.b64decode(image_data)
+
+
+def encode_image_payload(image_bytes, binary):
+    """
+    JPEG 바이트를 processed_frame 이미지 데이터로 변환
+    
+    Args:
+        image_bytes: JPEG 바이트
+        binary: 바이너리 전송 여부 (False면 base64 Data URL)
+    
+    Returns:
+        bytes 또는 str
+    """
+    if binary:
+        return image_bytes
+    
+    result_base64 = base64.b64encode(image_bytes).decode('utf-8')
+    return f'data:image/jpeg;base64,{result_base64}'
+
+
+# 이미지 크기가 들어 있는 JPEG SOF 마커 (DHT C4, JPG C8, DAC CC 제외)
+_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def jpeg_size(image_bytes):
+    """
+    JPEG 헤더(SOF 세그먼트)에서 이미지 크기 읽기 (디코딩 없이)
+    
+    Args:
+        image_bytes: JPEG 바이트
+    
+    Returns:
+        tuple: (width, height) (JPEG가 아니거나 헤더가 손상되면 None)
+    """
+    data = memoryview(image_bytes)
+    length = len(data)
+    if length < 4 or data[0] != 0xFF or data[1] != 0xD8:
+        return None
+    
+    index = 2
+    while index + 4 <= length:
+        if data[index] != 0xFF:
+            return None
+        marker = data[index + 1]
+        # 채움 바이트(0xFF 반복) 건너뛰기
+        if marker == 0xFF:
+            index += 1
+            continue
+        # 길이 필드가 없는 단독 마커 (SOI, RSTn, TEM)
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            index += 2
+            continue
+        # 영상 데이터 시작 전에 SOF가 없으면 크기를 알 수 없음
+        if marker in (0xD9, 0xDA):
+            return None
+        
+        segment_length = (data[index + 2] << 8) | data[index + 3]
+        if marker in _SOF_MARKERS:
+            if index + 9 > length:
+                return None
+            height = (data[index + 5] << 8) | data[index + 6]
+            width = (data[index + 7] << 8) | data[index + 8]
+            if not width or not height:
+                return None
+            return width, height
+        index += 2 + segment_length
+    
+    return None
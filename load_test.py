@@ -0,0 +1,340 @@
+"""
+Socket.IO 부하 테스트
+실행 중인 서버에 가상 클라이언트 N개를 연결하여 브라우저(socket-handler.js)와 같은 방식
+(한 번에 프레임 1장만 전송하고 processed_frame을 받은 뒤 다음 프레임 전송)으로
+video_frame을 보내고, 왕복 지연 / 클라이언트별 FPS / 서버 오류 이벤트를 측정합니다.
+
+사용법:
+    python load_test.py --clients 8 --duration 30
+    python load_test.py --clients 16 --recording recordings/demo.sprec --metadata
+    python load_test.py --url http://192.168.0.10:5000 --clients 4 --json
+
+필요 패키지: python-socketio 클라이언트 의존성 (requests, websocket-client)
+"""
+import argparse
+import base64
+import json
+import sys
+import threading
+import time
+
+import socketio
+
+from metrics import RollingStats
+from session_recorder import read_recording
+
+
+def synthetic_frames(width, height, count=30):
+    """
+    합성 JPEG 프레임 생성 (밝은 배경 위를 움직이는 어두운 도형)
+    
+    Args:
+        width: 프레임 너비
+        height: 프레임 높이
+        count: 프레임 수 (순환 재생)
+    
+    Returns:
+        list: JPEG 바이트 목록
+    """
+    import cv2
+    import numpy as np
+    
+    frames = []
+    size = min(width, height) // 3
+    for index in range(count):
+        frame = np.full((height, width, 3), 220, np.uint8)
+        # 인코딩 크기가 실제 웹캠과 비슷하도록 약한 노이즈 추가
+        noise = np.random.randint(0, 24, (height, width, 1), dtype=np.uint8)
+        frame -= noise
+        x = int((width - size) * index / max(1, count - 1))
+        cv2.ellipse(frame, (x + size // 2, height // 2), (size // 2, size // 3),
+                    0, 0, 360, (30, 30, 30), -1)
+        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 60])
+        frames.append(buffer.tobytes())
+    return frames
+
+
+def recorded_frames(path):
+    """
+    녹화 파일(.sprec)의 프레임 읽기
+    
+    Returns:
+        list: JPEG 바이트 목록
+    """
+    return [data for _, event, data in read_recording(path) if event == 'video_frame']
+
+
+class LoadClient:
+    """
+    가상 클라이언트 1개
+    - 연결 후 서버 준비(status.ready)를 기다렸다가 전송 방식/응답 방식 설정
+    - 프레임 1장을 보내고 processed_frame(또는 error)을 받을 때까지 대기
+    - 프레임마다 번호(seq)를 붙여, 시간 초과 후 늦게 도착한 응답을 다음 프레임의 응답으로 세지 않음
+    """
+    
+    def __init__(self, index, url, frames, binary=True, metadata=False, timeout=10.0):
+        """
+        초기화
+        
+        Args:
+            index: 클라이언트 번호 (프레임 시작 위치를 다르게 하는 데 사용)
+            url: 서버 주소
+            frames: 전송할 JPEG 바이트 목록 (순환)
+            binary: 바이너리 전송 사용 여부 (False면 base64 Data URL)
+            metadata: 메타데이터 전용 응답 요청 여부
+            timeout: 프레임 응답 대기 최대 시간 (초)
+        """
+        self.index = index
+        self.url = url
+        self.frames = frames
+        self.binary = binary
+        self.metadata = metadata
+        self.timeout = timeout
+        
+        self.latencies = RollingStats(None)
+        self.errors = 0
+        self.timeouts = 0
+        self.late_replies = 0  # 시간 초과 후 도착한 이전 프레임 응답 수
+        self.error_messages = {}
+        self.connect_error = None
+        self.started = None
+        self.finished = None
+        
+        self._ready = threading.Event()
+        self._reply = threading.Event()
+        self._seq = None  # 응답을 기다리는 프레임 번호
+        self._sio = socketio.Client(reconnection=False)
+        self._sio.on('status', self._on_status)
+        self._sio.on('processed_frame', self._on_processed_frame)
+        self._sio.on('error', self._on_error)
+    
+    def _on_status(self, data):
+        """
+        status 이벤트: 서버 준비 완료 확인
+        """
+        if data.get('ready'):
+            self._ready.set()
+    
+    def _accept_reply(self, seq):
+        """
+        응답의 프레임 번호 확인 (기다리는 프레임이면 대기 해제, 이전 프레임이면 늦은 응답으로 기록)
+        """
+        if seq is not None and seq != self._seq:
+            self.late_replies += 1
+            return
+        self._reply.set()
+    
+    def _on_processed_frame(self, data):
+        """
+        processed_frame 이벤트: 응답 수신
+        """
+        self._accept_reply(data.get('seq'))
+    
+    def _on_error(self, data):
+        """
+        error 이벤트: 서버 오류 기록 (번호가 없거나 기다리는 프레임의 오류면 응답으로 간주)
+        """
+        self.errors += 1
+        message = data.get('message', '') if isinstance(data, dict) else str(data)
+        self.error_messages[message] = self.error_messages.get(message, 0) + 1
+        self._accept_reply(data.get('seq') if isinstance(data, dict) else None)
+    
+    def run(self, stop_at):
+        """
+        stop_at(time.monotonic 기준)까지 프레임 전송 (스레드에서 호출)
+        """
+        try:
+            self._sio.connect(self.url, transports=['websocket'], wait_timeout=self.timeout)
+        except Exception as e:
+            self.connect_error = str(e)
+            return
+        
+        try:
+            if not self._ready.wait(self.timeout):
+                self.connect_error = '서버가 준비되지 않았습니다 (status.ready 대기 시간 초과)'
+                return
+            
+            self._sio.emit('set_transport', {'binary': self.binary})
+            self._sio.emit('set_response_mode', {'mode': 'metadata' if self.metadata else 'image'})
+            
+            self._send_loop(stop_at)
+        finally:
+            self._sio.disconnect()
+    
+    def _send_loop(self, stop_at):
+        """
+        한 번에 1장씩 전송하고 응답 대기 (socket-handler.js와 같은 왕복 시간 보고 포함)
+        """
+        frame_index = self.index
+        last_round_trip = None
+        self.started = time.monotonic()
+        
+        while time.monotonic() < stop_at:
+            image = self.frames[frame_index % len(self.frames)]
+            frame_index += 1
+            if not self.binary:
+                image = 'data:image/jpeg;base64,' + base64.b64encode(image).decode('ascii')
+            
+            payload = {'image': image, 'seq': frame_index}
+            if last_round_trip is not None:
+                payload['rtt'] = round(last_round_trip * 1000)
+            
+            self._seq = frame_index
+            self._reply.clear()
+            sent = time.perf_counter()
+            self._sio.emit('video_frame', payload)
+            if not self._reply.wait(self.timeout):
+                self.timeouts += 1
+                last_round_trip = None
+                continue
+            
+            last_round_trip = time.perf_counter() - sent
+            self.latencies.add(last_round_trip)
+        
+        self.finished = time.monotonic()
+    
+    def fps(self):
+        """
+        달성 FPS (응답 받은 프레임 수 / 전송 시간)
+        """
+        if self.started is None or self.finished is None or self.finished <= self.started:
+            return 0.0
+        return self.latencies.count / (self.finished - self.started)
+
+
+def run_load_test(url, frames, clients, duration, ramp=0.0, binary=True, metadata=False,
+                  timeout=10.0):
+    """
+    부하 테스트 실행
+    
+    Args:
+        url: 서버 주소
+        frames: 전송할 JPEG 바이트 목록
+        clients: 가상 클라이언트 수
+        duration: 클라이언트별 전송 시간 (초)
+        ramp: 클라이언트를 나누어 연결할 시간 (초, 0이면 동시에 연결)
+        binary: 바이너리 전송 사용 여부
+        metadata: 메타데이터 전용 응답 요청 여부
+        timeout: 연결/응답 대기 최대 시간 (초)
+    
+    Returns:
+        list: 실행을 마친 LoadClient 목록
+    """
+    load_clients = [
+        LoadClient(index, url, frames, binary, metadata, timeout) for index in range(clients)
+    ]
+    
+    threads = []
+    for index, client in enumerate(load_clients):
+        if ramp and index:
+            time.sleep(ramp / clients)
+        stop_at = time.monotonic() + duration
+        thread = threading.Thread(target=client.run, args=(stop_at,),
+                                  name=f'load-client-{index}', daemon=True)
+        thread.start()
+        threads.append(thread)
+    
+    for thread in threads:
+        thread.join()
+    return load_clients
+
+
+def summarize(load_clients):
+    """
+    결과 요약
+    
+    Returns:
+        dict: 전체/클라이언트별 지표
+    """
+    latency = RollingStats(None)
+    error_messages = {}
+    for client in load_clients:
+        for value in client.latencies.samples:
+            latency.add(value)
+        for message, count in client.error_messages.items():
+            error_messages[message] = error_messages.get(message, 0) + count
+    
+    connected = [client for client in load_clients if client.connect_error is None]
+    fps_values = [client.fps() for client in connected]
+    
+    return {
+        'clients': len(load_clients),
+        'connected': len(connected),
+        'connect_errors': [
+            client.connect_error for client in load_clients if client.connect_error is not None
+        ],
+        'frames': latency.count,
+        'total_fps': sum(fps_values),
+        'fps_per_client': {
+            'min': min(fps_values) if fps_values else 0.0,
+            'mean': sum(fps_values) / len(fps_values) if fps_values else 0.0,
+            'max': max(fps_values) if fps_values else 0.0,
+        },
+        'latency_ms': {
+            f'p{int(q * 100)}': value * 1000 for q, value in latency.quantiles().items()
+        },
+        'latency_ms_max': max(latency.samples) * 1000 if latency.count else None,
+        'errors': sum(client.errors for client in load_clients),
+        'timeouts': sum(client.timeouts for client in load_clients),
+        'late_replies': sum(client.late_replies for client in load_clients),
+        'error_messages': error_messages,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Socket.IO 부하 테스트')
+    parser.add_argument('--url', default='http://localhost:5000', help='서버 주소')
+    parser.add_argument('--clients', type=int, default=4, help='가상 클라이언트 수')
+    parser.add_argument('--duration', type=float, default=20.0, help='클라이언트별 전송 시간 (초)')
+    parser.add_argument('--ramp', type=float, default=0.0, help='클라이언트를 나누어 연결할 시간 (초)')
+    parser.add_argument('--recording', help='프레임을 가져올 .sprec 녹화 파일 (없으면 합성 프레임)')
+    parser.add_argument('--width', type=int, default=640, help='합성 프레임 너비')
+    parser.add_argument('--height', type=int, default=360, help='합성 프레임 높이')
+    parser.add_argument('--base64', action='store_true', help='base64 Data URL로 전송 (기본은 바이너리)')
+    parser.add_argument('--metadata', action='store_true', help='메타데이터 전용 응답 요청')
+    parser.add_argument('--timeout', type=float, default=10.0, help='연결/응답 대기 최대 시간 (초)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args()
+    
+    if args.recording:
+        frames = recorded_frames(args.recording)
+        if not frames:
+            print(f"녹화에 프레임이 없습니다: {args.recording}")
+            return 1
+    else:
+        frames = synthetic_frames(args.width, args.height)
+    
+    load_clients = run_load_test(
+        args.url, frames, args.clients, args.duration, args.ramp,
+        binary=not args.base64, metadata=args.metadata, timeout=args.timeout
+    )
+    report = summarize(load_clients)
+    
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return 0 if report['connected'] else 1
+    
+    print("=" * 60)
+    print(f"부하 테스트: {args.url} (클라이언트 {args.clients}개 x {args.duration:.0f}초)")
+    print("=" * 60)
+    print(f"연결: {report['connected']}/{report['clients']}")
+    for message in sorted(set(report['connect_errors'])):
+        print(f"  ⚠ 연결 실패: {message}")
+    print(f"처리량: 전체 {report['total_fps']:.1f} fps ({report['frames']}프레임)")
+    per_client = report['fps_per_client']
+    print(f"클라이언트별 FPS: 최소 {per_client['min']:.1f}  평균 {per_client['mean']:.1f}  "
+          f"최대 {per_client['max']:.1f}")
+    if report['frames']:
+        latency = report['latency_ms']
+        print(f"왕복 지연: p50 {latency['p50']:.1f}ms  p95 {latency['p95']:.1f}ms  "
+              f"p99 {latency['p99']:.1f}ms  max {report['latency_ms_max']:.1f}ms")
+    if report['errors'] or report['timeouts']:
+        print(f"\n⚠ 서버 오류 {report['errors']}개, 응답 시간 초과 {report['timeouts']}개 "
+              f"(늦은 응답 {report['late_replies']}개)")
+        for message, count in sorted(report['error_messages'].items(), key=lambda item: -item[1]):
+            print(f"  {count:>5}  {message}")
+    return 0 if report['connected'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
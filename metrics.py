@@ -0,0 +1,221 @@
+"""
+성능 측정 모듈
+프레임 처리 단계별 소요 시간을 기록하고 Prometheus 텍스트 형식으로 내보냅니다.
+"""
+import math
+import threading
+import time
+from collections import deque
+
+
+# 내보낼 분위수
+QUANTILES = (0.5, 0.95, 0.99)
+
+# 값이 0이어도 항상 내보낼 카운터
+FRAME_COUNTERS = ('frames_received', 'frames_dropped', 'frames_processed')
+
+
+class StageTimer:
+    """
+    프레임 1장의 단계별 소요 시간 측정 (랩 방식)
+    - lap(stage) 호출 시 직전 lap 이후 경과 시간을 해당 단계에 누적
+    """
+    
+    def __init__(self):
+        """
+        초기화 (측정 시작)
+        """
+        self.timings = {}
+        self._last = time.perf_counter()
+    
+    def lap(self, stage):
+        """
+        직전 lap 이후 경과 시간을 단계에 기록
+        
+        Args:
+            stage: 단계 이름
+        """
+        now = time.perf_counter()
+        self.timings[stage] = self.timings.get(stage, 0.0) + (now - self._last)
+        self._last = now
+
+
+class RollingStats:
+    """
+    최근 N개 샘플의 분위수와 누적 합계/개수
+    """
+    
+    def __init__(self, window):
+        """
+        초기화
+        
+        Args:
+            window: 분위수 계산에 사용할 최근 샘플 수
+        """
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+    
+    def add(self, value):
+        """
+        샘플 추가
+        """
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+    
+    def quantiles(self, quantiles=QUANTILES):
+        """
+        최근 샘플의 분위수 (nearest-rank)
+        
+        Returns:
+            dict: {분위수: 값} (샘플이 없으면 빈 dict)
+        """
+        if not self.samples:
+            return {}
+        ordered = sorted(self.samples)
+        # 순위 = ceil(q * N) (1부터 시작), 최소 1
+        return {q: ordered[max(0, math.ceil(q * len(ordered)) - 1)] for q in quantiles}
+
+
+class MetricsRegistry:
+    """
+    프레임 처리 지표 저장소
+    - 단계별 소요 시간: 전체 및 세션별 롤링 분위수
+    - 카운터: 수신/드롭/처리 프레임 수
+    - 기록은 짧은 락 안에서 deque에 추가만 하고, 분위수는 조회 시 계산
+    """
+    
+    def __init__(self, window=1024, session_window=256):
+        """
+        초기화
+        
+        Args:
+            window: 전체 지표의 롤링 샘플 수
+            session_window: 세션별 지표의 롤링 샘플 수
+        """
+        self.window = window
+        self.session_window = session_window
+        
+        self._stages = {}  # stage -> RollingStats
+        self._session_stages = {}  # sid -> {stage -> RollingStats}
+        self._counters = {name: 0 for name in FRAME_COUNTERS}
+        self._lock = threading.Lock()
+    
+    def observe(self, sid, timings):
+        """
+        프레임 1장의 단계별 소요 시간 기록
+        
+        Args:
+            sid: Socket.IO 세션 ID
+            timings: {단계 이름: 초}
+        """
+        with self._lock:
+            session_stages = self._session_stages.setdefault(sid, {})
+            for stage, seconds in timings.items():
+                stats = self._stages.get(stage)
+                if stats is None:
+                    stats = self._stages[stage] = RollingStats(self.window)
+                stats.add(seconds)
+                
+                stats = session_stages.get(stage)
+                if stats is None:
+                    stats = session_stages[stage] = RollingStats(self.session_window)
+                stats.add(seconds)
+    
+    def increment(self, name, amount=1):
+        """
+        카운터 증가
+        
+        Args:
+            name: 카운터 이름
+            amount: 증가량
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+    
+    def drop_session(self, sid):
+        """
+        세션별 지표 제거 (연결 해제 시)
+        """
+        with self._lock:
+            self._session_stages.pop(sid, None)
+    
+    def snapshot(self):
+        """
+        현재 지표 조회
+        
+        Returns:
+            dict: {
+                'stages': {stage: {'count', 'sum', 'quantiles'}},
+                'sessions': {sid: {stage: {...}}},
+                'counters': {name: int}
+            }
+        """
+        def describe(stats_by_stage):
+            return {
+                stage: {
+                    'count': stats.count,
+                    'sum': stats.total,
+                    'quantiles': stats.quantiles()
+                }
+                for stage, stats in stats_by_stage.items()
+            }
+        
+        with self._lock:
+            return {
+                'stages': describe(self._stages),
+                'sessions': {
+                    sid: describe(stages) for sid, stages in self._session_stages.items()
+                },
+                'counters': dict(self._counters)
+            }
+    
+    def render_prometheus(self, gauges=None, prefix='shadow_puppet'):
+        """
+        Prometheus 텍스트 형식으로 내보내기
+        
+        Args:
+            gauges: 추가로 내보낼 게이지 {이름: 값} (예: 활성 세션 수)
+            prefix: 지표 이름 접두사
+        
+        Returns:
+            str: Prometheus 텍스트 노출 형식 (0.0.4)
+        """
+        snapshot = self.snapshot()
+        lines = []
+        
+        for name, value in sorted(snapshot['counters'].items()):
+            metric = f'{prefix}_{name}_total'
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric} {value}')
+        
+        for name, value in sorted((gauges or {}).items()):
+            metric = f'{prefix}_{name}'
+            lines.append(f'# TYPE {metric} gauge')
+            lines.append(f'{metric} {value}')
+        
+        metric = f'{prefix}_stage_seconds'
+        lines.append(f'# HELP {metric} 프레임 처리 단계별 소요 시간 (최근 {self.window}개 샘플 분위수)')
+        lines.append(f'# TYPE {metric} summary')
+        for stage, stats in sorted(snapshot['stages'].items()):
+            _append_summary(lines, metric, f'stage="{stage}"', stats)
+        
+        metric = f'{prefix}_session_stage_seconds'
+        lines.append(f'# HELP {metric} 세션별 프레임 처리 단계별 소요 시간 (최근 {self.session_window}개 샘플 분위수)')
+        lines.append(f'# TYPE {metric} summary')
+        for sid, stages in sorted(snapshot['sessions'].items()):
+            for stage, stats in sorted(stages.items()):
+                _append_summary(lines, metric, f'session="{sid}",stage="{stage}"', stats)
+        
+        return '\n'.join(lines) + '\n'
+
+
+def _append_summary(lines, metric, labels, stats):
+    """
+    summary 지표 한 개(분위수 + 합계 + 개수)를 텍스트 줄로 추가
+    """
+    for quantile, value in stats['quantiles'].items():
+        lines.append(f'{metric}{{{labels},quantile="{quantile}"}} {value:.6f}')
+    lines.append(f'{metric}_sum{{{labels}}} {stats["sum"]:.6f}')
+    lines.append(f'{metric}_count{{{labels}}} {stats["count"]}')
@@ -0,0 +1,106 @@
+"""
+자세 예측 모듈
+탐지된 형태의 중심/각도/스케일을 등속도(constant-velocity) 칼만 필터로 추적하고,
+프레임 타임스탬프 기준으로 결과가 화면에 표시될 시점의 자세를 예측합니다.
+(EMA 스무딩과 네트워크 왕복 시간 때문에 3D 모델이 그림자보다 늦게 따라오는 지연 보상)
+"""
+import numpy as np
+
+
+# 측정 잡음 표준편차 (중심 x/y 픽셀, 각도 도, 로그 스케일)
+MEASUREMENT_NOISE = (3.0, 3.0, 2.0, 0.02)
+
+# 가속도(프로세스 잡음) 표준편차 (단위/초^2, 클수록 빠른 움직임을 빨리 따라감)
+PROCESS_NOISE = (600.0, 600.0, 150.0, 0.5)
+
+
+class PosePredictor:
+    """
+    자세 예측기
+    - 상태: 중심 x, 중심 y, 각도(도), 로그 스케일 각각 [값, 속도] (축별 독립 2x2 칼만 필터)
+    - 각도 측정은 이전 추정과의 차이를 -180 ~ 180도로 감싸서 반영 (EMA와 같은 순환 처리)
+    - 측정 간격이 max_gap을 넘으면 속도를 버리고 측정값으로 다시 시작
+    """
+    
+    def __init__(self, measurement_noise=MEASUREMENT_NOISE, process_noise=PROCESS_NOISE,
+                 max_gap=0.5, max_lead=0.25):
+        """
+        초기화
+        
+        Args:
+            measurement_noise: 축별 측정 잡음 표준편차
+            process_noise: 축별 가속도 표준편차 (단위/초^2)
+            max_gap: 이 시간(초)보다 오래 측정이 없으면 필터 재시작
+            max_lead: 최대 예측 시간 (초, 왕복 시간이 튀어도 과도하게 앞서가지 않도록)
+        """
+        self.measurement_variance = np.square(np.asarray(measurement_noise, np.float64))
+        self.process_variance = np.square(np.asarray(process_noise, np.float64))
+        self.max_gap = max_gap
+        self.max_lead = max_lead
+        self.reset()
+    
+    def reset(self):
+        """
+        추적 상태 초기화
+        """
+        self.timestamp = None
+        self._state = np.zeros((4, 2))      # 축별 [값, 속도]
+        self._covariance = np.zeros((4, 2, 2))
+    
+    def update(self, timestamp, cx, cy, angle, scale):
+        """
+        측정값 반영
+        
+        Args:
+            timestamp: 측정 시각 (초, 감지기 시계 기준)
+            cx: 중심 x
+            cy: 중심 y
+            angle: 회전 각도 (도)
+            scale: 스케일 (0보다 커야 함)
+        """
+        measurement = np.array([cx, cy, angle, np.log(scale)])
+        
+        dt = None if self.timestamp is None else timestamp - self.timestamp
+        if dt is None or dt < 0 or dt > self.max_gap:
+            # 첫 측정 또는 긴 공백: 속도 0에서 시작 (속도 불확실성은 크게)
+            self._state[:, 0] = measurement
+            self._state[:, 1] = 0.0
+            self._covariance[:] = 0.0
+            self._covariance[:, 0, 0] = self.measurement_variance
+            self._covariance[:, 1, 1] = self.process_variance * self.max_gap ** 2
+            self.timestamp = timestamp
+            return
+        
+        # 예측 단계: x = F x, P = F P F^T + Q (F = [[1, dt], [0, 1]], 백색 가속도 잡음)
+        state = self._state
+        covariance = self._covariance
+        state[:, 0] += state[:, 1] * dt
+        p00, p01, p11 = covariance[:, 0, 0].copy(), covariance[:, 0, 1].copy(), covariance[:, 1, 1].copy()
+        q = self.process_variance
+        covariance[:, 0, 0] = p00 + 2 * dt * p01 + dt * dt * p11 + q * dt ** 4 / 4
+        covariance[:, 0, 1] = covariance[:, 1, 0] = p01 + dt * p11 + q * dt ** 3 / 2
+        covariance[:, 1, 1] = p11 + q * dt * dt
+        
+        # 갱신 단계: 값만 측정 (H = [1, 0])
+        innovation = measurement - state[:, 0]
+        innovation[2] = (innovation[2] + 180.0) % 360.0 - 180.0
+        gain = covariance[:, :, 0] / (covariance[:, 0, 0] + self.measurement_variance)[:, np.newaxis]
+        state += gain * innovation[:, np.newaxis]
+        covariance -= gain[:, :, np.newaxis] * covariance[:, np.newaxis, 0, :]
+        self.timestamp = timestamp
+    
+    def predict(self, timestamp):
+        """
+        지정 시각의 자세 예측 (마지막 측정 이후 max_lead까지만 앞으로 외삽)
+        
+        Args:
+            timestamp: 예측할 시각 (초, 감지기 시계 기준)
+        
+        Returns:
+            tuple: (cx, cy, angle, scale), 측정이 없으면 None
+        """
+        if self.timestamp is None:
+            return None
+        lead = min(max(0.0, timestamp - self.timestamp), self.max_lead)
+        cx, cy, angle, log_scale = self._state[:, 0] + self._state[:, 1] * lead
+        return float(cx), float(cy), float(angle), float(np.exp(log_scale))
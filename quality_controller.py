@@ -0,0 +1,135 @@
+"""
+적응형 품질 조절 모듈
+세션별 프레임 처리 시간과 클라이언트가 보고한 왕복 시간(RTT)을 관찰하여
+목표 FPS를 유지하도록 캡처 해상도 / 클라이언트 JPEG 품질 / 전송 간격 /
+서버 인코딩 품질을 단계적으로 낮추거나 올립니다.
+"""
+import threading
+
+
+# 품질 단계 (0이 최고 품질, 아래로 갈수록 가벼움)
+# - capture_width: 클라이언트 캡처(전송) 프레임 최대 너비
+# - client_quality: 클라이언트 JPEG 품질 (0.0 ~ 1.0)
+# - frame_skip: 클라이언트 전송 간격 (1 = 모든 프레임, 2 = 2프레임마다 1번)
+# - server_quality: 서버 결과 프레임 JPEG 품질 (1 ~ 100)
+QUALITY_LEVELS = (
+    {'capture_width': 640, 'client_quality': 0.6, 'frame_skip': 1, 'server_quality': 70},
+    {'capture_width': 640, 'client_quality': 0.5, 'frame_skip': 1, 'server_quality': 60},
+    {'capture_width': 480, 'client_quality': 0.5, 'frame_skip': 1, 'server_quality': 55},
+    {'capture_width': 480, 'client_quality': 0.4, 'frame_skip': 2, 'server_quality': 50},
+    {'capture_width': 320, 'client_quality': 0.4, 'frame_skip': 2, 'server_quality': 45},
+    {'capture_width': 320, 'client_quality': 0.3, 'frame_skip': 3, 'server_quality': 40},
+)
+
+
+class QualityController:
+    """
+    세션 1개의 품질 단계 조절기 (닫힌 루프)
+    - 처리 시간/RTT는 지수 이동 평균으로 평활화
+    - 프레임 비용(처리 시간과 RTT 중 큰 값)이 예산을 넘는 상태가 이어지면 단계를 낮추고,
+      여유가 있는 상태가 더 오래 이어지면 한 단계씩 올림 (진동 방지)
+    - 접속 직후 첫 관찰에서는 현재 단계를 알려 클라이언트 설정을 맞춤
+    """
+    
+    def __init__(self, target_fps=15, levels=QUALITY_LEVELS, smoothing=0.2,
+                 degrade_after=5, upgrade_after=30):
+        """
+        초기화
+        
+        Args:
+            target_fps: 유지할 목표 FPS
+            levels: 품질 단계 목록 (0이 최고 품질)
+            smoothing: 지수 이동 평균 가중치 (0 ~ 1, 클수록 최근 값 반영)
+            degrade_after: 예산 초과가 연속 몇 번이면 단계를 낮출지
+            upgrade_after: 여유 상태가 연속 몇 번이면 단계를 올릴지
+        """
+        self.levels = levels
+        self.frame_budget = 1.0 / target_fps
+        self.smoothing = smoothing
+        self.degrade_after = degrade_after
+        self.upgrade_after = upgrade_after
+        
+        self.level = 0
+        self.processing_time = None  # 평활화된 서버 처리 시간 (초)
+        self.round_trip_time = None  # 평활화된 클라이언트 왕복 시간 (초)
+        
+        self._over_budget = 0
+        self._under_budget = 0
+        self._announced = False
+        self._lock = threading.Lock()
+    
+    def _smooth(self, previous, value):
+        """
+        지수 이동 평균
+        """
+        if previous is None:
+            return value
+        return previous + self.smoothing * (value - previous)
+    
+    def observe_round_trip(self, seconds):
+        """
+        클라이언트가 보고한 왕복 시간 기록 (전송 → processed_frame 수신)
+        
+        Args:
+            seconds: 왕복 시간 (초)
+        """
+        with self._lock:
+            self.round_trip_time = self._smooth(self.round_trip_time, seconds)
+    
+    def observe_processing(self, seconds):
+        """
+        서버 처리 시간 기록 후 단계 조정
+        
+        Args:
+            seconds: 프레임 1장의 서버 처리 시간 (초)
+        
+        Returns:
+            dict: 단계가 바뀌었거나 아직 알리지 않았으면 settings(), 아니면 None
+        """
+        with self._lock:
+            self.processing_time = self._smooth(self.processing_time, seconds)
+            cost = self.processing_time
+            if self.round_trip_time is not None:
+                cost = max(cost, self.round_trip_time)
+            
+            changed = False
+            if cost > self.frame_budget:
+                self._under_budget = 0
+                self._over_budget += 1
+                if self._over_budget >= self.degrade_after and self.level < len(self.levels) - 1:
+                    self.level += 1
+                    changed = True
+            elif cost < self.frame_budget * 0.6:
+                self._over_budget = 0
+                self._under_budget += 1
+                if self._under_budget >= self.upgrade_after and self.level > 0:
+                    self.level -= 1
+                    changed = True
+            else:
+                self._over_budget = 0
+                self._under_budget = 0
+            
+            if changed:
+                self._over_budget = 0
+                self._under_budget = 0
+            elif self._announced:
+                return None
+            
+            self._announced = True
+            return self._settings()
+    
+    def settings(self):
+        """
+        현재 단계 설정
+        
+        Returns:
+            dict: {'level', 'capture_width', 'client_quality', 'frame_skip', 'server_quality'}
+        """
+        with self._lock:
+            return self._settings()
+    
+    def _settings(self):
+        """
+        현재 단계 설정 (락을 잡은 상태에서 호출)
+        """
+        return dict(self.levels[self.level], level=self.level)
@@ -0,0 +1,179 @@
+"""
+녹화 재생 벤치마크
+session_recorder로 기록한 .sprec 파일을 브라우저/소켓 없이 서버와 같은 이벤트 처리
+경로(SocketEvents → SessionManager → frame_pipeline)로 재생하고 성능을 보고합니다.
+
+사용법:
+    python replay_benchmark.py recordings/20250101-120000-abc.sprec
+    python replay_benchmark.py recording.sprec --repeat 5 --tracemalloc
+    python replay_benchmark.py recording.sprec --realtime --json
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from shape_detector import ShapeDetector
+from video_overlay import VideoOverlay
+from hand_detector import HandDetector
+from session_manager import SessionManager
+from socket_events import SocketEvents
+from metrics import MetricsRegistry, RollingStats
+from session_recorder import read_recording
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """
+    프로세스 최대 상주 메모리 (MB, 지원하지 않는 플랫폼은 None)
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def replay(records, manager, events, sid, realtime=False):
+    """
+    녹화 1회 재생
+    
+    Args:
+        records: (타임스탬프, 이벤트, 데이터) 리스트
+        manager: SessionManager
+        events: SocketEvents
+        sid: 재생에 사용할 세션 ID
+        realtime: 녹화 타임스탬프 간격대로 대기할지 여부
+    
+    Returns:
+        list: 프레임별 처리 지연 시간 (초)
+    """
+    # 형태 감지기의 시간(영구 활성화 판정)과 프레임 도착 시각을 녹화 타임스탬프에 맞춰 재현
+    replay_time = [0.0]
+    events.clock = manager.get(sid).shape_detector.clock = lambda: replay_time[0]
+    
+    latencies = []
+    started = time.perf_counter()
+    
+    for timestamp, event, data in records:
+        if realtime:
+            delay = timestamp - (time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay)
+        replay_time[0] = timestamp
+        
+        if event == 'video_frame':
+            frame_started = time.perf_counter()
+            events.on_video_frame(sid, {'image': data})
+            latencies.append(time.perf_counter() - frame_started)
+        else:
+            events.dispatch(sid, event, data)
+    
+    manager.release(sid)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='세션 녹화 재생 벤치마크')
+    parser.add_argument('recording', help='.sprec 녹화 파일')
+    parser.add_argument('--reference', default='files/rabbit reference.png', help='참조 이미지 경로')
+    parser.add_argument('--library', help='형태 라이브러리 폴더 (추가 참조 이미지)')
+    parser.add_argument('--pyramid', type=int, default=0, help='윤곽선 탐색 피라미드 단계 (0이면 끔)')
+    parser.add_argument('--predict', action='store_true', help='지연 보상 자세 예측 사용')
+    parser.add_argument('--video', default='files/rabbit bg.mov', help='오버레이 비디오 경로')
+    parser.add_argument('--repeat', type=int, default=1, help='재생 반복 횟수')
+    parser.add_argument('--realtime', action='store_true', help='녹화된 시간 간격대로 재생')
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help='Python 할당 최대치 측정 (느려짐)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args()
+    
+    records = list(read_recording(args.recording))
+    frame_count = sum(1 for _, event, _ in records if event == 'video_frame')
+    if not frame_count:
+        print(f"녹화에 프레임이 없습니다: {args.recording}")
+        return 1
+    
+    # 서버와 같은 구성 (템플릿 + 손 감지기 풀)
+    manager = SessionManager(
+        ShapeDetector(args.reference, args.library, args.pyramid, args.predict),
+        VideoOverlay(args.video),
+        HandDetector
+    )
+    manager.add_to_pool(HandDetector())
+    
+    emitted = {}
+    
+    def count_emit(event, payload, to):
+        emitted[event] = emitted.get(event, 0) + 1
+    
+    metrics = MetricsRegistry(window=None, session_window=1)
+    events = SocketEvents(lambda: manager, count_emit, metrics)
+    
+    if args.tracemalloc:
+        tracemalloc.start()
+    
+    latency_stats = RollingStats(None)
+    started = time.perf_counter()
+    for run in range(args.repeat):
+        for latency in replay(records, manager, events, f'replay-{run}', args.realtime):
+            latency_stats.add(latency)
+    elapsed = time.perf_counter() - started
+    
+    traced_peak = None
+    if args.tracemalloc:
+        traced_peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    
+    stages = metrics.snapshot()['stages']
+    report = {
+        'recording': args.recording,
+        'frames': latency_stats.count,
+        'seconds': elapsed,
+        'fps': latency_stats.count / elapsed if elapsed > 0 else 0.0,
+        'latency_ms': {
+            f'p{int(q * 100)}': value * 1000 for q, value in latency_stats.quantiles().items()
+        },
+        'latency_ms_max': max(latency_stats.samples) * 1000,
+        'stages_ms': {
+            stage: {f'p{int(q * 100)}': value * 1000 for q, value in stats['quantiles'].items()}
+            for stage, stats in sorted(stages.items())
+        },
+        'peak_rss_mb': peak_rss_mb(),
+        'peak_traced_mb': traced_peak,
+        'emitted': emitted
+    }
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    
+    print("=" * 60)
+    print(f"녹화: {args.recording} ({frame_count}프레임 x {args.repeat}회)")
+    print("=" * 60)
+    print(f"처리량: {report['fps']:.1f} fps ({report['frames']}프레임 / {elapsed:.2f}초)")
+    latency = report['latency_ms']
+    print(f"프레임 지연: p50 {latency['p50']:.2f}ms  p95 {latency['p95']:.2f}ms  "
+          f"p99 {latency['p99']:.2f}ms  max {report['latency_ms_max']:.2f}ms")
+    print("\n단계별 소요 시간 (ms):")
+    for stage, quantiles in report['stages_ms'].items():
+        print(f"  {stage:<16} p50 {quantiles['p50']:8.3f}  p95 {quantiles['p95']:8.3f}  "
+              f"p99 {quantiles['p99']:8.3f}")
+    if report['peak_rss_mb'] is not None:
+        print(f"\n최대 상주 메모리: {report['peak_rss_mb']:.1f} MB")
+    if traced_peak is not None:
+        print(f"Python 할당 최대치: {traced_peak:.1f} MB")
+    if emitted.get('error'):
+        print(f"\n⚠ 오류 이벤트 {emitted['error']}개")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
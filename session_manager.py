@@ -0,0 +1,374 @@
+"""
+세션 관리 모듈
+클라이언트(request.sid)별로 독립된 탐지 파이프라인 인스턴스를 관리합니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import frame_pipeline
+
+
+class PipelineSession:
+    """
+    클라이언트 한 명의 파이프라인 상태
+    - 세션별 ShapeDetector / HandDetector / VideoOverlay
+    - 흰색 배경 / 거울 모드 설정
+    - 프레임 처리 직렬화용 락 (세션 간에는 병렬 처리)
+    """
+    
+    # set_option으로 변경 가능한 옵션
+    OPTIONS = ('white_background_mode', 'mirror_mode', 'metadata_only')
+    
+    # 기본 추론 해상도 상한 (MediaPipe는 내부적으로 더 작게 축소하므로 손 탐지는 작게)
+    DEFAULT_HAND_INFERENCE_WIDTH = 480
+    DEFAULT_SHAPE_INFERENCE_WIDTH = 640
+    MIN_INFERENCE_WIDTH = 160
+    
+    # 결과 프레임 JPEG 품질 (적응형 품질 조절기가 세션별로 변경)
+    DEFAULT_ENCODE_QUALITY = 70
+    
+    def __init__(self, sid, shape_detector, hand_detector, video_overlay):
+        """
+        초기화
+        
+        Args:
+            sid: Socket.IO 세션 ID
+            shape_detector: 세션 전용 형태 감지기
+            hand_detector: 세션 전용 손 감지기
+            video_overlay: 세션 전용 비디오 오버레이
+        """
+        self.sid = sid
+        self.shape_detector = shape_detector
+        self.hand_detector = hand_detector
+        self.video_overlay = video_overlay
+        
+        # 클라이언트별 표시 모드
+        self.white_background_mode = False  # 흰색 배경 모드 (손 스켈레톤만 표시)
+        self.mirror_mode = True  # 좌우반전 모드 (거울처럼 보이기)
+        self.metadata_only = False  # 메타데이터 전용 응답 (JPEG 재인코딩 생략)
+        
+        # 단계별 추론 해상도 상한 (너비, 픽셀) - 입력이 더 크면 축소 후 탐지
+        # None이면 입력 해상도 그대로 사용
+        self.hand_inference_width = self.DEFAULT_HAND_INFERENCE_WIDTH
+        self.shape_inference_width = self.DEFAULT_SHAPE_INFERENCE_WIDTH
+        
+        # 결과 프레임 JPEG 품질
+        self.encode_quality = self.DEFAULT_ENCODE_QUALITY
+        
+        # 같은 세션의 프레임은 순서대로 처리
+        self.lock = threading.Lock()
+        self.closed = False
+        
+        self.created_at = time.time()
+        self.last_active = self.created_at
+    
+    def touch(self):
+        """
+        마지막 활동 시간 갱신
+        """
+        self.last_active = time.time()
+    
+    def set_option(self, name, value):
+        """
+        표시/전송 옵션 설정
+        
+        Args:
+            name: 'white_background_mode' | 'mirror_mode' | 'metadata_only'
+            value: bool
+        """
+        if name not in self.OPTIONS:
+            raise ValueError(f"알 수 없는 세션 옵션: {name}")
+        setattr(self, name, bool(value))
+    
+    def set_adjustment(self, brightness=None, saturation=None):
+        """
+        명도/채도 조정 파라미터 설정
+        """
+        self.shape_detector.set_adjustment(brightness=brightness, saturation=saturation)
+    
+    def set_thresholds(self, threshold_enter=None, threshold_exit=None):
+        """
+        히스테리시스 임계값 설정
+        """
+        if threshold_enter is not None:
+            self.shape_detector.threshold_enter = float(threshold_enter)
+        if threshold_exit is not None:
+            self.shape_detector.threshold_exit = float(threshold_exit)
+    
+    def set_inference_width(self, hand=None, shape=None):
+        """
+        단계별 추론 해상도 상한 설정
+        
+        Args:
+            hand: 손 탐지 최대 너비 (픽셀, 0이면 제한 없음)
+            shape: 형태 탐지 최대 너비 (픽셀, 0이면 제한 없음)
+        """
+        if hand is not None:
+            self.hand_inference_width = self._clamp_inference_width(hand)
+        if shape is not None:
+            self.shape_inference_width = self._clamp_inference_width(shape)
+    
+    def _clamp_inference_width(self, width):
+        """
+        추론 너비 값 정리 (0 이하는 제한 없음)
+        """
+        width = int(width)
+        if width <= 0:
+            return None
+        return max(self.MIN_INFERENCE_WIDTH, width)
+    
+    def set_encode_quality(self, quality):
+        """
+        결과 프레임 JPEG 품질 설정
+        
+        Args:
+            quality: JPEG 품질 (1 ~ 100 범위로 제한)
+        """
+        self.encode_quality = min(100, max(1, int(quality)))
+    
+    def reset(self):
+        """
+        형태 감지기 및 비디오 오버레이 리셋
+        """
+        self.shape_detector.reset()
+        self.video_overlay.reset()
+
+
+class SessionManager:
+    """
+    세션 레지스트리
+    - request.sid 별 PipelineSession 생성/조회
+    - 참조 윤곽선, 비디오 정보 등 읽기 전용 데이터는 템플릿에서 공유
+    - MediaPipe 그래프(HandDetector)는 풀에 반납하여 재사용
+    - 연결 해제 또는 유휴 시간 초과 시 세션 제거
+    - 연결 해제된 sid는 기억해 두고 세션을 다시 만들지 않음 (해제 후 도착한 프레임/제어 요청 거부)
+    """
+    
+    # 기억할 연결 해제 sid 최대 개수 (Socket.IO sid는 재사용되지 않으므로 최근 것만 보관)
+    RELEASED_HISTORY = 4096
+    
+    def __init__(self, shape_template, video_template, hand_detector_factory,
+                 idle_timeout=300.0, max_pool_size=4):
+        """
+        초기화
+        
+        Args:
+            shape_template: 참조 데이터를 공유할 ShapeDetector
+            video_template: 비디오 정보를 공유할 VideoOverlay
+            hand_detector_factory: 새 HandDetector 생성 함수
+            idle_timeout: 유휴 세션 제거 시간 (초)
+            max_pool_size: 재사용을 위해 보관할 HandDetector 최대 개수
+        """
+        self.shape_template = shape_template
+        self.video_template = video_template
+        self.hand_detector_factory = hand_detector_factory
+        self.idle_timeout = idle_timeout
+        self.max_pool_size = max_pool_size
+        
+        self._sessions = {}
+        self._released = OrderedDict()  # 연결 해제된 sid (삽입 순서로 오래된 것부터 제거)
+        self._hand_pool = []
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._sessions)
+    
+    def add_to_pool(self, hand_detector):
+        """
+        미리 생성한 HandDetector를 풀에 추가
+        
+        Args:
+            hand_detector: 재사용할 손 감지기
+        """
+        with self._lock:
+            self._hand_pool.append(hand_detector)
+    
+    def _acquire_hand_detector(self):
+        """
+        풀에서 HandDetector를 꺼내거나 새로 생성
+        """
+        with self._lock:
+            if self._hand_pool:
+                return self._hand_pool.pop()
+        return self.hand_detector_factory()
+    
+    def _release_hand_detector(self, hand_detector):
+        """
+        HandDetector를 풀에 반납 (풀이 가득 차면 해제)
+        """
+        hand_detector.reset()
+        with self._lock:
+            if len(self._hand_pool) < self.max_pool_size:
+                self._hand_pool.append(hand_detector)
+                return
+        hand_detector.release()
+    
+    def get(self, sid):
+        """
+        세션 조회 (없으면 생성)
+        
+        Args:
+            sid: Socket.IO 세션 ID
+        
+        Returns:
+            PipelineSession
+        
+        Raises:
+            RuntimeError: 연결 해제된 sid
+        """
+        with self._lock:
+            session = self._sessions.get(sid)
+            if session is not None:
+                return session
+            if sid in self._released:
+                raise RuntimeError(f"연결이 해제된 세션입니다: {sid}")
+        
+        # MediaPipe 그래프 생성은 느리므로 레지스트리 락 밖에서 수행
+        hand_detector = self._acquire_hand_detector()
+        new_session = PipelineSession(
+            sid,
+            self.shape_template.clone(),
+            hand_detector,
+            self.video_template.clone()
+        )
+        
+        with self._lock:
+            session = self._sessions.get(sid)
+            released = sid in self._released
+            if session is None and not released:
+                self._sessions[sid] = new_session
+                return new_session
+        
+        # 다른 스레드가 먼저 생성했거나 그사이 연결 해제됨 - 감지기 반납
+        self._release_hand_detector(hand_detector)
+        if session is None:
+            raise RuntimeError(f"연결이 해제된 세션입니다: {sid}")
+        return session
+    
+    @contextmanager
+    def session(self, sid):
+        """
+        세션을 잠근 상태로 사용 (같은 세션의 요청을 직렬화)
+        
+        Args:
+            sid: Socket.IO 세션 ID
+        
+        Yields:
+            PipelineSession
+        """
+        while True:
+            session = self.get(sid)
+            session.lock.acquire()
+            if not session.closed:
+                break
+            # 잠금을 기다리는 동안 제거됨 - 새 세션으로 재시도 (연결 해제였으면 get()이 거부)
+            session.lock.release()
+        
+        try:
+            session.touch()
+            yield session
+        finally:
+            session.lock.release()
+    
+    def process_frame(self, sid, image_bytes, network_latency=None, timestamp=None):
+        """
+        세션 파이프라인으로 프레임 처리
+        
+        Args:
+            sid: Socket.IO 세션 ID
+            image_bytes: JPEG 바이트
+            network_latency: 네트워크 왕복 시간 (초, 선택적)
+            timestamp: 프레임 도착 시각 (초, 선택적)
+        
+        Returns:
+            dict: processed_frame 이벤트 데이터 (디코딩 실패 시 None)
+        """
+        with self.session(sid) as session:
+            return frame_pipeline.process_frame(session, image_bytes, network_latency, timestamp)
+    
+    def control(self, sid, method, *args):
+        """
+        세션 제어 메서드 호출 (set_adjustment, set_option, reset 등)
+        
+        Args:
+            sid: Socket.IO 세션 ID
+            method: PipelineSession 메서드 이름
+            *args: 메서드 인자
+        
+        Returns:
+            메서드 반환값
+        """
+        with self.session(sid) as session:
+            return getattr(session, method)(*args)
+    
+    def release(self, sid, blocking=True):
+        """
+        연결 해제된 세션 제거 (이후 같은 sid로는 세션을 다시 만들지 않음)
+        
+        Args:
+            sid: Socket.IO 세션 ID
+            blocking: 처리 중인 프레임이 끝날 때까지 대기할지 여부
+        
+        Returns:
+            bool: 제거되었으면 True
+        """
+        with self._lock:
+            self._released[sid] = True
+            while len(self._released) > self.RELEASED_HISTORY:
+                self._released.popitem(last=False)
+        return self.evict(sid, blocking)
+    
+    def evict(self, sid, blocking=True):
+        """
+        세션 제거 (연결은 유지 - 다음 요청이 오면 새 세션 생성)
+        
+        Args:
+            sid: Socket.IO 세션 ID
+            blocking: 처리 중인 프레임이 끝날 때까지 대기할지 여부
+        
+        Returns:
+            bool: 제거되었으면 True
+        """
+        with self._lock:
+            session = self._sessions.get(sid)
+        if session is None:
+            return False
+        
+        if not session.lock.acquire(blocking=blocking):
+            return False
+        
+        try:
+            with self._lock:
+                if self._sessions.get(sid) is session:
+                    del self._sessions[sid]
+            session.closed = True
+            session.video_overlay.release()
+            self._release_hand_detector(session.hand_detector)
+        finally:
+            session.lock.release()
+        
+        return True
+    
+    def evict_idle(self, now=None):
+        """
+        유휴 시간이 초과된 세션 제거
+        
+        Args:
+            now: 기준 시간 (기본값: 현재 시간)
+        
+        Returns:
+            list: 제거된 세션 ID 목록
+        """
+        if now is None:
+            now = time.time()
+        
+        with self._lock:
+            idle_sids = [
+                sid for sid, session in self._sessions.items()
+                if now - session.last_active > self.idle_timeout
+            ]
+        
+        # 처리 중인 세션은 건너뜀 (활동 중이므로 다음 주기에 다시 판단)
+        return [sid for sid in idle_sids if self.evict(sid, blocking=False)]
@@ -0,0 +1,174 @@
+"""
+세션 녹화 모듈
+클라이언트가 보낸 video_frame / 제어 이벤트를 타임스탬프와 함께 파일에 기록하고,
+replay_benchmark.py 등에서 다시 읽을 수 있도록 합니다.
+
+파일 형식 (.sprec)
+- 헤더: MAGIC (8바이트)
+- 레코드: <d B I> (타임스탬프 초, 종류, 데이터 길이) + 데이터
+  - 종류 0 (프레임): JPEG 바이트 그대로 (base64 미사용)
+  - 종류 1 (제어 이벤트): {"event": 이름, "data": 데이터} UTF-8 JSON
+"""
+import json
+import os
+import queue
+import struct
+import threading
+import time
+
+from event_log import get_logger
+from image_payload import decode_image_payload
+
+log = get_logger('session_recorder')
+
+MAGIC = b'SPREC01\n'
+
+RECORD_FRAME = 0
+RECORD_CONTROL = 1
+
+_RECORD_HEADER = struct.Struct('<dBI')
+
+
+class SessionRecorder:
+    """
+    세션 1개의 이벤트 녹화기
+    - 타임스탬프는 녹화 시작 기준 경과 시간 (초)
+    - record_*는 큐에 넣기만 하고 반환 (asyncio 이벤트 루프에서 호출해도 블로킹 없음)
+    - base64 디코딩과 파일 쓰기는 녹화기 전용 스레드가 받은 순서대로 수행
+    """
+    
+    def __init__(self, path):
+        """
+        초기화 (파일은 쓰기 스레드가 생성)
+        
+        Args:
+            path: 녹화 파일 경로
+        """
+        self.path = path
+        self._started = time.monotonic()
+        self._queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write_loop, name='session-recorder', daemon=True)
+        self._writer.start()
+    
+    def _enqueue(self, kind, payload):
+        """
+        레코드 1개를 쓰기 큐에 추가 (타임스탬프는 호출 시각)
+        """
+        record = (time.monotonic() - self._started, kind, payload)
+        with self._lock:
+            if self._closed:
+                return
+            self._queue.put(record)
+    
+    def _write_loop(self):
+        """
+        쓰기 스레드: 큐의 레코드를 파일에 기록 (close의 None을 받으면 종료)
+        """
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'wb') as f:
+                f.write(MAGIC)
+                while True:
+                    record = self._queue.get()
+                    if record is None:
+                        break
+                    timestamp, kind, payload = record
+                    if kind == RECORD_FRAME:
+                        try:
+                            payload = decode_image_payload(payload)
+                        except ValueError as e:
+                            log.warning('record_frame_skipped', '녹화할 수 없는 프레임', path=self.path,
+                                        error=str(e))
+                            continue
+                    f.write(_RECORD_HEADER.pack(timestamp, kind, len(payload)))
+                    f.write(payload)
+        except OSError as e:
+            log.error('record_error', '세션 녹화 중단', path=self.path, error=str(e))
+            with self._lock:
+                self._closed = True
+    
+    def record_frame(self, image_data):
+        """
+        video_frame 이미지 기록
+        
+        Args:
+            image_data: JPEG 바이트 또는 base64 Data URL 문자열 (쓰기 스레드에서 디코딩)
+        """
+        # 재사용될 수 있는 버퍼는 지금 복사
+        if isinstance(image_data, (bytearray, memoryview)):
+            image_data = bytes(image_data)
+        self._enqueue(RECORD_FRAME, image_data)
+    
+    def record_control(self, event, data):
+        """
+        제어 이벤트 기록 (set_adjustment, set_mirror_mode 등)
+        
+        Args:
+            event: 이벤트 이름
+            data: 이벤트 데이터 (JSON 직렬화 가능)
+        """
+        payload = json.dumps({'event': event, 'data': data}, ensure_ascii=False)
+        self._enqueue(RECORD_CONTROL, payload.encode('utf-8'))
+    
+    def close(self):
+        """
+        남은 레코드를 모두 기록하고 파일 닫기 (블로킹 - 쓰기 스레드 종료 대기)
+        """
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        self._writer.join()
+
+
+def open_session_recorder(directory, sid):
+    """
+    세션 녹화기 생성 (폴더/파일은 쓰기 스레드가 생성)
+    
+    Args:
+        directory: 녹화 파일을 저장할 폴더
+        sid: Socket.IO 세션 ID
+    
+    Returns:
+        SessionRecorder
+    """
+    filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{sid}.sprec"
+    return SessionRecorder(os.path.join(directory, filename))
+
+
+def read_recording(path):
+    """
+    녹화 파일 읽기
+    
+    Args:
+        path: 녹화 파일 경로
+    
+    Yields:
+        tuple: (타임스탬프 초, 이벤트 이름, 데이터)
+               프레임은 ('video_frame', JPEG 바이트), 제어 이벤트는 (이름, dict)
+    
+    Raises:
+        ValueError: 녹화 파일 형식이 아님
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"녹화 파일 형식이 아닙니다: {path}")
+        
+        while True:
+            header = f.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                # 정상 종료 또는 녹화 중 비정상 종료로 잘린 마지막 레코드
+                break
+            
+            timestamp, kind, length = _RECORD_HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                break
+            
+            if kind == RECORD_FRAME:
+                yield timestamp, 'video_frame', payload
+            elif kind == RECORD_CONTROL:
+                record = json.loads(payload.decode('utf-8'))
+                yield timestamp, record['event'], record['data']
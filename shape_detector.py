@@ -6,6 +6,16 @@ import cv2
 import numpy as np
 import time
 
+from pose_predictor import PosePredictor
+from shape_library import ShapeLibrary
+from shape_scoring import score_contours
+
+# 최소 윤곽선 면적 (원본 해상도 기준, 축소 프레임/피라미드에서는 면적 배율로 환산)
+MIN_CONTOUR_AREA = 2000
+
+# 적응형 임계값 블록 크기 (탐지 프레임 기준, 피라미드 단계에서는 축소 배율만큼 줄임)
+ADAPTIVE_BLOCK_SIZE = 11
+
 
 class ShapeDetector:
     """
@@ -16,26 +26,60 @@ class ShapeDetector:
     - 명도/채도 조정
     """
     
-    def __init__(self, reference_image_path):
+    def __init__(self, reference_image_path, library_dir=None, pyramid_levels=0,
+                 motion_prediction=False):
         """
         초기화
         
         Args:
-            reference_image_path: 참조 이미지 경로 (탐지할 형태)
+            reference_image_path: 참조 이미지 경로 (기본 형태)
+            library_dir: 함께 인식할 참조 이미지 폴더 (선택적, 개/새/사슴 등)
+            pyramid_levels: 윤곽선 탐색 피라미드 단계 (0이면 끔, 1이면 1/2 축소(픽셀 1/4)에서
+                            먼저 찾고 후보 영역만 원래 해상도로 다듬음)
+            motion_prediction: EMA 대신 등속도 칼만 필터로 추적하고 결과가 표시될 시점
+                               (클라이언트 왕복 시간 뒤)의 자세를 출력할지 여부
+        """
+        # 참조 윤곽선 기술자 (프레임마다 다시 계산하지 않도록 미리 계산)
+        self.library = ShapeLibrary.load(reference_image_path, library_dir)
+        self.reference = self.library.primary
+        self.pyramid_levels = pyramid_levels
+        self.motion_prediction = motion_prediction
+        
+        self._init_state()
+    
+    @property
+    def reference_contour(self):
+        """
+        기본 형태 참조 윤곽선 (읽기 전용 배열)
+        """
+        return self.reference.contour
+    
+    def clone(self):
         """
-        # 참조 이미지 로드
-        self.reference_image = cv2.imread(reference_image_path)
-        if self.reference_image is None:
-            raise ValueError(f"참조 이미지를 로드할 수 없습니다: {reference_image_path}")
+        참조 데이터를 공유하는 새 감지기 생성 (세션별 인스턴스용)
         
-        # 참조 윤곽선 추출
-        self.reference_contour = self._extract_reference_contour()
-        if self.reference_contour is None:
-            raise ValueError("참조 이미지에서 유효한 윤곽선을 찾을 수 없습니다")
+        형태 라이브러리/기술자는 읽기 전용이므로 복사하지 않고 공유하며,
+        잠금/스무딩/드래그 등 프레임별 상태만 새로 초기화합니다.
         
+        Returns:
+            ShapeDetector: 상태가 초기화된 새 감지기
+        """
+        detector = ShapeDetector.__new__(ShapeDetector)
+        detector.library = self.library
+        detector.reference = self.reference
+        detector.pyramid_levels = self.pyramid_levels
+        detector.motion_prediction = self.motion_prediction
+        detector._init_state()
+        return detector
+    
+    def _init_state(self):
+        """
+        세션별 가변 상태 초기화
+        """
         # 명도/채도 조정 파라미터
         self.brightness = 0  # -100 ~ +100
         self.saturation = 0  # -100 ~ +100
+        self._adjustment_cache = None  # ((명도, 채도), 룩업 테이블)
         
         # 히스테리시스 파라미터
         self.threshold_enter = 0.25  # 잠금 진입 임계값 (낮을수록 엄격)
@@ -48,6 +92,9 @@ class ShapeDetector:
         self.good_frames = 0
         self.bad_frames = 0
         
+        # 시간 함수 (녹화 재생 시 녹화 타임스탬프 기준 시계로 교체)
+        self.clock = time.time
+        
         # 영구 활성화 (3초 이상 탐지 시)
         self.permanent_activation_time = 3.0  # 3초
         self.locked_start_time = None
@@ -80,39 +127,45 @@ class ShapeDetector:
         
         self.alpha = 0.3          # 일반 EMA 계수
         self.alpha_frame = 0.5    # 프레임 중심 EMA 계수 (더 부드럽게)
-    
-    def _extract_reference_contour(self):
-        """
-        참조 이미지에서 가장 큰 윤곽선 추출
-        
-        Returns:
-            참조 윤곽선 (numpy array)
-        """
-        gray = cv2.cvtColor(self.reference_image, cv2.COLOR_BGR2GRAY)
-        
-        # 적응형 임계값
-        binary = cv2.adaptiveThreshold(
-            gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY_INV, 11, 2
-        )
-        
-        # 모폴로지 연산으로 노이즈 제거
-        kernel = np.ones((3, 3), np.uint8)
-        binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, iterations=2)
-        binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel, iterations=1)
-        
-        # 윤곽선 찾기
-        contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        if not contours:
-            return None
         
-        # 가장 큰 윤곽선 반환
-        return max(contours, key=cv2.contourArea)
+        # 지연 보상 예측 (motion_prediction이면 EMA 대신 사용)
+        self.network_latency = None       # 평활화된 네트워크 왕복 시간 (초, 서버 처리 시간 제외)
+        self.network_latency_alpha = 0.2  # 네트워크 왕복 시간 EMA 계수
+        self._predictor = PosePredictor()
+        self._frame_time = None           # 이번 프레임의 측정 시각 (도착 시각, 없으면 처리 시각)
+        
+        # 즉시 시작 결과 캐시 ((중심 x, 중심 y, 스케일), 결과)
+        self._instant_start_cache = None
+        
+        # 관심 영역(ROI) 추적 (잠금 중에는 마지막 윤곽선 주변만 탐색)
+        self.roi_tracking = True          # ROI 추적 사용 여부
+        self.roi_padding = 0.25           # 윤곽선 바운딩 박스 긴 변 대비 여백 비율
+        self.roi_max_misses = 3           # 연속 몇 프레임 놓치면 ROI 없이 전체 프레임만 탐색
+        self.roi_full_search_interval = 30  # ROI 탐색 몇 번마다 전체 프레임 탐색 (K)
+        self.last_search_window = None    # 마지막 탐색 영역 (x0, y0, x1, y1), 전체 탐색이면 None
+        self._roi_box = None              # ROI 기준 윤곽선 바운딩 박스 (x0, y0, x1, y1, 원본 해상도 좌표)
+        self._roi_misses = 0
+        self._roi_frames = 0              # 마지막 전체 탐색 이후 ROI 탐색 횟수
+        
+        # 광류 추적 (잠금 중에는 전체 탐지 사이 프레임을 Lucas-Kanade 광류로 추적)
+        self.flow_tracking = True         # 광류 추적 사용 여부
+        self.flow_detection_interval = 5  # 몇 프레임마다 전체 탐지 (N, 사이 프레임은 광류 추적)
+        self.flow_max_width = 320         # 광류 계산용 그레이스케일 이미지 최대 너비
+        self.flow_max_points = 64         # 추적할 윤곽선 키포인트 최대 개수
+        self.flow_min_points = 8          # 추적 신뢰 최소 인라이어 수
+        self.flow_min_inlier_ratio = 0.6  # 추적 신뢰 최소 인라이어 비율 (키포인트 대비)
+        self.flow_max_scale_step = 1.25   # 한 프레임 최대 스케일 변화 (넘으면 전체 탐지)
+        self.last_tracked = False         # 마지막 프레임이 광류 추적 결과인지 여부
+        self._flow = None                 # 추적 상태 (이전 그레이, 키포인트, 윤곽선, 점수, 참조)
+        self._flow_frames = 0             # 마지막 전체 탐지 이후 광류 추적 프레임 수
+        
+        # 피라미드 탐색 (단계 수는 생성자 인자, 축소 후 짧은 변이 이보다 작으면 원래 해상도로 탐색)
+        self.pyramid_min_size = 64
+        self.pyramid_candidates = 3       # 원래 해상도로 다듬을 축소 단계 상위 후보 수
     
     def apply_brightness_saturation(self, image):
         """
-        명도/채도 조정 적용
+        명도/채도 조정 적용 (미리 계산한 룩업 테이블을 uint8 채널에 그대로 적용)
         
         Args:
             image: 입력 이미지 (BGR 컬러 또는 그레이스케일)
@@ -124,40 +177,47 @@ class ShapeDetector:
         if self.brightness == 0 and self.saturation == 0:
             return image
         
+        hsv_table, value_table = self._adjustment_tables()
+        
         # 그레이스케일이면 명도만 조정
         if len(image.shape) == 2:
-            # 명도 조정 (단순 덧셈)
             if self.brightness != 0:
-                img = image.astype(np.float32)
-                img = img + self.brightness
-                img = np.clip(img, 0, 255)
-                return img.astype(np.uint8)
+                return cv2.LUT(image, value_table)
             return image
         
-        # 컬러 이미지: HSV로 변환하여 조정
-        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV).astype(np.float32)
+        # 컬러 이미지: HSV로 변환하여 S/V 채널을 한 번에 변환 (H는 그대로)
+        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+        hsv = cv2.LUT(hsv, hsv_table)
+        return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+    
+    def _adjustment_tables(self):
+        """
+        명도/채도 룩업 테이블 (조정 값이 바뀔 때만 다시 계산)
+        
+        Returns:
+            tuple: (HSV 3채널 테이블 (1, 256, 3), 명도 테이블 (256,))
+        """
+        key = (self.brightness, self.saturation)
+        if self._adjustment_cache is not None and self._adjustment_cache[0] == key:
+            return self._adjustment_cache[1]
         
-        # 채도 조정 (S 채널)
-        if self.saturation != 0:
-            # -100 ~ +100을 0.0 ~ 2.0 배율로 변환
-            sat_scale = 1.0 + (self.saturation / 100.0)
-            hsv[:, :, 1] = hsv[:, :, 1] * sat_scale
-            hsv[:, :, 1] = np.clip(hsv[:, :, 1], 0, 255)
+        levels = np.arange(256, dtype=np.float32)
         
-        # 명도 조정 (V 채널)
-        if self.brightness != 0:
-            hsv[:, :, 2] = hsv[:, :, 2] + self.brightness
-            hsv[:, :, 2] = np.clip(hsv[:, :, 2], 0, 255)
+        # 채도: -100 ~ +100을 0.0 ~ 2.0 배율로 변환
+        sat_scale = 1.0 + (self.saturation / 100.0)
+        saturation_table = np.clip(levels * sat_scale, 0, 255).astype(np.uint8)
         
-        # BGR로 다시 변환
-        hsv = hsv.astype(np.uint8)
-        result = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+        # 명도: 단순 덧셈
+        value_table = np.clip(levels + self.brightness, 0, 255).astype(np.uint8)
         
-        return result
+        hsv_table = np.dstack([levels.astype(np.uint8), saturation_table, value_table])
+        tables = (hsv_table, value_table)
+        self._adjustment_cache = (key, tables)
+        return tables
     
     def set_adjustment(self, brightness=None, saturation=None):
         """
-        명도/채도 조정 파라미터 설정
+        명도/채도 조정 파라미터 설정 (룩업 테이블은 다음 적용 시 한 번 다시 계산)
         
         Args:
             brightness: 명도 (-100 ~ +100)
@@ -216,18 +276,75 @@ class ShapeDetector:
             abs(self.drag_offset_y) > self.screen_height):
             self.is_pushed_off_screen = True
     
-    def detect(self, frame, hand_collision_data=None):
+    def update_interaction(self, hand_collision_data=None):
         """
-        프레임에서 형태 탐지
+        손 잡기/드래그 상태 업데이트 (프레임마다 한 번 호출)
+        
+        충돌이 이어지는 동안 잡기 상태가 프레임 사이에 유지되므로
+        손의 이동량이 drag_offset에 누적되어 토끼가 손을 따라 움직입니다.
+        (이전에는 충돌 검사 전에 매 프레임 잡기를 해제하여 오프셋이 누적되지 않았음)
         
         Args:
-            frame: 입력 프레임 (BGR)
             hand_collision_data: 손 충돌 데이터 (선택적)
                 {
                     'collision': bool,
                     'collision_point': tuple (x, y),
-                    'rabbit_center': tuple (x, y)  # 추가
+                    'rabbit_center': tuple (x, y)
                 }
+        """
+        if hand_collision_data and hand_collision_data.get('collision'):
+            # 손이 토끼에 닿아있음 - 잡기
+            hand_pos = hand_collision_data.get('collision_point')
+            rabbit_center = hand_collision_data.get('rabbit_center')
+            if hand_pos and rabbit_center:
+                self.apply_grab(hand_pos, rabbit_center)
+        else:
+            # 손이 토끼에서 멀어짐 - 놓기
+            if self.is_grabbed:
+                self.release_grab()
+        
+        # 드래그 물리 업데이트
+        self.update_drag_physics()
+    
+    def apply_drag(self, geometry):
+        """
+        형태 위치 결과에 현재 드래그 오프셋 적용
+        
+        상태를 바꾸지 않으므로 같은 프레임에서 여러 번 호출해도 됩니다
+        (충돌 검사용 위치와 최종 결과 모두 한 번의 detect_geometry 결과에서 생성).
+        
+        Args:
+            geometry: detect_geometry 결과
+        
+        Returns:
+            dict: 드래그가 적용된 새 탐지 결과 (geometry는 수정하지 않음)
+        """
+        result = dict(geometry)
+        
+        if geometry['frame_corners'] is not None:
+            result['frame_corners'] = [
+                [x + self.drag_offset_x, y + self.drag_offset_y]
+                for x, y in geometry['frame_corners']
+            ]
+        if geometry['center'] is not None:
+            cx, cy = geometry['center']
+            result['center'] = (cx + self.drag_offset_x, cy + self.drag_offset_y)
+        
+        result['drag_offset'] = (self.drag_offset_x, self.drag_offset_y)
+        result['is_grabbed'] = self.is_grabbed
+        result['is_pushed_off_screen'] = self.is_pushed_off_screen
+        return result
+    
+    def detect(self, frame, hand_collision_data=None):
+        """
+        프레임에서 형태 탐지 (손 인터랙션 업데이트 + 위치 탐지 + 드래그 적용)
+        
+        한 프레임에서 충돌 검사와 최종 결과가 모두 필요하면 detect_geometry,
+        update_interaction, apply_drag를 직접 사용하여 탐지를 한 번만 수행합니다.
+        
+        Args:
+            frame: 입력 프레임 (BGR)
+            hand_collision_data: 손 충돌 데이터 (선택적, update_interaction 참고)
         
         Returns:
             dict: {
@@ -237,6 +354,7 @@ class ShapeDetector:
                 'angle': float - 회전 각도
                 'scale': float - 스케일
                 'score': float - 매칭 점수
+                'shape_name': str - 일치한 형태 이름 (형태 라이브러리 참조 이미지 이름)
                 'frame_corners': list - 프레임 4개 코너 좌표
                 'is_locked': bool - 잠금 상태
                 'drag_offset': tuple - 드래그 오프셋 (x, y)
@@ -244,76 +362,99 @@ class ShapeDetector:
                 'is_pushed_off_screen': bool - 화면 밖 여부
             }
         """
-        # 화면 크기 업데이트
-        self.screen_height, self.screen_width = frame.shape[:2]
+        self.update_interaction(hand_collision_data)
+        return self.apply_drag(self.detect_geometry(frame))
+    
+    def detect_geometry(self, frame, output_size=None, network_latency=None, timestamp=None):
+        """
+        프레임에서 형태 위치 탐지 (드래그 오프셋 미적용)
         
-        # 손 잡기/드래그 처리
-        if hand_collision_data and hand_collision_data.get('collision'):
-            # 손이 토끼에 닿아있음 - 잡기
-            hand_pos = hand_collision_data.get('collision_point')
-            rabbit_center = hand_collision_data.get('rabbit_center')
-            if hand_pos and rabbit_center:
-                self.apply_grab(hand_pos, rabbit_center)
+        윤곽선 추출/매칭과 히스테리시스/EMA 상태는 호출마다 한 번씩 진행되므로
+        프레임마다 한 번만 호출해야 합니다.
+        
+        Args:
+            frame: 윤곽선을 추출할 프레임 (BGR, 추론용 축소 프레임일 수 있음)
+            output_size: 결과 좌표 기준 원본 해상도 (width, height)
+                         None이면 frame 크기 그대로 사용
+            network_latency: 네트워크 왕복 시간 (초, 선택적 - 클라이언트 왕복 시간에서 서버 처리 시간을 뺀 값)
+                             motion_prediction이면 결과가 화면에 표시될 시점의 자세를 예측해 반환
+            timestamp: 프레임 도착 시각 (초, self.clock 기준, 선택적 - None이면 처리 시각)
+        
+        Returns:
+            dict: detect 결과에서 드래그 관련 항목을 뺀 탐지 정보
+                  (center/frame_corners는 드래그 전 위치)
+        """
+        if output_size is None:
+            frame_h, frame_w = frame.shape[:2]
         else:
-            # 손이 토끼에서 멀어짐 - 놓기
-            if self.is_grabbed:
-                self.release_grab()
+            frame_w, frame_h = output_size
+        frame_shape = (frame_h, frame_w)
+        
+        # 화면 크기 업데이트 (세션 중 캡처 해상도가 바뀌면 좌표 상태를 새 해상도로 환산)
+        if (frame_w, frame_h) != (self.screen_width, self.screen_height):
+            self._rescale_spatial_state(frame_w / self.screen_width, frame_h / self.screen_height)
+        self.screen_height, self.screen_width = frame_h, frame_w
+        
+        # 왕복 시간 갱신 (프레임마다 흔들리므로 평활화)
+        if network_latency is not None:
+            if self.network_latency is None:
+                self.network_latency = network_latency
+            else:
+                self.network_latency += self.network_latency_alpha * (network_latency - self.network_latency)
         
-        # 드래그 물리 업데이트
-        self.update_drag_physics()
+        self._frame_time = timestamp
         
         # 즉시 시작 모드: 형태 탐지 없이 화면 중앙에 토끼 표시
         if self.instant_start_mode:
-            return self._get_instant_start_result(frame.shape)
-        # 그레이스케일 변환
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
-        # 가우시안 블러로 노이즈 제거 (커널 크기 축소 - 속도 향상)
-        gray = cv2.GaussianBlur(gray, (3, 3), 0)
+            return self._get_instant_start_result(frame_shape)
         
-        # 적응형 임계값
-        binary = cv2.adaptiveThreshold(
-            gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY_INV, 11, 2
-        )
+        # 축소 프레임에서 탐지하면 좌표/면적을 원본 해상도로 환산
+        scale = frame_w / frame.shape[1]
+        area_scale = scale * scale
+        max_area = frame_h * frame_w * 0.5  # 프레임의 50%
         
-        # 모폴로지 연산 (반복 횟수 줄임 - 속도 향상)
-        kernel = np.ones((3, 3), np.uint8)
-        binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, iterations=1)
-        # MORPH_OPEN 생략 (속도 향상)
+        # 잠금 중이면 전체 탐지 사이 프레임은 광류로 추적 (신뢰도가 낮으면 같은 프레임에서 전체 탐지)
+        # 광류용 그레이스케일은 추적 중이거나 추적을 시작할 때만 계산
+        flow_gray = None
+        self.last_tracked = False
+        if self._flow is not None:
+            flow_gray = self._flow_gray(frame)
+            result = self._track_flow(flow_gray, frame_shape)
+            if result is not None:
+                self.last_tracked = True
+                return result
         
-        # 윤곽선 찾기
-        contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # 잠금 중이면 마지막 윤곽선 주변(ROI)만 임계값/윤곽선 처리
+        window = self._search_window(frame, scale)
+        if window is not None:
+            x0, y0, x1, y1 = window
+            best_match, best_score, best_reference = self._find_best_match(
+                frame[y0:y1, x0:x1], (x0, y0), area_scale, max_area
+            )
+            self._roi_frames += 1
+            if best_match is None or best_score > self.threshold_exit:
+                # ROI에서 놓치면 같은 프레임에서 전체 프레임 탐색
+                window = None
+        
+        if window is None:
+            best_match, best_score, best_reference = self._find_best_match(
+                frame, (0, 0), area_scale, max_area
+            )
+            self._roi_frames = 0
+        self.last_search_window = window
+        
+        # 잠금 해제 임계값 안에서 찾지 못한 연속 프레임 수 (ROI 사용 여부 판단)
+        if best_match is not None and best_score <= self.threshold_exit:
+            self._roi_misses = 0
+        else:
+            self._roi_misses += 1
         
-        if not contours:
+        if best_score is None:
             return self._no_detection_result()
         
-        # 필터링 및 매칭
-        best_match = None
-        best_score = float('inf')
-        
-        frame_h, frame_w = frame.shape[:2]
-        max_area = frame_h * frame_w * 0.5  # 프레임의 50%
-        
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            
-            # 면적 필터
-            if area < 2000 or area > max_area:
-                continue
-            
-            # 종횡비 필터
-            x, y, w, h = cv2.boundingRect(contour)
-            aspect_ratio = w / float(h) if h > 0 else 0
-            if aspect_ratio < 0.5 or aspect_ratio > 2.0:
-                continue
-            
-            # 형태 매칭
-            score = cv2.matchShapes(self.reference_contour, contour, cv2.CONTOURS_MATCH_I3, 0)
-            
-            if score < best_score:
-                best_score = score
-                best_match = contour
+        # 선택된 윤곽선만 원본 해상도 좌표로 변환
+        if best_match is not None and scale != 1.0:
+            best_match = (best_match * scale).astype(np.int32)
         
         # 히스테리시스 적용
         if best_match is not None:
@@ -325,7 +466,7 @@ class ShapeDetector:
                         self.is_locked = True
                         self.bad_frames = 0
                         # 잠금 시작 시간 기록
-                        self.locked_start_time = time.time()
+                        self.locked_start_time = self.clock()
                 else:
                     self.good_frames = 0
             else:
@@ -343,7 +484,7 @@ class ShapeDetector:
                 
                 # 3초 이상 잠금 상태 유지 시 영구 활성화
                 if self.locked_start_time is not None:
-                    elapsed = time.time() - self.locked_start_time
+                    elapsed = self.clock() - self.locked_start_time
                     if elapsed >= self.permanent_activation_time:
                         self.is_permanently_active = True
         else:
@@ -363,10 +504,11 @@ class ShapeDetector:
         if self.is_permanently_active:
             if best_match is not None and self.is_locked:
                 # 새로운 탐지 결과 저장
-                result = self._extract_shape_info(best_match, best_score, frame.shape)
+                result = self._extract_shape_info(best_match, best_score, best_reference, frame_shape)
                 result['is_locked'] = self.is_locked
                 result['is_permanently_active'] = True
                 self.last_valid_result = result
+                self._start_flow(frame, flow_gray, best_match, best_score, best_reference)
                 return result
             elif self.last_valid_result is not None:
                 # 탐지 실패 시 마지막 결과 반환
@@ -377,19 +519,294 @@ class ShapeDetector:
             return self._no_detection_result()
         
         # 탐지 성공 - 정보 추출
-        result = self._extract_shape_info(best_match, best_score, frame.shape)
+        result = self._extract_shape_info(best_match, best_score, best_reference, frame_shape)
         result['is_locked'] = self.is_locked
         result['is_permanently_active'] = False
+        self._start_flow(frame, flow_gray, best_match, best_score, best_reference)
         
         return result
     
-    def _extract_shape_info(self, contour, score, frame_shape):
+    def _flow_gray(self, frame):
+        """
+        광류 계산용 축소 그레이스케일 이미지 (광류 추적을 쓰지 않으면 None)
+        
+        Args:
+            frame: 탐지할 프레임 (BGR, 추론용 축소 프레임일 수 있음)
+        
+        Returns:
+            numpy array: 너비 flow_max_width 이하의 그레이스케일 이미지 또는 None
+        """
+        if not self.flow_tracking or self.flow_detection_interval <= 1:
+            self._flow = None
+            return None
+        
+        height, width = frame.shape[:2]
+        if width > self.flow_max_width:
+            size = (self.flow_max_width, max(1, round(height * self.flow_max_width / width)))
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    
+    def _start_flow(self, frame, gray, contour, score, reference):
+        """
+        전체 탐지로 찾은 윤곽선에서 광류 추적 시작
+        
+        Args:
+            frame: 탐지한 프레임 (BGR, 추론용 축소 프레임일 수 있음)
+            gray: 이번 프레임에서 이미 계산한 광류용 그레이스케일 이미지 (None이면 frame에서 계산)
+            contour: 탐지된 윤곽선 (원본 해상도 좌표)
+            score: 매칭 점수 (추적 프레임에서 그대로 보고)
+            reference: 일치한 참조 기술자
+        """
+        self._flow_frames = 0
+        if gray is None:
+            gray = self._flow_gray(frame)
+        if gray is None:
+            self._flow = None
+            return
+        
+        # 원본 해상도 → 광류 이미지 좌표 배율 (x, y)
+        ratio = np.array([gray.shape[1] / self.screen_width, gray.shape[0] / self.screen_height])
+        contour = contour.reshape(-1, 2).astype(np.float32)
+        
+        # 윤곽선 꼭짓점(CHAIN_APPROX_SIMPLE)을 고르게 골라 키포인트로 사용
+        step = max(1, len(contour) // self.flow_max_points)
+        points = (contour[::step] * ratio).astype(np.float32).reshape(-1, 1, 2)
+        self._flow = (gray, points, contour, score, reference, ratio)
+    
+    def _track_flow(self, gray, frame_shape):
+        """
+        이전 프레임 키포인트를 피라미드 Lucas-Kanade 광류로 옮기고 닮음 변환으로 윤곽선 추적
+        
+        flow_detection_interval 프레임마다, 또는 인라이어 수/비율이나 스케일 변화가
+        신뢰 기준을 벗어나면 추적을 멈추고 None을 반환합니다. (호출자가 같은 프레임에서
+        전체 탐지를 수행)
+        
+        Args:
+            gray: 이번 프레임의 광류용 그레이스케일 이미지
+            frame_shape: 결과 좌표 기준 원본 해상도 (height, width)
+        
+        Returns:
+            dict: 추적 결과 (EMA 적용), 전체 탐지가 필요하면 None
+        """
+        prev_gray, points, contour, score, reference, ratio = self._flow
+        self._flow = None
+        if (gray is None or not self.is_locked or prev_gray.shape != gray.shape or
+                self._flow_frames + 1 >= self.flow_detection_interval):
+            return None
+        
+        next_points, status, _ = cv2.calcOpticalFlowPyrLK(
+            prev_gray, gray, points, None, winSize=(15, 15), maxLevel=2
+        )
+        tracked = status.ravel() == 1
+        if np.count_nonzero(tracked) < self.flow_min_points:
+            return None
+        
+        # 키포인트 이동에서 닮음 변환(이동/회전/균일 스케일) 추정 (RANSAC으로 잘못 추적된 점 제외)
+        transform, inliers = cv2.estimateAffinePartial2D(
+            points[tracked], next_points[tracked], method=cv2.RANSAC, ransacReprojThreshold=2.0
+        )
+        if transform is None:
+            return None
+        inliers = inliers.ravel() == 1
+        step_scale = np.hypot(transform[0, 0], transform[1, 0])
+        if (np.count_nonzero(inliers) < max(self.flow_min_points,
+                                            self.flow_min_inlier_ratio * len(points)) or
+                not 1 / self.flow_max_scale_step <= step_scale <= self.flow_max_scale_step):
+            return None
+        
+        # 원본 해상도 윤곽선에 같은 변환 적용 (광류 이미지 좌표로 옮겨 변환 후 되돌림)
+        contour = cv2.transform((contour * ratio).reshape(-1, 1, 2), transform).reshape(-1, 2) / ratio
+        contour = contour.astype(np.float32)
+        
+        result = self._extract_shape_info(
+            np.round(contour).astype(np.int32).reshape(-1, 1, 2), score, reference, frame_shape
+        )
+        if not result['found']:
+            return None
+        result['is_locked'] = self.is_locked
+        result['is_permanently_active'] = self.is_permanently_active
+        if self.is_permanently_active:
+            self.last_valid_result = result
+        
+        # 인라이어 키포인트만 다음 프레임으로 이어서 추적
+        self._flow = (gray, next_points[tracked][inliers].reshape(-1, 1, 2), contour,
+                      score, reference, ratio)
+        self._flow_frames += 1
+        return result
+    
+    def _find_best_match(self, frame, offset, area_scale, max_area):
+        """
+        프레임(또는 ROI)에서 라이브러리의 참조 형태와 가장 비슷한 윤곽선 찾기
+        
+        pyramid_levels가 1 이상이면 축소 이미지에서 이진화/윤곽선 추출/매칭을 먼저 하고
+        상위 pyramid_candidates개 후보의 바운딩 박스(여백 포함)만 원래 해상도로 다시
+        처리해 경계를 다듬습니다. 면적 필터는 area_scale로, 적응형 임계값 블록 크기는 축소 배율로
+        자동 환산됩니다.
+        
+        Args:
+            frame: 탐색할 이미지 (BGR)
+            offset: 윤곽선 좌표에 더할 (x, y) (ROI 좌상단, 탐지 프레임 좌표)
+            area_scale: 면적 환산 배율 (탐지 프레임 → 원본 해상도)
+            max_area: 최대 면적 (원본 해상도 기준)
+        
+        Returns:
+            tuple: (윤곽선, I3 점수, 일치한 참조 기술자), 후보가 없으면 (None, inf, None),
+                   윤곽선이 하나도 없으면 (None, None, None)
+        """
+        factor = 2 ** self.pyramid_levels
+        height, width = frame.shape[:2]
+        if factor == 1 or min(height, width) < factor * self.pyramid_min_size:
+            return self._match_contours(frame, offset, area_scale, max_area)
+        
+        # 축소 단계: 가우시안 피라미드 이미지에서 후보 찾기
+        coarse = frame
+        for _ in range(self.pyramid_levels):
+            coarse = cv2.pyrDown(coarse)
+        scored = self._score_image(
+            coarse, (0, 0), area_scale * factor * factor, max_area,
+            block_size=max(3, (ADAPTIVE_BLOCK_SIZE // factor) | 1)
+        )
+        if scored is None:
+            return None, None, None
+        
+        # 축소 이미지에서는 가는 부분(귀 등)이 뭉개져 점수가 나빠지므로 상위 몇 개 후보를 다듬음
+        contours, indices, scores = scored
+        coarse_scores = scores.min(axis=1)
+        order = np.argsort(coarse_scores, kind='stable')[:self.pyramid_candidates]
+        order = order[np.isfinite(coarse_scores[order])]
+        if len(order) == 0:
+            return None, float('inf'), None
+        
+        # 다듬기 단계: 후보 바운딩 박스만 원래 해상도로 다시 처리 (블록 크기만큼 여백)
+        best = None, float('inf'), None
+        pad = ADAPTIVE_BLOCK_SIZE + factor
+        for candidate in order:
+            x, y, w, h = cv2.boundingRect(contours[indices[candidate]])
+            x0, y0 = max(0, x * factor - pad), max(0, y * factor - pad)
+            x1, y1 = min(width, (x + w) * factor + pad), min(height, (y + h) * factor + pad)
+            refined = self._match_contours(
+                frame[y0:y1, x0:x1], (offset[0] + x0, offset[1] + y0), area_scale, max_area
+            )
+            if refined[0] is not None and refined[1] < best[1]:
+                best = refined
+        if best[0] is not None:
+            return best
+        
+        # 원래 해상도에서 필터를 통과하지 못하면 축소 단계 윤곽선을 그대로 사용
+        candidate = order[0]
+        reference = int(np.argmin(scores[candidate]))
+        contour = (contours[indices[candidate]] * factor + offset).astype(np.int32)
+        return contour, float(scores[candidate, reference]), self.library.references[reference]
+    
+    def _match_contours(self, frame, offset, area_scale, max_area):
+        """
+        이미지 한 장에서 참조 형태와 가장 비슷한 윤곽선 찾기
+        
+        Returns:
+            tuple: _find_best_match와 같은 형식
+        """
+        scored = self._score_image(frame, offset, area_scale, max_area)
+        if scored is None:
+            return None, None, None
+        
+        contours, indices, scores = scored
+        if len(indices):
+            candidate, reference = np.unravel_index(np.argmin(scores), scores.shape)
+            if scores[candidate, reference] < float('inf'):
+                return (contours[indices[candidate]], float(scores[candidate, reference]),
+                        self.library.references[reference])
+        return None, float('inf'), None
+    
+    def _score_image(self, frame, offset, area_scale, max_area, block_size=ADAPTIVE_BLOCK_SIZE):
+        """
+        이미지 한 장을 이진화/윤곽선 추출 후 후보 윤곽선과 참조 형태들의 I3 거리 계산
+        
+        Args:
+            frame: 탐색할 이미지 (BGR)
+            offset: 윤곽선 좌표에 더할 (x, y) (ROI 좌상단, 탐지 프레임 좌표)
+            area_scale: 면적 환산 배율 (이미지 → 원본 해상도)
+            max_area: 최대 면적 (원본 해상도 기준)
+            block_size: 적응형 임계값 블록 크기 (홀수)
+        
+        Returns:
+            tuple: (윤곽선 목록, 후보 인덱스 (N,), I3 거리 (N, R)), 윤곽선이 없으면 None
+        """
+        # 그레이스케일 변환
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        
+        # 가우시안 블러로 노이즈 제거 (커널 크기 축소 - 속도 향상)
+        gray = cv2.GaussianBlur(gray, (3, 3), 0)
+        
+        # 적응형 임계값
+        binary = cv2.adaptiveThreshold(
+            gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            cv2.THRESH_BINARY_INV, block_size, 2
+        )
+        
+        # 모폴로지 연산 (반복 횟수 줄임 - 속도 향상)
+        kernel = np.ones((3, 3), np.uint8)
+        binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, iterations=1)
+        # MORPH_OPEN 생략 (속도 향상)
+        
+        # 윤곽선 찾기 (ROI 탐색이면 탐지 프레임 좌표로 이동)
+        contours, _ = cv2.findContours(
+            binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE, offset=offset
+        )
+        
+        if not contours:
+            return None
+        
+        # 필터링 및 매칭 (면적/종횡비 필터와 모든 참조 형태와의 I3 거리를 일괄 계산)
+        # Hu Moments는 크기 불변이므로 축소 좌표 그대로 비교하고, 면적은 원본 해상도 기준
+        indices, scores = score_contours(
+            contours, self.library.hu_moments, MIN_CONTOUR_AREA, max_area, area_scale
+        )
+        return contours, indices, scores
+    
+    def _search_window(self, frame, scale):
+        """
+        이번 프레임의 탐색 영역 결정
+        
+        잠금 상태에서 마지막으로 찾은 윤곽선의 바운딩 박스를 여백만큼 넓힌 영역을 반환합니다.
+        (비디오 오버레이 여백이 붙은 프레임 코너가 아니라 윤곽선 자체를 기준으로 하여
+        탐색 영역이 필요 이상으로 커지지 않도록 함)
+        연속으로 roi_max_misses번 놓쳤거나 ROI 탐색이 roi_full_search_interval번
+        이어졌으면 전체 프레임을 탐색합니다. (ROI에서 놓친 프레임은 같은 프레임에서
+        전체 프레임을 다시 탐색하므로 빠르게 움직여도 결과가 끊기지 않음)
+        
+        Args:
+            frame: 탐지할 프레임 (추론용 축소 프레임일 수 있음)
+            scale: 원본 해상도 / 탐지 프레임 해상도
+        
+        Returns:
+            tuple: 탐지 프레임 좌표 (x0, y0, x1, y1), 전체 프레임 탐색이면 None
+        """
+        if (not self.roi_tracking or not self.is_locked or self._roi_box is None or
+                self._roi_misses >= self.roi_max_misses or
+                self._roi_frames >= self.roi_full_search_interval):
+            return None
+        
+        # 원본 해상도 → 탐지 프레임 좌표
+        x0, y0, x1, y1 = (value / scale for value in self._roi_box)
+        pad = self.roi_padding * max(x1 - x0, y1 - y0)
+        
+        height, width = frame.shape[:2]
+        x0 = max(0, int(x0 - pad))
+        y0 = max(0, int(y0 - pad))
+        x1 = min(width, int(x1 + pad) + 1)
+        y1 = min(height, int(y1 + pad) + 1)
+        if x1 - x0 < 16 or y1 - y0 < 16:
+            return None
+        return x0, y0, x1, y1
+    
+    def _extract_shape_info(self, contour, score, reference, frame_shape):
         """
         탐지된 형태에서 정보 추출
         
         Args:
             contour: 윤곽선
             score: 매칭 점수
+            reference: 일치한 참조 기술자 (스케일/프레임 코너 기준)
             frame_shape: 프레임 크기
         
         Returns:
@@ -408,12 +825,18 @@ class ShapeDetector:
         angle = 0.5 * np.arctan2(2 * M['mu11'], M['mu20'] - M['mu02'])
         angle_deg = np.degrees(angle)
         
-        # 스케일 계산
-        ref_M = cv2.moments(self.reference_contour)
-        ref_area = ref_M['m00']
+        # 스케일 계산 (일치한 참조 형태 면적 기준)
+        ref_area = reference.area
         curr_area = M['m00']
         scale = np.sqrt(curr_area / ref_area) if ref_area > 0 else 1.0
         
+        # 다음 프레임 ROI 기준 (측정한 윤곽선 위치)
+        x, y, w, h = cv2.boundingRect(contour)
+        self._roi_box = (x, y, x + w, y + h)
+        
+        if self.motion_prediction:
+            return self._predicted_shape_info(contour, score, reference, cx, cy, angle_deg, scale)
+        
         # 부드러운 추적 (EMA)
         if self.smoothed_cx is None:
             # 초기화
@@ -435,75 +858,79 @@ class ShapeDetector:
                 angle_diff += 360
             self.smoothed_angle += self.alpha * angle_diff
         
-        # 프레임 코너 계산 (참조 이미지 비율 사용)
-        # 상단:토끼:하단 = 100:294:38
-        # 좌:토끼:우 = 207:364:200
-        ref_h, ref_w = self.reference_image.shape[:2]
-        
-        # 토끼의 바운딩 박스
-        rabbit_x, rabbit_y, rabbit_w, rabbit_h = cv2.boundingRect(self.reference_contour)
-        
-        # 프레임 크기 계산
-        frame_w = rabbit_w + 207 + 200  # 좌 + 토끼 + 우
-        frame_h = rabbit_h + 100 + 38   # 상 + 토끼 + 하
-        
         # 프레임 중심 (부드러운 추적)
-        frame_cx_raw = self.smoothed_cx
-        frame_cy_raw = self.smoothed_cy
-        
         if self.smoothed_frame_cx is None:
-            self.smoothed_frame_cx = frame_cx_raw
-            self.smoothed_frame_cy = frame_cy_raw
+            self.smoothed_frame_cx = self.smoothed_cx
+            self.smoothed_frame_cy = self.smoothed_cy
         else:
-            self.smoothed_frame_cx = self.alpha_frame * frame_cx_raw + (1 - self.alpha_frame) * self.smoothed_frame_cx
-            self.smoothed_frame_cy = self.alpha_frame * frame_cy_raw + (1 - self.alpha_frame) * self.smoothed_frame_cy
-        
-        # 프레임 4개 코너 (스케일 적용)
-        scaled_frame_w = frame_w * self.smoothed_scale
-        scaled_frame_h = frame_h * self.smoothed_scale
-        
-        half_w = scaled_frame_w / 2
-        half_h = scaled_frame_h / 2
-        
-        # 회전 행렬
-        angle_rad = np.radians(self.smoothed_angle)
-        cos_a = np.cos(angle_rad)
-        sin_a = np.sin(angle_rad)
-        
-        # 4개 코너 (회전 적용)
-        corners = []
-        for dx, dy in [(-half_w, -half_h), (half_w, -half_h), 
-                       (half_w, half_h), (-half_w, half_h)]:
-            # 회전
-            rx = dx * cos_a - dy * sin_a
-            ry = dx * sin_a + dy * cos_a
-            # 이동
-            corners.append([
-                self.smoothed_frame_cx + rx,
-                self.smoothed_frame_cy + ry
-            ])
-        
-        # 드래그 오프셋 적용
-        dragged_corners = []
-        for corner in corners:
-            dragged_corners.append([
-                corner[0] + self.drag_offset_x,
-                corner[1] + self.drag_offset_y
-            ])
+            self.smoothed_frame_cx = self.alpha_frame * self.smoothed_cx + (1 - self.alpha_frame) * self.smoothed_frame_cx
+            self.smoothed_frame_cy = self.alpha_frame * self.smoothed_cy + (1 - self.alpha_frame) * self.smoothed_frame_cy
+        
+        # 프레임 4개 코너 (참조 이미지 비율, 스케일/회전 적용)
+        corners = reference.frame_corners(
+            self.smoothed_frame_cx, self.smoothed_frame_cy,
+            self.smoothed_scale, self.smoothed_angle
+        )
         
         return {
             'found': True,
             'contour': contour,
-            'center': (self.smoothed_cx + self.drag_offset_x, 
-                      self.smoothed_cy + self.drag_offset_y),
+            'center': (self.smoothed_cx, self.smoothed_cy),
             'angle': self.smoothed_angle,
             'scale': self.smoothed_scale,
             'score': score,
-            'frame_corners': dragged_corners,
-            'is_locked': True,
-            'drag_offset': (self.drag_offset_x, self.drag_offset_y),
-            'is_grabbed': self.is_grabbed,
-            'is_pushed_off_screen': self.is_pushed_off_screen
+            'shape_name': reference.name,
+            'frame_corners': corners,
+            'is_locked': True
+        }
+    
+    def _predicted_shape_info(self, contour, score, reference, cx, cy, angle_deg, scale):
+        """
+        칼만 필터로 추적한 자세를 예상 표시 시점으로 외삽한 탐지 정보
+        
+        측정은 촬영 시각(프레임 도착 시각 - 업로드 시간)으로 필터에 반영하고, smoothed_* 값은
+        그 시각의 필터 추정값을 사용합니다. 결과의 중심/각도/스케일/프레임
+        코너만 결과가 화면에 표시될 시점(지금 + 다운로드 시간)으로 예측합니다.
+        업로드/다운로드 시간은 각각 네트워크 왕복 시간의 절반으로 추정합니다.
+        
+        Args:
+            contour: 윤곽선
+            score: 매칭 점수
+            reference: 일치한 참조 기술자
+            cx: 측정 중심 x
+            cy: 측정 중심 y
+            angle_deg: 측정 회전 각도 (도)
+            scale: 측정 스케일
+        
+        Returns:
+            dict: 탐지 정보 (_extract_shape_info와 같은 형식)
+        """
+        now = self.clock()
+        one_way = (self.network_latency or 0.0) / 2
+        received_at = now if self._frame_time is None else min(self._frame_time, now)
+        measured_at = received_at - one_way
+        self._predictor.update(measured_at, cx, cy, angle_deg, scale)
+        
+        # 촬영 시각 추정 (EMA 대신 필터 추정값)
+        cx, cy, angle_deg, scale = self._predictor.predict(measured_at)
+        self.smoothed_cx = self.smoothed_frame_cx = cx
+        self.smoothed_cy = self.smoothed_frame_cy = cy
+        self.smoothed_angle = angle_deg
+        self.smoothed_scale = scale
+        
+        # 결과가 화면에 표시될 시점의 자세 (촬영 이후 업로드 + 서버 대기/처리 + 다운로드)
+        cx, cy, angle_deg, scale = self._predictor.predict(now + one_way)
+        
+        return {
+            'found': True,
+            'contour': contour,
+            'center': (cx, cy),
+            'angle': angle_deg,
+            'scale': scale,
+            'score': score,
+            'shape_name': reference.name,
+            'frame_corners': reference.frame_corners(cx, cy, scale, angle_deg),
+            'is_locked': True
         }
     
     def _no_detection_result(self):
@@ -517,12 +944,10 @@ class ShapeDetector:
             'angle': None,
             'scale': None,
             'score': None,
+            'shape_name': None,
             'frame_corners': None,
             'is_locked': self.is_locked,
-            'is_permanently_active': self.is_permanently_active,
-            'drag_offset': (self.drag_offset_x, self.drag_offset_y),
-            'is_grabbed': self.is_grabbed,
-            'is_pushed_off_screen': self.is_pushed_off_screen
+            'is_permanently_active': self.is_permanently_active
         }
     
     def _get_instant_start_result(self, frame_shape):
@@ -530,7 +955,7 @@ class ShapeDetector:
         즉시 시작 모드 결과 반환 (형태 탐지 없이 화면 중앙에 토끼 표시)
         
         Args:
-            frame_shape: 프레임 크기 (height, width, channels)
+            frame_shape: 프레임 크기 (height, width)
         
         Returns:
             dict: 탐지 정보
@@ -550,53 +975,77 @@ class ShapeDetector:
             self.smoothed_frame_cx = cx
             self.smoothed_frame_cy = cy
         
-        # 프레임 크기 계산 (참조 이미지 비율 사용)
-        ref_h, ref_w = self.reference_image.shape[:2]
-        rabbit_x, rabbit_y, rabbit_w, rabbit_h = cv2.boundingRect(self.reference_contour)
+        # 중심/스케일이 그대로면 이전 결과 재사용 (결과 dict는 호출자가 수정하지 않음)
+        key = (self.smoothed_frame_cx, self.smoothed_frame_cy, self.smoothed_scale)
+        if self._instant_start_cache is not None and self._instant_start_cache[0] == key:
+            return self._instant_start_cache[1]
         
-        video_frame_w = rabbit_w + 207 + 200  # 좌 + 토끼 + 우
-        video_frame_h = rabbit_h + 100 + 38   # 상 + 토끼 + 하
-        
-        # 스케일 적용
-        scaled_frame_w = video_frame_w * self.smoothed_scale
-        scaled_frame_h = video_frame_h * self.smoothed_scale
-        
-        half_w = scaled_frame_w / 2
-        half_h = scaled_frame_h / 2
-        
-        # 4개 코너 (회전 없음, 중앙 위치)
         base_cx = self.smoothed_frame_cx
         base_cy = self.smoothed_frame_cy
         
-        corners = [
-            [base_cx - half_w, base_cy - half_h],  # 좌상단
-            [base_cx + half_w, base_cy - half_h],  # 우상단
-            [base_cx + half_w, base_cy + half_h],  # 우하단
-            [base_cx - half_w, base_cy + half_h],  # 좌하단
-        ]
-        
-        # 드래그 오프셋 적용
-        dragged_corners = []
-        for corner in corners:
-            dragged_corners.append([
-                corner[0] + self.drag_offset_x,
-                corner[1] + self.drag_offset_y
-            ])
+        # 4개 코너 (회전 없음, 중앙 위치)
+        corners = self.reference.frame_corners(base_cx, base_cy, self.smoothed_scale)
         
-        return {
+        result = {
             'found': True,
-            'contour': self.reference_contour,
-            'center': (base_cx + self.drag_offset_x, base_cy + self.drag_offset_y),
+            'contour': self.reference.contour,
+            'center': (base_cx, base_cy),
             'angle': 0,
             'scale': self.smoothed_scale,
             'score': 0,
-            'frame_corners': dragged_corners,
+            'shape_name': self.reference.name,
+            'frame_corners': corners,
             'is_locked': True,
-            'is_permanently_active': True,
-            'drag_offset': (self.drag_offset_x, self.drag_offset_y),
-            'is_grabbed': self.is_grabbed,
-            'is_pushed_off_screen': self.is_pushed_off_screen
+            'is_permanently_active': True
         }
+        self._instant_start_cache = (key, result)
+        return result
+    
+    def _rescale_spatial_state(self, scale_x, scale_y):
+        """
+        프레임 해상도 변경 시 픽셀 좌표 상태를 새 해상도로 환산
+        
+        화질 조절로 캡처 해상도가 바뀌어도 EMA 중심/스케일, 드래그 오프셋, ROI 박스,
+        영구 활성화 결과가 같은 화면 위치를 가리키도록 합니다.
+        광류 추적과 자세 예측은 이전 해상도의 이미지/속도를 기준으로 하므로 다시 시작하고,
+        손 위치가 이전 해상도 기준인 잡기 상태는 놓습니다.
+        
+        Args:
+            scale_x: 새 너비 / 이전 너비
+            scale_y: 새 높이 / 이전 높이
+        """
+        # 면적 기준 스케일은 두 축 비율의 기하 평균으로 환산
+        scale = np.sqrt(scale_x * scale_y)
+        
+        if self.smoothed_cx is not None:
+            self.smoothed_cx *= scale_x
+            self.smoothed_cy *= scale_y
+            self.smoothed_scale *= scale
+        if self.smoothed_frame_cx is not None:
+            self.smoothed_frame_cx *= scale_x
+            self.smoothed_frame_cy *= scale_y
+        if self._roi_box is not None:
+            x0, y0, x1, y1 = self._roi_box
+            self._roi_box = (x0 * scale_x, y0 * scale_y, x1 * scale_x, y1 * scale_y)
+        if self.last_valid_result is not None:
+            result = dict(self.last_valid_result)
+            cx, cy = result['center']
+            result['center'] = (cx * scale_x, cy * scale_y)
+            result['scale'] *= scale
+            result['frame_corners'] = (np.asarray(result['frame_corners']) * (scale_x, scale_y)).tolist()
+            result['contour'] = np.round(result['contour'] * (scale_x, scale_y)).astype(np.int32)
+            self.last_valid_result = result
+        
+        self.drag_offset_x *= scale_x
+        self.drag_offset_y *= scale_y
+        self.release_grab()
+        self.last_hand_position = None
+        
+        self.last_search_window = None
+        self.last_tracked = False
+        self._flow = None
+        self._flow_frames = 0
+        self._predictor.reset()
     
     def reset(self):
         """
@@ -615,6 +1064,18 @@ class ShapeDetector:
         self.is_permanently_active = False
         self.locked_start_time = None
         self.last_valid_result = None
+        self._instant_start_cache = None
+        # 관심 영역 추적 리셋
+        self.last_search_window = None
+        self._roi_box = None
+        self._roi_misses = 0
+        self._roi_frames = 0
+        # 광류 추적 리셋
+        self.last_tracked = False
+        self._flow = None
+        self._flow_frames = 0
+        # 자세 예측 리셋
+        self._predictor.reset()
         # 드래그 효과 리셋
         self.drag_offset_x = 0.0
         self.drag_offset_y = 0.0
@@ -0,0 +1,389 @@
+"""
+형태 라이브러리 모듈
+참조 이미지(토끼, 개, 새, 사슴 등)마다 윤곽선 기술자를 한 번 계산해 두고,
+후보 윤곽선을 모든 참조와 한 번의 배열 연산으로 비교하여 가장 가까운 형태를 찾습니다.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from types import MappingProxyType
+
+import cv2
+import numpy as np
+
+from event_log import get_logger
+
+log = get_logger('shape_library')
+
+
+# 참조 윤곽선 주변 비디오 프레임 여백 (참조 이미지 비율 기준)
+# 상단:토끼:하단 = 100:294:38, 좌:토끼:우 = 207:364:200
+FRAME_PADDING_LEFT = 207
+FRAME_PADDING_RIGHT = 200
+FRAME_PADDING_TOP = 100
+FRAME_PADDING_BOTTOM = 38
+
+# 라이브러리 폴더에서 읽을 이미지 확장자
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.webp')
+
+# 참조 윤곽선 추출 파라미터 (바꾸면 캐시 키가 달라져 다시 추출)
+EXTRACTION_PARAMS = {
+    'block_size': 11,        # 적응형 임계값 블록 크기
+    'c': 2,                  # 적응형 임계값 상수
+    'kernel': 3,             # 모폴로지 커널 크기
+    'close_iterations': 2,
+    'open_iterations': 1,
+}
+
+# 기술자 캐시 (참조 이미지 폴더 아래, 이미지 내용 해시 + 추출 파라미터 + OpenCV 버전으로 구분)
+CACHE_DIRNAME = '.shape_cache'
+CACHE_VERSION = 1
+
+# cv2.moments 결과 키 순서 (캐시 파일 배열 순서)
+MOMENT_KEYS = (
+    'm00', 'm10', 'm01', 'm20', 'm11', 'm02', 'm30', 'm21', 'm12', 'm03',
+    'mu20', 'mu11', 'mu02', 'mu30', 'mu21', 'mu12', 'mu03',
+    'nu20', 'nu11', 'nu02', 'nu30', 'nu21', 'nu12', 'nu03',
+)
+
+
+def _read_only(array):
+    """
+    쓰기 불가로 표시한 배열 반환 (공유 참조 데이터 보호)
+    """
+    array.setflags(write=False)
+    return array
+
+
+class ReferenceDescriptor:
+    """
+    참조 윤곽선 기술자 (생성 시 한 번만 계산하는 읽기 전용 값)
+    - 모멘트 / Hu Moments / 바운딩 박스 / 여백 포함 프레임 크기 / 코너 템플릿
+    - 세션별 감지기(clone)가 복사 없이 공유하므로 생성 후에는 수정할 수 없음
+    """
+    
+    __slots__ = ('name', 'contour', 'moments', 'hu_moments', 'area', 'bounding_box',
+                 'frame_size', 'corner_template')
+    
+    def __init__(self, contour, name=None, moments=None, hu_moments=None, bounding_box=None):
+        """
+        초기화
+        
+        Args:
+            contour: 참조 윤곽선 (numpy array, 읽기 전용 배열이면 복사하지 않고 사용)
+            name: 형태 이름 (탐지 결과의 shape_name)
+            moments: 미리 계산한 모멘트 dict (캐시에서 읽은 경우, None이면 계산)
+            hu_moments: 미리 계산한 Hu Moments (7,) (None이면 계산)
+            bounding_box: 미리 계산한 (x, y, w, h) (None이면 계산)
+        """
+        if moments is None:
+            moments = cv2.moments(contour)
+        if hu_moments is None:
+            hu_moments = cv2.HuMoments(moments).ravel()
+        if bounding_box is None:
+            bounding_box = cv2.boundingRect(contour)
+        x, y, w, h = (int(value) for value in bounding_box)
+        frame_w = w + FRAME_PADDING_LEFT + FRAME_PADDING_RIGHT
+        frame_h = h + FRAME_PADDING_TOP + FRAME_PADDING_BOTTOM
+        half_w = frame_w / 2
+        half_h = frame_h / 2
+        
+        set_field = super().__setattr__
+        set_field('name', name)
+        set_field('contour', contour if not contour.flags.writeable else _read_only(contour.copy()))
+        set_field('moments', MappingProxyType(dict(moments)))
+        set_field('hu_moments', hu_moments if not hu_moments.flags.writeable else _read_only(hu_moments.copy()))
+        set_field('area', moments['m00'])
+        set_field('bounding_box', (x, y, w, h))
+        set_field('frame_size', (frame_w, frame_h))
+        # 스케일 1, 회전 0일 때 프레임 중심 기준 4개 코너 (좌상단, 우상단, 우하단, 좌하단)
+        set_field('corner_template', _read_only(np.array([
+            [-half_w, -half_h],
+            [half_w, -half_h],
+            [half_w, half_h],
+            [-half_w, half_h],
+        ])))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("ReferenceDescriptor는 수정할 수 없습니다")
+    
+    def frame_corners(self, cx, cy, scale, angle_deg=0.0):
+        """
+        비디오 프레임 4개 코너 계산 (코너 템플릿에 스케일/회전/이동을 한 번에 적용)
+        
+        Args:
+            cx, cy: 프레임 중심
+            scale: 스케일
+            angle_deg: 회전 각도 (도)
+        
+        Returns:
+            list: [[x, y], ...] 4개 코너 좌표
+        """
+        angle_rad = np.radians(angle_deg)
+        cos_a = np.cos(angle_rad) * scale
+        sin_a = np.sin(angle_rad) * scale
+        transform = np.array([[cos_a, sin_a], [-sin_a, cos_a]])
+        return (self.corner_template @ transform + (cx, cy)).tolist()
+
+
+def extract_reference_contour(image):
+    """
+    참조 이미지에서 가장 큰 윤곽선 추출
+    
+    Args:
+        image: 참조 이미지 (BGR)
+    
+    Returns:
+        참조 윤곽선 (numpy array), 없으면 None
+    """
+    params = EXTRACTION_PARAMS
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    
+    # 적응형 임계값
+    binary = cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+        cv2.THRESH_BINARY_INV, params['block_size'], params['c']
+    )
+    
+    # 모폴로지 연산으로 노이즈 제거
+    kernel = np.ones((params['kernel'], params['kernel']), np.uint8)
+    binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, iterations=params['close_iterations'])
+    binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel, iterations=params['open_iterations'])
+    
+    # 윤곽선 찾기
+    contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    if not contours:
+        return None
+    
+    # 가장 큰 윤곽선 반환
+    return max(contours, key=cv2.contourArea)
+
+
+def shape_name_from_path(path):
+    """
+    참조 이미지 파일 이름에서 형태 이름 추출
+    (예: 'files/rabbit reference.png' → 'rabbit', 'shapes/dog.png' → 'dog')
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    for suffix in (' reference', '_reference', '-reference'):
+        if name.lower().endswith(suffix):
+            name = name[:-len(suffix)]
+            break
+    return name
+
+
+def cache_key(image_bytes):
+    """
+    기술자 캐시 키 (이미지 내용 + 추출 파라미터 + OpenCV 버전 + 캐시 형식 버전의 SHA-256)
+    
+    윤곽선 추출 결과는 OpenCV 버전(임계값/윤곽선 구현)에 따라 달라질 수 있으므로 키에 포함합니다.
+    """
+    digest = hashlib.sha256(image_bytes)
+    digest.update(json.dumps(EXTRACTION_PARAMS, sort_keys=True).encode())
+    digest.update(f'opencv{cv2.__version__}'.encode())
+    digest.update(f'v{CACHE_VERSION}'.encode())
+    return digest.hexdigest()
+
+
+def _cache_dtype(point_count):
+    """
+    캐시 레코드 형식 (파일마다 윤곽선 점 수가 다른 고정 크기 구조체 1개)
+    """
+    return np.dtype([
+        ('moments', np.float64, len(MOMENT_KEYS)),
+        ('hu_moments', np.float64, 7),
+        ('bounding_box', np.int32, 4),
+        ('contour', np.int32, (point_count, 2)),
+    ])
+
+
+def _read_cache(cache_path):
+    """
+    캐시 레코드를 메모리 매핑으로 읽기
+    
+    Returns:
+        numpy record, 캐시가 없거나 손상되었거나 형식이 다르면 None
+    """
+    try:
+        record = np.load(cache_path, mmap_mode='r')[0]
+    except (OSError, ValueError, IndexError, EOFError):
+        return None
+    if (record.dtype.names != _cache_dtype(0).names or
+            record.dtype != _cache_dtype(record['contour'].shape[0])):
+        return None
+    return record
+
+
+def _write_cache(cache_path, descriptor):
+    """
+    기술자를 캐시 파일로 저장 (임시 파일에 쓴 뒤 교체하므로 동시에 시작한 워커가
+    쓰다 만 파일을 읽지 않음, 저장 실패는 무시)
+    
+    Args:
+        cache_path: 캐시 파일 경로
+        descriptor: ReferenceDescriptor (윤곽선이 없는 이미지면 None, 점 0개로 기록)
+    """
+    if descriptor is None:
+        record = np.zeros(1, _cache_dtype(0))
+    else:
+        contour = descriptor.contour.reshape(-1, 2)
+        record = np.zeros(1, _cache_dtype(len(contour)))
+        record['moments'] = [descriptor.moments[key] for key in MOMENT_KEYS]
+        record['hu_moments'] = descriptor.hu_moments
+        record['bounding_box'] = descriptor.bounding_box
+        record['contour'] = contour
+    
+    try:
+        cache_dir = os.path.dirname(cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, record)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError as e:
+        log.warning('reference_cache_write_failed', '형태 기술자 캐시를 저장하지 못했습니다',
+                    path=cache_path, error=str(e))
+
+
+def load_reference(path, name=None, use_cache=True):
+    """
+    참조 이미지를 읽어 기술자 생성
+    
+    이미지 내용 해시와 추출 파라미터가 같은 캐시 파일(참조 이미지 폴더의 .shape_cache/)이
+    있으면 이미지 디코딩/윤곽선 추출 없이 메모리 매핑으로 읽습니다.
+    윤곽선이 없는 이미지도 캐시에 기록하여 다음 시작에서 다시 처리하지 않습니다.
+    
+    Args:
+        path: 참조 이미지 경로
+        name: 형태 이름 (None이면 파일 이름에서 추출)
+        use_cache: 기술자 캐시 사용 여부
+    
+    Returns:
+        ReferenceDescriptor
+    
+    Raises:
+        ValueError: 이미지를 읽을 수 없거나 윤곽선이 없음
+    """
+    name = name or shape_name_from_path(path)
+    try:
+        with open(path, 'rb') as f:
+            image_bytes = f.read()
+    except OSError:
+        raise ValueError(f"참조 이미지를 로드할 수 없습니다: {path}")
+    
+    cache_path = None
+    if use_cache:
+        cache_path = os.path.join(os.path.dirname(path), CACHE_DIRNAME, cache_key(image_bytes) + '.npy')
+        record = _read_cache(cache_path)
+        if record is not None:
+            if record['contour'].shape[0] == 0:
+                raise ValueError(f"참조 이미지에서 유효한 윤곽선을 찾을 수 없습니다: {path}")
+            moments = dict(zip(MOMENT_KEYS, record['moments'].tolist()))
+            return ReferenceDescriptor(
+                record['contour'].reshape(-1, 1, 2), name,
+                moments, record['hu_moments'], record['bounding_box']
+            )
+    
+    image = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError(f"참조 이미지를 로드할 수 없습니다: {path}")
+    
+    contour = extract_reference_contour(image)
+    descriptor = None if contour is None else ReferenceDescriptor(contour, name)
+    if cache_path is not None:
+        _write_cache(cache_path, descriptor)
+    if descriptor is None:
+        raise ValueError(f"참조 이미지에서 유효한 윤곽선을 찾을 수 없습니다: {path}")
+    return descriptor
+
+
+class ShapeLibrary:
+    """
+    참조 형태 목록과 Hu Moments 색인
+    - 모든 참조의 Hu Moments를 (참조 수, 7) 배열로 보관하여 shape_scoring이 후보 (N, 7)와의
+      I3 거리를 (N, 참조 수) 배열 한 번으로 계산
+      (I3 거리는 참조 값으로 정규화되는 비대칭 거리라 KD 트리 같은 거리 색인 대신
+      벡터화된 전체 비교를 사용)
+    - 첫 번째 참조가 기본 형태 (즉시 시작 모드와 비디오 프레임 기준)
+    """
+    
+    def __init__(self, references):
+        """
+        초기화
+        
+        Args:
+            references: ReferenceDescriptor 목록 (첫 번째가 기본 형태)
+        
+        Raises:
+            ValueError: 참조가 없거나 이름이 중복됨
+        """
+        self.references = tuple(references)
+        if not self.references:
+            raise ValueError("형태 라이브러리에 참조가 없습니다")
+        
+        names = [reference.name for reference in self.references]
+        if len(set(names)) != len(names):
+            raise ValueError(f"형태 이름이 중복되었습니다: {names}")
+        
+        self.hu_moments = _read_only(np.array([reference.hu_moments for reference in self.references]))
+    
+    @classmethod
+    def load(cls, primary_path, library_dir=None, use_cache=True):
+        """
+        기본 참조 이미지와 라이브러리 폴더의 참조 이미지 로드
+        
+        라이브러리 폴더의 이미지 중 읽을 수 없거나 윤곽선이 없는 파일, 기본 형태와
+        이름이 같은 파일은 건너뜁니다.
+        
+        Args:
+            primary_path: 기본 형태 참조 이미지 경로
+            library_dir: 추가 참조 이미지 폴더 (선택적)
+            use_cache: 기술자 캐시 사용 여부 (load_reference 참고)
+        
+        Returns:
+            ShapeLibrary
+        
+        Raises:
+            ValueError: 기본 참조 이미지를 읽을 수 없음
+        """
+        references = [load_reference(primary_path, use_cache=use_cache)]
+        if library_dir:
+            primary_file = os.path.abspath(primary_path)
+            for filename in sorted(os.listdir(library_dir)):
+                path = os.path.join(library_dir, filename)
+                if (not filename.lower().endswith(IMAGE_EXTENSIONS) or
+                        os.path.abspath(path) == primary_file):
+                    continue
+                try:
+                    reference = load_reference(path, use_cache=use_cache)
+                except ValueError as e:
+                    log.warning('reference_skipped', '참조 이미지를 건너뜁니다', path=path, error=str(e))
+                    continue
+                if any(existing.name == reference.name for existing in references):
+                    log.warning('reference_skipped', '형태 이름이 중복되어 건너뜁니다', path=path)
+                    continue
+                references.append(reference)
+        return cls(references)
+    
+    @property
+    def primary(self):
+        """
+        기본 형태 기술자
+        """
+        return self.references[0]
+    
+    @property
+    def names(self):
+        """
+        형태 이름 목록
+        """
+        return [reference.name for reference in self.references]
+    
+    def __len__(self):
+        return len(self.references)
@@ -0,0 +1,143 @@
+"""
+윤곽선 일괄 점수 계산 모듈
+한 프레임의 모든 윤곽선을 NumPy 배열로 모아 면적/종횡비 필터와 Hu Moments 기반
+I3 거리(cv2.matchShapes의 CONTOURS_MATCH_I3와 같은 식)를 한 번에 계산합니다.
+
+- 0단계: 점이 1~2개인 윤곽선(면적 0)은 점 수만 보고 제외
+- 1단계: 남은 윤곽선의 점을 한 배열로 합쳐 구간별(reduceat) 바운딩 박스를 구하고
+  종횡비와 면적 상한(너비 x 높이)으로 작은 노이즈/가늘고 긴 윤곽선을 배열 비교로 제거
+- 2단계: 남은 소수 후보만 모멘트를 계산해 실제 면적 필터 적용
+- I3 거리: 후보 전체의 로그 Hu Moments 배열과 미리 계산한 참조 값을 한 번의 배열 연산으로
+  비교 (후보마다 참조 모멘트를 다시 계산하는 cv2.matchShapes 호출 없음)
+"""
+import cv2
+import numpy as np
+
+
+# OpenCV matchShapes와 같은 Hu Moments 유효 하한
+HU_EPSILON = 1e-5
+
+
+def _pack(contours):
+    """
+    윤곽선 목록을 점 배열 하나로 합치기
+    
+    Returns:
+        tuple: (점 배열 (P, 2), 윤곽선별 시작 인덱스 (N,))
+    """
+    counts = np.fromiter(map(len, contours), np.intp, len(contours))
+    points = np.concatenate(contours).reshape(-1, 2)
+    starts = np.zeros(len(counts), np.intp)
+    np.cumsum(counts[:-1], out=starts[1:])
+    return points, starts
+
+
+def bounding_sizes(contours):
+    """
+    윤곽선별 바운딩 박스 크기 (cv2.boundingRect의 너비/높이와 같은 값)
+    
+    Args:
+        contours: 윤곽선 목록
+    
+    Returns:
+        tuple: (너비 배열 (N,), 높이 배열 (N,))
+    """
+    points, starts = _pack(contours)
+    sizes = np.maximum.reduceat(points, starts) - np.minimum.reduceat(points, starts) + 1
+    return sizes[:, 0], sizes[:, 1]
+
+
+def contour_moments(contours):
+    """
+    윤곽선별 면적과 Hu Moments
+    
+    Args:
+        contours: 윤곽선 목록 (1단계 필터를 통과한 후보)
+    
+    Returns:
+        tuple: (면적 배열 (N,), Hu Moments 배열 (N, 7))
+    """
+    areas = np.empty(len(contours))
+    hu = np.empty((len(contours), 7))
+    for index, contour in enumerate(contours):
+        moments = cv2.moments(contour)
+        areas[index] = moments['m00']
+        hu[index] = cv2.HuMoments(moments).ravel()
+    return areas, hu
+
+
+def i3_distances(reference_hu, candidate_hu):
+    """
+    참조와 후보들의 I3 거리 (cv2.matchShapes(..., cv2.CONTOURS_MATCH_I3, 0)와 같은 식)
+    
+    max_i |(mA_i - mB_i) / mA_i|, m_i = sign(h_i) * log10|h_i|
+    (참조와 후보 모두 |h_i| > HU_EPSILON인 항목만 비교)
+    
+    Args:
+        reference_hu: 참조 Hu Moments (7,) 또는 여러 참조 (R, 7)
+        candidate_hu: 후보 Hu Moments (N, 7)
+    
+    Returns:
+        numpy array: 거리 (낮을수록 유사), 참조가 1개면 (N,), 여러 개면 (N, R)
+    """
+    reference_hu = np.asarray(reference_hu)
+    single = reference_hu.ndim == 1
+    reference_hu = np.atleast_2d(reference_hu)[np.newaxis]  # (1, R, 7)
+    candidate_hu = np.asarray(candidate_hu)[:, np.newaxis]  # (N, 1, 7)
+    
+    reference_valid = np.abs(reference_hu) > HU_EPSILON
+    candidate_valid = np.abs(candidate_hu) > HU_EPSILON
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reference_log = np.sign(reference_hu) * np.log10(np.abs(reference_hu))
+        candidate_log = np.sign(candidate_hu) * np.log10(np.abs(candidate_hu))
+        ratio = np.abs((reference_log - candidate_log) / reference_log)
+    
+    distances = np.where(reference_valid & candidate_valid, ratio, 0.0).max(axis=2)
+    # 한쪽만 유효한 항목이 있으면 비교할 수 없음 (OpenCV는 DBL_MAX 반환)
+    distances[reference_valid.any(axis=2) != candidate_valid.any(axis=2)] = np.inf
+    return distances[:, 0] if single else distances
+
+
+def score_contours(contours, reference_hu, min_area, max_area, area_scale=1.0,
+                   min_aspect=0.5, max_aspect=2.0):
+    """
+    면적/종횡비 필터를 통과한 윤곽선의 I3 거리 계산
+    
+    Args:
+        contours: 윤곽선 목록
+        reference_hu: 참조 Hu Moments (7,) 또는 여러 참조 (R, 7)
+        min_area: 최소 면적 (area_scale 적용 후 기준)
+        max_area: 최대 면적 (area_scale 적용 후 기준)
+        area_scale: 면적 환산 배율 (축소 프레임에서 탐지할 때 원본 기준으로 비교)
+        min_aspect: 최소 종횡비 (너비 / 높이)
+        max_aspect: 최대 종횡비
+    
+    Returns:
+        tuple: (후보 윤곽선 인덱스 배열 (N,), I3 거리 배열 (N,) 또는 (N, R))
+    """
+    no_candidates = np.empty(0, np.intp), np.empty((0,) + np.shape(reference_hu)[:-1])
+    if not contours:
+        return no_candidates
+    
+    # 0단계: 점이 1~2개인 윤곽선(면적 0, 대부분 노이즈 픽셀)은 배열로 합치기 전에 제외
+    counts = np.fromiter(map(len, contours), np.intp, len(contours))
+    indices = np.flatnonzero(counts >= 3)
+    if len(indices) == 0:
+        return no_candidates
+    
+    # 1단계: 바운딩 박스만으로 종횡비 필터와 면적 상한 검사 (면적 <= 너비 * 높이)
+    widths, heights = bounding_sizes([contours[index] for index in indices])
+    aspect = widths / heights
+    indices = indices[
+        (aspect >= min_aspect) & (aspect <= max_aspect) &
+        (widths * heights * area_scale >= min_area)
+    ]
+    if len(indices) == 0:
+        return no_candidates
+    
+    # 2단계: 남은 후보만 모멘트 계산 후 실제 면적 필터 (cv2.contourArea와 같은 값)
+    areas, hu = contour_moments([contours[index] for index in indices])
+    areas *= area_scale
+    keep = (areas >= min_area) & (areas <= max_area)
+    return indices[keep], i3_distances(reference_hu, hu[keep])
@@ -0,0 +1,666 @@
+"""
+Socket.IO 이벤트 처리 모듈
+서버 종류(Flask-SocketIO 스레딩 서버 / python-socketio asyncio 서버)와 무관한
+이벤트 처리 로직을 모아 두고, 각 서버는 이벤트를 이 클래스로 전달만 합니다.
+"""
+import threading
+import time
+
+from image_payload import decode_image_payload, encode_image_payload
+from broadcast_rooms import BroadcastRooms
+from frame_mailbox import FrameMailbox
+from metrics import MetricsRegistry
+from quality_controller import QualityController
+from session_recorder import open_session_recorder
+from event_log import get_logger
+
+log = get_logger('socket_events')
+
+
+class SocketEvents:
+    """
+    Socket.IO 이벤트 처리기
+    - 모든 메서드는 블로킹 함수이므로 asyncio 서버에서는 실행기(executor)에서 호출
+    - 결과 전송은 생성 시 받은 emit 함수로 수행 (스레드 안전해야 함)
+    """
+    
+    # 서버에 등록할 이벤트 이름 (메서드 이름은 'on_' + 이벤트 이름)
+    EVENTS = (
+        'video_frame',
+        'set_transport',
+        'set_response_mode',
+        'set_adjustment',
+        'reset_detector',
+        'set_thresholds',
+        'set_white_background',
+        'set_mirror_mode',
+        'set_inference_resolution',
+        'create_broadcast',
+        'join_broadcast',
+        'leave_broadcast',
+        'broadcast_ack',
+    )
+    
+    # 녹화하지 않는 이벤트 (프레임은 따로 기록, 시청 응답은 재생과 무관)
+    UNRECORDED_EVENTS = ('video_frame', 'broadcast_ack')
+    
+    def __init__(self, get_engine, emit, metrics=None, record_dir=None, get_status=None,
+                 target_fps=None):
+        """
+        초기화
+        
+        Args:
+            get_engine: 세션 관리자(SessionManager 또는 WorkerPool)를 반환하는 함수
+                        (초기화 전에는 None 반환)
+            emit: emit(event, payload, to) 형태의 전송 함수 (to가 None이면 모든 클라이언트)
+            metrics: 단계별 시간/프레임 수를 기록할 MetricsRegistry (선택적)
+            record_dir: 세션 녹화 파일을 저장할 폴더 (None이면 녹화 안 함)
+            get_status: status 이벤트 데이터를 반환하는 함수 (선택적, 워밍업 진행 상황 포함)
+            target_fps: 적응형 품질 조절의 목표 FPS (None이면 품질 고정)
+        """
+        self.get_engine = get_engine
+        self.emit = emit
+        self.get_status = get_status
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        
+        # 세션별 단일 슬롯 프레임 수신함 (sid -> FrameMailbox)
+        self.frame_mailboxes = {}
+        
+        # 세션별 녹화기 (sid -> SessionRecorder)
+        self.record_dir = record_dir
+        self.recorders = {}
+        self._recorders_lock = threading.Lock()
+        
+        # 세션별 적응형 품질 조절기 (sid -> QualityController)
+        self.target_fps = target_fps
+        self.quality_controllers = {}
+        
+        # 세션별 최근 네트워크 왕복 시간 (sid -> 초, 클라이언트 왕복 시간 - 서버 처리 시간)
+        # 와 마지막 프레임의 서버 처리 시간 (sid -> 초) - 자세 예측에 사용
+        self.network_latencies = {}
+        self.processing_times = {}
+        
+        # 프레임 도착 시각 기준 시계 (자세 예측 타임스탬프, 녹화 재생 시 녹화 기준 시계로 교체)
+        self.clock = time.time
+        
+        # 세션별 바이너리 전송 여부 (sid -> bool, 파이프라인 세션 없이 보관하므로
+        # 초기화 전에도 협상할 수 있고 시청자에게 감지기를 만들지 않음)
+        self.binary_transports = {}
+        
+        # 발표자 → 시청자 방송 방
+        self.broadcast_rooms = BroadcastRooms()
+    
+    def dispatch(self, sid, event, data=None):
+        """
+        이벤트를 on_<event> 메서드로 전달 (녹화 중이면 제어 이벤트 기록)
+        
+        Args:
+            sid: Socket.IO 세션 ID
+            event: 이벤트 이름 (EVENTS 중 하나)
+            data: 이벤트 데이터
+        """
+        if event not in self.UNRECORDED_EVENTS:
+            recorder = self._recorder(sid)
+            if recorder is not None:
+                recorder.record_control(event, data)
+        
+        return getattr(self, f'on_{event}')(sid, data)
+    
+    def _recorder(self, sid):
+        """
+        세션 녹화기 조회 (녹화가 켜져 있으면 처음 호출 시 파일 생성)
+        """
+        if self.record_dir is None:
+            return None
+        
+        with self._recorders_lock:
+            recorder = self.recorders.get(sid)
+            if recorder is None:
+                recorder = self.recorders[sid] = open_session_recorder(self.record_dir, sid)
+            return recorder
+    
+    def _close_session(self, sid):
+        """
+        세션별 수신함/지표/녹화기/방송 방 정리
+        """
+        self._leave_broadcast(sid)
+        self.frame_mailboxes.pop(sid, None)
+        self.quality_controllers.pop(sid, None)
+        self.network_latencies.pop(sid, None)
+        self.processing_times.pop(sid, None)
+        self.binary_transports.pop(sid, None)
+        self.metrics.drop_session(sid)
+        with self._recorders_lock:
+            recorder = self.recorders.pop(sid, None)
+        if recorder is not None:
+            recorder.close()
+    
+    def _reset_pipeline_state(self, sid):
+        """
+        유휴 제거된 세션의 파이프라인 관련 상태만 정리 (클라이언트는 연결 유지)
+        
+        전송 방식, 방송 방, 녹화기, 수신함은 연결에 속하므로 그대로 두고,
+        새로 만들어질 파이프라인 세션이 기본 설정으로 시작함을 클라이언트에 알려
+        화면 설정을 다시 보내도록 합니다.
+        """
+        # 서버 인코딩 품질은 제거된 세션에 있었으므로 품질 단계도 처음부터 다시 시작
+        controller = self.quality_controllers.pop(sid, None)
+        if controller is not None:
+            self.emit('quality_settings', QualityController(self.target_fps).settings(), to=sid)
+        self.emit('session_reset', {'reason': 'idle'}, to=sid)
+    
+    def on_connect(self, sid):
+        """
+        클라이언트 연결
+        """
+        log.info('client_connected', '클라이언트 연결', sid=sid)
+        
+        # 초기화 상태 전송
+        self.emit('status', self.status(), to=sid)
+    
+    def status(self):
+        """
+        status 이벤트 데이터
+        
+        Returns:
+            dict: {'ready': bool, ...}
+        """
+        if self.get_status is not None:
+            return self.get_status()
+        return {'ready': self.get_engine() is not None}
+    
+    def broadcast_status(self, *args):
+        """
+        모든 클라이언트에 현재 상태 전송 (워밍업 진행 상황 변경 시)
+        """
+        self.emit('status', self.status(), to=None)
+    
+    def on_disconnect(self, sid):
+        """
+        클라이언트 연결 해제
+        """
+        log.info('client_disconnected', '클라이언트 연결 해제', sid=sid)
+        
+        # 세션 파이프라인 정리
+        self._close_session(sid)
+        engine = self.get_engine()
+        if engine is not None:
+            engine.release(sid)
+    
+    def reap_idle_sessions(self):
+        """
+        유휴 세션 정리 (서버의 백그라운드 작업에서 주기적으로 호출)
+        """
+        engine = self.get_engine()
+        if engine is None:
+            return
+        
+        evicted = engine.evict_idle()
+        for sid in evicted:
+            self._reset_pipeline_state(sid)
+        if evicted:
+            log.info('idle_sessions_evicted', '유휴 세션 제거', count=len(evicted))
+    
+    def _require_engine(self, sid, message='시스템이 초기화되지 않았습니다.'):
+        """
+        세션 관리자 확인 (초기화 전이면 에러 전송 후 None 반환)
+        """
+        engine = self.get_engine()
+        if engine is None:
+            self.emit('error', {'message': message}, to=sid)
+        return engine
+    
+    def on_video_frame(self, sid, data):
+        """
+        비디오 프레임 처리
+        
+        Args:
+            sid: Socket.IO 세션 ID
+            data: {
+                'image': JPEG 바이트 (바이너리 전송) 또는 base64 Data URL 문자열,
+                'rtt': 직전 프레임의 왕복 시간 (밀리초, 선택적),
+                'seq': 프레임 번호 (선택적, processed_frame/error 응답에 그대로 돌려줌)
+            }
+        """
+        mailbox = self.accept_frame(sid, data)
+        if mailbox is not None:
+            self.drain_frames(sid, mailbox)
+    
+    def accept_frame(self, sid, data):
+        """
+        프레임을 세션 수신함에 넣기 (블로킹 없음 - 이벤트 루프에서 직접 호출 가능)
+        
+        최신 프레임 우선: 이 세션의 프레임을 처리 중인 스레드가 있으면
+        수신함에 넣기만 하고 반환 (처리 전에 더 새 프레임이 오면 교체됨)
+        
+        Returns:
+            FrameMailbox: 호출자가 drain_frames()로 처리해야 하면 수신함, 아니면 None
+        """
+        # 초기화 확인
+        if self._require_engine(sid) is None:
+            return None
+        
+        if not isinstance(data, dict):
+            self.emit('error', {'message': '프레임 처리 오류: 잘못된 프레임 데이터'}, to=sid)
+            return None
+        
+        image_data = data.get('image')
+        if not image_data:
+            return None
+        
+        seq = data.get('seq')
+        try:
+            self.metrics.increment('frames_received')
+            # 녹화는 큐에 넣기만 함 (base64 디코딩/파일 쓰기는 녹화기 스레드)
+            recorder = self._recorder(sid)
+            if recorder is not None:
+                recorder.record_frame(image_data)
+            
+            controller = self._quality_controller(sid)
+            rtt = data.get('rtt')
+            if isinstance(rtt, (int, float)) and rtt >= 0:
+                # 보고된 왕복 시간은 직전 프레임 것이므로 그 프레임의 서버 처리 시간을 빼서 네트워크 구간만 남김
+                self.network_latencies[sid] = max(0.0, rtt / 1000.0 - self.processing_times.get(sid, 0.0))
+                if controller is not None:
+                    controller.observe_round_trip(rtt / 1000.0)
+        
+        except Exception as e:
+            log.error('frame_error', '프레임 처리 오류', sid=sid, error=str(e))
+            self._emit_frame_error(sid, f'프레임 처리 오류: {str(e)}', seq)
+            return None
+        
+        mailbox = self.frame_mailboxes.get(sid)
+        if mailbox is None:
+            mailbox = self.frame_mailboxes.setdefault(
+                sid, FrameMailbox(on_drop=lambda: self.metrics.increment('frames_dropped'))
+            )
+        # 도착 시각을 함께 보관 (수신함에서 기다린 시간도 자세 예측에 반영)
+        if not mailbox.put((image_data, self.clock(), seq)):
+            return None
+        return mailbox
+    
+    def drain_frames(self, sid, mailbox):
+        """
+        수신함이 빌 때까지 프레임 처리 (블로킹 - 감지 파이프라인 실행)
+        """
+        engine = self.get_engine()
+        while True:
+            frame = mailbox.take()
+            if frame is None:
+                break
+            # 처리 중에 연결이 해제되어 수신함이 정리됐으면 남은 프레임은 버림
+            if self.frame_mailboxes.get(sid) is not mailbox:
+                break
+            image_data, received_at, seq = frame
+            self._process_frame_data(engine, sid, image_data, mailbox, received_at, seq)
+    
+    def _process_frame_data(self, engine, sid, image_data, mailbox, received_at=None, seq=None):
+        """
+        수신함에서 꺼낸 프레임 1장 처리 후 결과 전송
+        
+        Args:
+            engine: 세션 관리자
+            sid: Socket.IO 세션 ID
+            image_data: video_frame 이미지 데이터
+            mailbox: 세션의 FrameMailbox (드롭 통계 보고용)
+            received_at: 프레임 도착 시각 (self.clock 기준, 자세 예측 타임스탬프)
+            seq: 클라이언트가 보낸 프레임 번호 (응답에 그대로 포함, 없으면 None)
+        """
+        try:
+            started = time.perf_counter()
+            image_bytes = decode_image_payload(image_data)
+            decoded = time.perf_counter()
+            
+            result = engine.process_frame(sid, image_bytes, self.network_latencies.get(sid), received_at)
+            if result is None:
+                self._emit_frame_error(sid, '프레임 디코딩 실패', seq)
+                return
+            
+            # 단계별 소요 시간은 지표로만 기록 (클라이언트로 보내지 않음)
+            timings = result.pop('timings', {})
+            
+            # 수신/드롭 통계를 함께 보고
+            result['stats'] = mailbox.stats()
+            if seq is not None:
+                result['seq'] = seq
+            
+            # 결과 전송 (방송 중이면 응답을 마친 시청자에게도 같은 패킷으로 한 번에 전송)
+            # 이미지는 발표자가 협상한 형식으로 한 번만 변환 (시청자는 두 형식 모두 표시 가능)
+            emitting = time.perf_counter()
+            if result['image'] is not None:
+                result['image'] = encode_image_payload(
+                    result['image'], self.binary_transports.get(sid, False)
+                )
+            viewers, skipped = self.broadcast_rooms.take_ready_viewers(sid)
+            self.emit('processed_frame', result, to=[sid] + viewers if viewers else sid)
+            finished = time.perf_counter()
+            
+            if viewers:
+                self.metrics.increment('broadcast_frames_sent', len(viewers))
+            if skipped:
+                self.metrics.increment('broadcast_frames_skipped', skipped)
+            
+            timings['payload_decode'] = decoded - started
+            timings['emit'] = finished - emitting
+            timings['total'] = finished - started
+            self.metrics.observe(sid, timings)
+            
+            # 도착부터 전송까지 서버에 머문 시간 (수신함 대기 포함, 다음 왕복 시간 보고에서 제외)
+            self.processing_times[sid] = (
+                timings['total'] if received_at is None else max(0.0, self.clock() - received_at)
+            )
+            self.metrics.increment('frames_processed')
+            
+            self._adjust_quality(engine, sid, timings['total'])
+        
+        except Exception as e:
+            log.error('frame_error', '프레임 처리 오류', sid=sid, error=str(e))
+            self._emit_frame_error(sid, f'프레임 처리 오류: {str(e)}', seq)
+    
+    def _emit_frame_error(self, sid, message, seq=None):
+        """
+        프레임 처리 오류 전송 (클라이언트가 보낸 프레임 번호가 있으면 함께 전송)
+        """
+        payload = {'message': message}
+        if seq is not None:
+            payload['seq'] = seq
+        self.emit('error', payload, to=sid)
+    
+    def _quality_controller(self, sid):
+        """
+        세션 품질 조절기 조회 (처음 호출 시 생성, 품질 조절을 끄면 None)
+        """
+        if self.target_fps is None:
+            return None
+        
+        controller = self.quality_controllers.get(sid)
+        if controller is None:
+            controller = self.quality_controllers.setdefault(sid, QualityController(self.target_fps))
+        return controller
+    
+    def _adjust_quality(self, engine, sid, seconds):
+        """
+        처리 시간을 품질 조절기에 반영하고, 단계가 바뀌면 서버 인코딩 품질을 바꾼 뒤
+        클라이언트에 캡처 해상도/JPEG 품질/전송 간격을 알림
+        
+        Args:
+            engine: 세션 관리자
+            sid: Socket.IO 세션 ID
+            seconds: 프레임 1장의 서버 처리 시간 (초)
+        """
+        controller = self.quality_controllers.get(sid)
+        if controller is None:
+            return
+        
+        settings = controller.observe_processing(seconds)
+        if settings is None:
+            return
+        
+        engine.control(sid, 'set_encode_quality', settings['server_quality'])
+        self.emit('quality_settings', settings, to=sid)
+    
+    def on_set_transport(self, sid, data):
+        """
+        프레임 전송 방식 설정 (클라이언트별 협상)
+        
+        바이너리 모드에서는 JPEG 바이트를 Socket.IO 바이너리 첨부로 주고받아
+        base64 인코딩(약 33% 증가)과 문자열 복사를 생략합니다.
+        
+        Args:
+            data: {
+                'binary': bool
+            }
+        """
+        try:
+            binary = bool(data.get('binary', False))
+            self.binary_transports[sid] = binary
+            self.emit('transport_updated', {'binary': binary}, to=sid)
+        
+        except Exception as e:
+            log.error('control_error', '전송 방식 설정 오류', sid=sid, handler='set_transport', error=str(e))
+            self.emit('error', {'message': f'전송 방식 설정 오류: {str(e)}'}, to=sid)
+    
+    def on_set_response_mode(self, sid, data):
+        """
+        응답 방식 설정
+        
+        'metadata' 모드에서는 처리된 JPEG 대신 탐지/손 랜드마크 데이터만 보내고,
+        클라이언트가 자신의 로컬 비디오 위에 스켈레톤을 직접 그립니다.
+        
+        Args:
+            data: {
+                'mode': 'image' | 'metadata'
+            }
+        """
+        engine = self._require_engine(sid)
+        if engine is None:
+            return
+        
+        try:
+            mode = data.get('mode', 'image')
+            if mode not in ('image', 'metadata'):
+                self.emit('error', {'message': f'알 수 없는 응답 방식: {mode}'}, to=sid)
+                return
+            
+            engine.control(sid, 'set_option', 'metadata_only', mode == 'metadata')
+            self.emit('response_mode_updated', {'mode': mode}, to=sid)
+        
+        except Exception as e:
+            log.error('control_error', '응답 방식 설정 오류', sid=sid, handler='set_response_mode', error=str(e))
+            self.emit('error', {'message': f'응답 방식 설정 오류: {str(e)}'}, to=sid)
+    
+    def on_set_adjustment(self, sid, data):
+        """
+        명도/채도 조정 파라미터 설정
+        
+        Args:
+            data: {
+                'brightness': int (-100 ~ +100),
+                'saturation': int (-100 ~ +100)
+            }
+        """
+        engine = self._require_engine(sid, '형태 감지기가 초기화되지 않았습니다.')
+        if engine is None:
+            return
+        
+        try:
+            log.debug('adjustment', '명도/채도 조정', sid=sid,
+                      brightness=data.get('brightness'), saturation=data.get('saturation'))
+            
+            engine.control(
+                sid, 'set_adjustment',
+                data.get('brightness'),
+                data.get('saturation')
+            )
+            
+            self.emit('adjustment_updated', {'success': True}, to=sid)
+        
+        except Exception as e:
+            log.error('control_error', '명도/채도 조정 오류', sid=sid, handler='set_adjustment', error=str(e))
+            self.emit('error', {'message': f'명도/채도 조정 오류: {str(e)}'}, to=sid)
+    
+    def on_reset_detector(self, sid, data=None):
+        """
+        형태 감지기 리셋
+        """
+        engine = self.get_engine()
+        if engine is not None:
+            engine.control(sid, 'reset')
+        
+        self.emit('detector_reset', {'success': True}, to=sid)
+    
+    def on_set_thresholds(self, sid, data):
+        """
+        히스테리시스 임계값 설정
+        
+        Args:
+            data: {
+                'threshold_enter': float,
+                'threshold_exit': float
+            }
+        """
+        engine = self._require_engine(sid, '형태 감지기가 초기화되지 않았습니다.')
+        if engine is None:
+            return
+        
+        try:
+            engine.control(
+                sid, 'set_thresholds',
+                data.get('threshold_enter'),
+                data.get('threshold_exit')
+            )
+            
+            self.emit('thresholds_updated', {'success': True}, to=sid)
+        
+        except Exception as e:
+            log.error('control_error', '임계값 설정 오류', sid=sid, handler='set_thresholds', error=str(e))
+            self.emit('error', {'message': f'임계값 설정 오류: {str(e)}'}, to=sid)
+    
+    def on_set_white_background(self, sid, data):
+        """
+        흰색 배경 모드 설정 (웹캠 배경 숨기고 손 스켈레톤만 표시)
+        
+        Args:
+            data: {
+                'enabled': bool
+            }
+        """
+        engine = self._require_engine(sid)
+        if engine is None:
+            return
+        
+        try:
+            white_background_mode = data.get('enabled', False)
+            engine.control(sid, 'set_option', 'white_background_mode', white_background_mode)
+            log.debug('white_background', '흰색 배경 모드', sid=sid, enabled=white_background_mode)
+            self.emit('white_background_updated', {'enabled': white_background_mode}, to=sid)
+        
+        except Exception as e:
+            log.error('control_error', '흰색 배경 모드 설정 오류', sid=sid, handler='set_white_background', error=str(e))
+            self.emit('error', {'message': f'흰색 배경 모드 설정 오류: {str(e)}'}, to=sid)
+    
+    def on_set_mirror_mode(self, sid, data):
+        """
+        좌우반전(거울) 모드 설정
+        
+        Args:
+            data: {
+                'enabled': bool
+            }
+        """
+        engine = self._require_engine(sid)
+        if engine is None:
+            return
+        
+        try:
+            mirror_mode = data.get('enabled', True)
+            engine.control(sid, 'set_option', 'mirror_mode', mirror_mode)
+            log.debug('mirror_mode', '거울 모드', sid=sid, enabled=mirror_mode)
+            self.emit('mirror_mode_updated', {'enabled': mirror_mode}, to=sid)
+        
+        except Exception as e:
+            log.error('control_error', '거울 모드 설정 오류', sid=sid, handler='set_mirror_mode', error=str(e))
+            self.emit('error', {'message': f'거울 모드 설정 오류: {str(e)}'}, to=sid)
+    
+    def on_set_inference_resolution(self, sid, data):
+        """
+        단계별 추론 해상도 상한 설정
+        
+        표시용으로 고해상도 영상을 보내더라도 탐지는 축소된 프레임에서 수행하여
+        추론 비용이 입력 픽셀 수에 비례해 늘지 않도록 합니다.
+        
+        Args:
+            data: {
+                'hand_width': int (손 탐지 최대 너비, 0이면 제한 없음),
+                'shape_width': int (형태 탐지 최대 너비, 0이면 제한 없음)
+            }
+        """
+        engine = self._require_engine(sid)
+        if engine is None:
+            return
+        
+        try:
+            engine.control(
+                sid, 'set_inference_width',
+                data.get('hand_width'),
+                data.get('shape_width')
+            )
+            self.emit('inference_resolution_updated', {'success': True}, to=sid)
+        
+        except Exception as e:
+            log.error('control_error', '추론 해상도 설정 오류', sid=sid, handler='set_inference_resolution', error=str(e))
+            self.emit('error', {'message': f'추론 해상도 설정 오류: {str(e)}'}, to=sid)
+    
+    def on_create_broadcast(self, sid, data=None):
+        """
+        방송 시작 (이 세션의 처리 결과를 시청자에게 전달)
+        
+        Args:
+            data: {
+                'room': str (선택적, 없으면 임의 ID 생성)
+            }
+        """
+        try:
+            room_id = self.broadcast_rooms.create(sid, (data or {}).get('room'))
+            log.info('broadcast_created', '방송 시작', sid=sid, room=room_id)
+            self.emit('broadcast_created', {'room': room_id}, to=sid)
+        
+        except ValueError as e:
+            self.emit('error', {'message': str(e)}, to=sid)
+    
+    def on_join_broadcast(self, sid, data):
+        """
+        방송 시청 시작 (웹캠 없이 발표자의 processed_frame을 수신)
+        
+        Args:
+            data: {
+                'room': str
+            }
+        """
+        room_id = (data or {}).get('room')
+        try:
+            presenter_sid, viewer_count = self.broadcast_rooms.join(room_id, sid)
+        
+        except ValueError as e:
+            self.emit('error', {'message': str(e)}, to=sid)
+            return
+        
+        log.info('broadcast_joined', '방송 시청', sid=sid, room=room_id, viewers=viewer_count)
+        self.emit('broadcast_joined', {'room': room_id}, to=sid)
+        self.emit('broadcast_updated', {'room': room_id, 'viewers': viewer_count}, to=presenter_sid)
+    
+    def on_leave_broadcast(self, sid, data=None):
+        """
+        방송 종료(발표자) 또는 시청 종료(시청자)
+        """
+        room_id = self._leave_broadcast(sid)
+        if room_id is not None:
+            self.emit('broadcast_left', {'room': room_id}, to=sid)
+    
+    def on_broadcast_ack(self, sid, data=None):
+        """
+        시청자가 받은 프레임 표시를 마침 (다음 프레임 수신 가능)
+        """
+        self.broadcast_rooms.ack(sid)
+    
+    def _leave_broadcast(self, sid):
+        """
+        방송 방에서 세션 제거 후 상대방에게 알림
+        
+        Returns:
+            str: 속해 있던 방 ID (없으면 None)
+        """
+        left = self.broadcast_rooms.leave(sid)
+        if left is None:
+            return None
+        
+        action, room_id, detail = left
+        if action == 'closed':
+            # 발표자가 나가면 방이 닫히고 시청자에게 알림
+            log.info('broadcast_closed', '방송 종료', room=room_id)
+            if detail:
+                self.emit('broadcast_closed', {'room': room_id}, to=detail)
+        else:
+            presenter_sid, viewer_count = detail
+            self.emit('broadcast_updated', {'room': room_id, 'viewers': viewer_count}, to=presenter_sid)
+        return room_id
@@ -8,6 +8,9 @@ let webcam = null;
 let inputCanvas = null;
 let inputContext = null;
 let outputImage = null;
+let outputImageUrl = null;  // 바이너리 프레임용 Blob URL (재사용 전 해제)
+let outputCanvas = null;
+let outputContext = null;
 let isRunning = false;
 let animationFrameId = null;
 
@@ -29,10 +32,35 @@ let uiVisible = true;
 // 거울 모드 상태 (m키로 토글) - 기본 활성화
 let mirrorModeEnabled = true;
 
+// 로컬 렌더링 모드 (서버는 탐지 데이터만 보내고 스켈레톤은 브라우저에서 그림)
+let localRenderEnabled = false;
+
+// 방송 상태
+let broadcastRoom = null;     // 방송 중(발표자)이거나 시청 중(시청자)인 방 ID
+let viewerMode = false;       // 시청자 모드 (?view=방ID, 웹캠 없이 발표자 화면 표시)
+
+// 손 스켈레톤 연결 (서버 HandDetector.draw_landmarks와 동일)
+const HAND_CONNECTIONS = [
+    [0, 1], [1, 2], [2, 3], [3, 4],          // 엄지
+    [0, 5], [5, 6], [6, 7], [7, 8],          // 검지
+    [0, 9], [9, 10], [10, 11], [11, 12],     // 중지
+    [0, 13], [13, 14], [14, 15], [15, 16],   // 약지
+    [0, 17], [17, 18], [18, 19], [19, 20],   // 새끼
+    [5, 9], [9, 13], [13, 17]                // 손바닥 가로 연결
+];
+const FINGER_TIPS = [4, 8, 12, 16, 20];
+
 // 성능 최적화
 let processingFrame = false;  // 서버 처리 중 플래그
 let frameSkipCounter = 0;     // 프레임 스킵 카운터
-const FRAME_SKIP = 1;         // 1 = 모든 프레임, 2 = 2프레임마다 1번, 3 = 3프레임마다 1번
+
+// 전송 품질 (서버의 적응형 품질 조절기가 quality_settings 이벤트로 변경)
+let frameSkip = 1;            // 1 = 모든 프레임, 2 = 2프레임마다 1번, 3 = 3프레임마다 1번
+let captureQuality = 0.6;     // 전송 JPEG 품질
+let captureWidth = 640;       // 전송 프레임 최대 너비
+let serverDroppedFrames = 0;  // 서버 수신함에서 최신 프레임으로 교체된(드롭된) 프레임 수
+let serverReady = false;      // 서버 감지기 워밍업 완료 여부 (완료 전에는 프레임 전송 안 함)
+let sessionSettingsStale = false;  // 서버 세션이 유휴 제거됨 (다음 프레임 전에 설정을 다시 전송)
 
 // 사운드
 let meowSounds = [];
@@ -49,6 +77,8 @@ document.addEventListener('DOMContentLoaded', () => {
     inputCanvas = document.getElementById('input-canvas');
     inputContext = inputCanvas.getContext('2d');
     outputImage = document.getElementById('output-image');
+    outputCanvas = document.getElementById('output-canvas');
+    outputContext = outputCanvas.getContext('2d');
     
     // Socket.IO 연결
     socketHandler.connect();
@@ -57,6 +87,10 @@ document.addEventListener('DOMContentLoaded', () => {
     socketHandler.onProcessedFrame = handleProcessedFrame;
     socketHandler.onError = handleError;
     socketHandler.onStatusChange = handleStatusChange;
+    socketHandler.onQualitySettings = applyQualitySettings;
+    socketHandler.onBroadcastChange = handleBroadcastChange;
+    socketHandler.onDisconnect = handleDisconnect;
+    socketHandler.onSessionReset = handleSessionReset;
     
     // 이벤트 리스너 등록
     setupEventListeners();
@@ -64,8 +98,13 @@ document.addEventListener('DOMContentLoaded', () => {
     // 키보드 이벤트 리스너 (q키로 UI 토글)
     setupKeyboardListeners();
     
-    // 웹캠 초기화
-    initWebcam();
+    // 웹캠 초기화 (시청자 모드에서는 발표자 화면만 받으므로 웹캠 불필요)
+    const viewRoom = new URLSearchParams(window.location.search).get('view');
+    if (viewRoom) {
+        startViewer(viewRoom);
+    } else {
+        initWebcam();
+    }
     
     // Three.js 3D 렌더러 초기화
     initThreeRenderer();
@@ -166,8 +205,7 @@ async function initWebcam() {
         });
         
         // 캔버스 크기 설정
-        inputCanvas.width = webcam.videoWidth;
-        inputCanvas.height = webcam.videoHeight;
+        resizeInputCanvas();
         
         console.log(`웹캠 초기화 완료: ${webcam.videoWidth}x${webcam.videoHeight}`);
         
@@ -180,6 +218,34 @@ async function initWebcam() {
     }
 }
 
+/**
+ * 전송 캔버스 크기 설정 (웹캠 비율 유지, 너비는 captureWidth 이하)
+ */
+function resizeInputCanvas() {
+    if (!webcam.videoWidth) return;
+    
+    const width = Math.min(webcam.videoWidth, captureWidth);
+    inputCanvas.width = width;
+    inputCanvas.height = Math.round(webcam.videoHeight * width / webcam.videoWidth);
+}
+
+/**
+ * 서버 적응형 품질 설정 적용
+ * @param {object} settings - { level, capture_width, client_quality, frame_skip, server_quality }
+ */
+function applyQualitySettings(settings) {
+    frameSkip = settings.frame_skip;
+    captureQuality = settings.client_quality;
+    
+    if (settings.capture_width !== captureWidth) {
+        captureWidth = settings.capture_width;
+        resizeInputCanvas();
+    }
+    
+    console.log(`📶 품질 단계 ${settings.level}: ${inputCanvas.width}x${inputCanvas.height}, ` +
+                `JPEG ${captureQuality}, ${frameSkip}프레임마다 전송`);
+}
+
 /**
  * 이벤트 리스너 설정
  */
@@ -206,6 +272,12 @@ function setupEventListeners() {
     
     // 흰색 배경(스켈레톤) 모드 토글 버튼
     document.getElementById('btn-white-bg').addEventListener('click', toggleWhiteBackground);
+    
+    // 로컬 렌더링 모드 토글 버튼
+    document.getElementById('btn-local-render').addEventListener('click', toggleLocalRender);
+    
+    // 방송 시작/종료 버튼
+    document.getElementById('btn-broadcast').addEventListener('click', toggleBroadcast);
 }
 
 /**
@@ -283,6 +355,33 @@ function toggleWhiteBackground() {
     socketHandler.setWhiteBackground(whiteBackgroundEnabled);
 }
 
+/**
+ * 로컬 렌더링 모드 토글
+ * 서버의 JPEG 재인코딩을 생략하고 로컬 웹캠 프레임 위에 스켈레톤을 그림
+ */
+function toggleLocalRender() {
+    localRenderEnabled = !localRenderEnabled;
+    
+    const btn = document.getElementById('btn-local-render');
+    btn.classList.toggle('btn-light', localRenderEnabled);
+    btn.classList.toggle('btn-outline-light', !localRenderEnabled);
+    
+    outputImage.style.display = localRenderEnabled ? 'none' : '';
+    outputCanvas.style.display = localRenderEnabled ? 'block' : 'none';
+    
+    console.log(`⚡ 로컬 렌더링 ${localRenderEnabled ? '활성화' : '비활성화'}`);
+    
+    // 서버에 전송
+    sendResponseMode();
+}
+
+/**
+ * 응답 방식 전송
+ */
+function sendResponseMode() {
+    socketHandler.setResponseMode(localRenderEnabled ? 'metadata' : 'image');
+}
+
 /**
  * 명도/채도 슬라이더 설정
  */
@@ -375,6 +474,7 @@ function startProcessing() {
     console.log('📤 초기 명도/채도 및 임계값 전송...');
     sendAdjustment();
     sendThresholds();
+    sendResponseMode();
     
     // 프레임 처리 루프 시작
     processFrame();
@@ -415,20 +515,39 @@ function processFrame() {
     try {
         // 프레임 스킵 (성능 향상)
         frameSkipCounter++;
-        if (frameSkipCounter >= FRAME_SKIP && !processingFrame) {
+        if (frameSkipCounter >= frameSkip && !processingFrame && serverReady) {
             frameSkipCounter = 0;
             
+            // 유휴 제거된 서버 세션은 기본 설정으로 새로 만들어지므로 프레임보다 설정을 먼저 전송
+            if (sessionSettingsStale) {
+                sessionSettingsStale = false;
+                sendSessionSettings();
+            }
+            
             // 웹캠 프레임을 캔버스에 그리기
             inputContext.drawImage(webcam, 0, 0, inputCanvas.width, inputCanvas.height);
             
-            // 캔버스를 Base64로 인코딩 (JPEG 품질 60%로 낮춤)
-            const base64Image = inputCanvas.toDataURL('image/jpeg', 0.6);
-            
             // 서버 처리 중 플래그 설정
             processingFrame = true;
             
-            // 서버로 전송
-            socketHandler.sendFrame(base64Image);
+            if (socketHandler.binaryTransport) {
+                // 바이너리 모드: JPEG 바이트를 그대로 전송 (base64 변환 없음)
+                inputCanvas.toBlob((blob) => {
+                    if (!blob) {
+                        processingFrame = false;
+                        return;
+                    }
+                    blob.arrayBuffer()
+                        .then((buffer) => socketHandler.sendFrame(buffer))
+                        .catch(() => { processingFrame = false; });
+                }, 'image/jpeg', captureQuality);
+            } else {
+                // 캔버스를 Base64로 인코딩 (품질은 적응형 품질 단계에 따름, 기본 60%)
+                const base64Image = inputCanvas.toDataURL('image/jpeg', captureQuality);
+                
+                // 서버로 전송
+                socketHandler.sendFrame(base64Image);
+            }
         }
         
         // FPS 계산
@@ -439,7 +558,8 @@ function processFrame() {
             frameCount = 0;
             lastFpsUpdate = now;
             
-            document.getElementById('fps-counter').textContent = `FPS: ${currentFps}`;
+            const dropInfo = serverDroppedFrames > 0 ? ` | 드롭: ${serverDroppedFrames}` : '';
+            document.getElementById('fps-counter').textContent = `FPS: ${currentFps}${dropInfo}`;
         }
         
     } catch (error) {
@@ -458,16 +578,30 @@ function handleProcessedFrame(data) {
     // 서버 처리 완료 플래그 해제
     processingFrame = false;
     
-    // 결과 이미지 표시
-    outputImage.src = data.image;
+    // 서버 수신함 드롭 통계
+    if (data.stats) {
+        serverDroppedFrames = data.stats.dropped;
+    }
+    
+    // 시청자: 발표자의 응답 방식에 따라 이미지/캔버스 레이어 전환
+    if (viewerMode) {
+        outputImage.style.display = data.image ? '' : 'none';
+        outputCanvas.style.display = data.image ? 'none' : 'block';
+    }
+    
+    // 결과 이미지 표시 (메타데이터 전용 응답이면 로컬에서 렌더링)
+    if (data.image) {
+        showOutputImage(data.image);
+    } else if (localRenderEnabled) {
+        renderLocalFrame(data);
+    }
     
     // 탐지 정보 업데이트
     const detection = data.detection;
     
     // 검지 탭 감지 → 해당 위치로 뛰어가기!
     const hands = data.hands || {};
-    const screenWidth = 640;
-    const screenHeight = 360;  // 16:9 비율
+    const [screenWidth, screenHeight] = data.frame_size || [640, 360];  // 서버가 처리한 프레임 크기
     
     if (threeRenderer && threeRenderer.isLoaded && hands.tap_detected && hands.tap_position) {
         // 화면 좌표를 0~1 비율로 변환
@@ -548,9 +682,10 @@ function handleProcessedFrame(data) {
         const scale = detection.scale ? detection.scale.toFixed(2) : 'N/A';
         const handInfo = hands.found ? ` | 👋 손: ${hands.count}개` : '';
         const modelInfo = threeRenderer && threeRenderer.isLoaded ? ' | 🐱 3D 모델' : '';
+        const shapeInfo = detection.shape_name ? ` (${detection.shape_name})` : '';
         
         detectionInfo.innerHTML = `
-            <strong>탐지됨</strong> | 
+            <strong>탐지됨${shapeInfo}</strong> | 
             점수: ${score} | 
             각도: ${angle}° | 
             스케일: ${scale}x${handInfo}${modelInfo}
@@ -563,12 +698,96 @@ function handleProcessedFrame(data) {
     }
 }
 
+/**
+ * 결과 이미지 표시
+ * @param {ArrayBuffer|string} image - JPEG 바이트 (바이너리 모드) 또는 Data URL
+ */
+function showOutputImage(image) {
+    if (typeof image === 'string') {
+        outputImage.src = image;
+        return;
+    }
+    
+    // 바이너리 모드: Blob URL로 표시하고 이전 URL은 해제
+    const previousUrl = outputImageUrl;
+    outputImageUrl = URL.createObjectURL(new Blob([image], { type: 'image/jpeg' }));
+    outputImage.src = outputImageUrl;
+    if (previousUrl) {
+        URL.revokeObjectURL(previousUrl);
+    }
+}
+
+/**
+ * 로컬 렌더링: 서버로 보낸 프레임 위에 손 스켈레톤 그리기
+ * (한 번에 한 프레임만 전송하므로 inputCanvas에는 응답에 해당하는 프레임이 남아 있음)
+ * @param {object} data - processed_frame 데이터 (이미지 없음)
+ */
+function renderLocalFrame(data) {
+    const [width, height] = data.frame_size || [inputCanvas.width, inputCanvas.height];
+    if (outputCanvas.width !== width || outputCanvas.height !== height) {
+        outputCanvas.width = width;
+        outputCanvas.height = height;
+    }
+    
+    outputContext.save();
+    if (whiteBackgroundEnabled) {
+        // 흰색 배경 모드
+        outputContext.fillStyle = '#ffffff';
+        outputContext.fillRect(0, 0, width, height);
+    } else {
+        // 명도/채도 조정 (서버 HSV 조정의 근사치)
+        const brightness = parseInt(document.getElementById('brightness').value) || 0;
+        const saturation = parseInt(document.getElementById('saturation').value) || 0;
+        outputContext.filter = `brightness(${1 + brightness / 255}) saturate(${1 + saturation / 100})`;
+        
+        // 서버는 거울 모드에서 좌우반전한 프레임 좌표를 돌려줌
+        if (mirrorModeEnabled) {
+            outputContext.translate(width, 0);
+            outputContext.scale(-1, 1);
+        }
+        outputContext.drawImage(inputCanvas, 0, 0, width, height);
+    }
+    outputContext.restore();
+    
+    const landmarks = (data.hands && data.hands.landmarks) || [];
+    drawHandSkeleton(outputContext, landmarks);
+}
+
+/**
+ * 손 스켈레톤 그리기 - 미니멀 스타일 (서버 draw_landmarks와 동일)
+ * @param {CanvasRenderingContext2D} context
+ * @param {Array} landmarks - 손마다 21개 [x, y] 좌표
+ */
+function drawHandSkeleton(context, landmarks) {
+    context.strokeStyle = 'rgb(220, 220, 220)';
+    context.fillStyle = '#ffffff';
+    context.lineWidth = 1;
+    
+    landmarks.forEach((points) => {
+        context.beginPath();
+        HAND_CONNECTIONS.forEach(([start, end]) => {
+            context.moveTo(points[start][0], points[start][1]);
+            context.lineTo(points[end][0], points[end][1]);
+        });
+        context.stroke();
+        
+        points.forEach(([x, y], idx) => {
+            context.beginPath();
+            context.arc(x, y, FINGER_TIPS.includes(idx) ? 3 : 2, 0, Math.PI * 2);
+            context.fill();
+        });
+    });
+}
+
 /**
  * 에러 핸들러
  */
 function handleError(message) {
     console.error('에러:', message);
     // Toast 알림 또는 경고 표시 가능
+    
+    // 응답 대신 에러를 받은 프레임이 있으면 다음 프레임을 보낼 수 있도록 해제
+    processingFrame = false;
 }
 
 /**
@@ -577,11 +796,139 @@ function handleError(message) {
 function handleStatusChange(status) {
     console.log('상태 변경:', status);
     
-    if (!status.ready) {
+    const becameReady = status.ready && !serverReady;
+    serverReady = status.ready;
+    updateWarmupStatus(status);
+    
+    // 준비 전에 보낸 설정은 서버가 거부했으므로 준비되는 시점에 현재 설정을 다시 전송
+    if (becameReady && !viewerMode) {
+        sendSessionSettings();
+    }
+    
+    // 워밍업 중이면 완료 알림을 기다림 (실패했거나 워밍업 정보가 없을 때만 경고)
+    const warmup = status.warmup;
+    if (!status.ready && (!warmup || warmup.state === 'failed')) {
         alert('서버가 준비되지 않았습니다. 필수 파일(참조 이미지, 비디오)을 확인해주세요.');
     }
 }
 
+/**
+ * 연결 해제 핸들러
+ * 재연결하면 서버 세션이 새로 만들어지므로 다음 준비 상태에서 설정을 다시 보내도록 초기화
+ */
+function handleDisconnect() {
+    serverReady = false;
+}
+
+/**
+ * 서버 세션 초기화 핸들러
+ * 유휴 제거 후 새 세션은 기본 설정으로 시작하므로, 다음 프레임을 보내기 전에 현재 설정을 다시 전송
+ * (바로 보내면 유휴 상태인 세션이 곧바로 다시 만들어짐)
+ */
+function handleSessionReset() {
+    if (!viewerMode) {
+        sessionSettingsStale = true;
+    }
+}
+
+/**
+ * 현재 화면 설정을 서버 세션에 전송 (응답 방식, 명도/채도, 임계값, 거울/스켈레톤 모드)
+ */
+function sendSessionSettings() {
+    sendResponseMode();
+    sendAdjustment();
+    sendThresholds();
+    socketHandler.setMirrorMode(mirrorModeEnabled);
+    socketHandler.setWhiteBackground(whiteBackgroundEnabled);
+}
+
+/**
+ * 서버 워밍업 진행 상황 표시
+ */
+function updateWarmupStatus(status) {
+    const badge = document.getElementById('warmup-status');
+    if (!badge) return;
+    
+    const warmup = status.warmup;
+    if (status.ready || !warmup || warmup.state === 'failed') {
+        badge.style.display = 'none';
+        return;
+    }
+    
+    const percent = Math.round(warmup.progress * 100);
+    badge.innerHTML = `<i class="fas fa-spinner fa-spin me-1"></i>서버 준비 중 ${percent}% - ${warmup.message}`;
+    badge.style.display = 'inline-block';
+}
+
+/**
+ * 방송 시작/종료 토글 (발표자)
+ */
+function toggleBroadcast() {
+    if (broadcastRoom) {
+        socketHandler.leaveBroadcast();
+    } else {
+        socketHandler.createBroadcast();
+    }
+}
+
+/**
+ * 시청자 모드 시작
+ * 웹캠 없이 발표자의 processed_frame을 받아 표시 (메타데이터 전용이면 흰 배경에 스켈레톤)
+ * @param {string} room - 방 ID
+ */
+function startViewer(room) {
+    viewerMode = true;
+    localRenderEnabled = true;
+    whiteBackgroundEnabled = true;
+    
+    // 발표자용 컨트롤 숨기기
+    ['btn-start', 'btn-stop', 'btn-white-bg', 'btn-local-render', 'btn-broadcast'].forEach((id) => {
+        document.getElementById(id).style.display = 'none';
+    });
+    document.getElementById('no-video-overlay').style.display = 'none';
+    
+    socketHandler.joinBroadcast(room);
+}
+
+/**
+ * 방송 상태 변경 핸들러
+ * @param {string} kind - 'created' | 'updated' | 'joined' | 'closed' | 'left'
+ * @param {object} data - { room, viewers }
+ */
+function handleBroadcastChange(kind, data) {
+    const badge = document.getElementById('broadcast-status');
+    const btn = document.getElementById('btn-broadcast');
+    
+    if (kind === 'created' || kind === 'joined') {
+        broadcastRoom = data.room;
+    } else if (kind === 'closed' || kind === 'left') {
+        broadcastRoom = null;
+    }
+    
+    if (viewerMode) {
+        badge.textContent = broadcastRoom ? `시청 중: ${broadcastRoom}` : '방송이 종료되었습니다';
+        badge.style.display = 'inline-block';
+        return;
+    }
+    
+    btn.classList.toggle('btn-light', broadcastRoom !== null);
+    btn.classList.toggle('btn-outline-light', broadcastRoom === null);
+    
+    if (!broadcastRoom) {
+        badge.style.display = 'none';
+        return;
+    }
+    
+    const viewers = data.viewers || 0;
+    const viewerUrl = `${window.location.origin}${window.location.pathname}?view=${encodeURIComponent(broadcastRoom)}`;
+    badge.textContent = `방송 중: ${broadcastRoom} (시청자 ${viewers}명)`;
+    badge.title = viewerUrl;
+    badge.style.display = 'inline-block';
+    if (kind === 'created') {
+        console.log(`📡 시청 주소: ${viewerUrl}`);
+    }
+}
+
 /**
  * 페이지 언로드 시 정리
  */
@@ -7,9 +7,21 @@ class SocketHandler {
     constructor() {
         this.socket = null;
         this.isConnected = false;
+        this.binaryTransport = false;  // 서버가 바이너리 전송을 승인했는지 여부
         this.onStatusChange = null;
+        this.onDisconnect = null;
+        this.onSessionReset = null;
         this.onProcessedFrame = null;
         this.onError = null;
+        this.onQualitySettings = null;
+        this.onBroadcastChange = null;
+        
+        // 방송 시청 중인 방 ID (시청자는 프레임 표시 후 broadcast_ack로 응답)
+        this.viewingRoom = null;
+        
+        // 프레임 왕복 시간 측정 (다음 프레임과 함께 서버에 보고)
+        this.frameSentAt = null;
+        this.lastRoundTrip = null;
     }
     
     /**
@@ -23,6 +35,16 @@ class SocketHandler {
             console.log('서버에 연결되었습니다.');
             this.isConnected = true;
             this.updateConnectionStatus(true);
+            
+            // 바이너리 프레임 전송 협상 (승인 전까지는 base64 문자열 사용)
+            // 시청자는 프레임을 보내지 않고 발표자 형식 그대로 받으므로 협상하지 않음
+            this.binaryTransport = false;
+            if (this.viewingRoom) {
+                // 재연결 시 시청하던 방에 다시 참가
+                this.socket.emit('join_broadcast', { room: this.viewingRoom });
+            } else {
+                this.negotiateTransport();
+            }
         });
         
         // 연결 해제 이벤트
@@ -30,6 +52,9 @@ class SocketHandler {
             console.log('서버와의 연결이 끊어졌습니다.');
             this.isConnected = false;
             this.updateConnectionStatus(false);
+            if (this.onDisconnect) {
+                this.onDisconnect();
+            }
         });
         
         // 상태 업데이트
@@ -42,9 +67,18 @@ class SocketHandler {
         
         // 처리된 프레임 수신
         this.socket.on('processed_frame', (data) => {
+            if (this.frameSentAt !== null) {
+                this.lastRoundTrip = performance.now() - this.frameSentAt;
+                this.frameSentAt = null;
+            }
             if (this.onProcessedFrame) {
                 this.onProcessedFrame(data);
             }
+            
+            // 시청자: 표시를 마쳤으니 다음 프레임 요청 (응답 전에는 서버가 프레임을 건너뜀)
+            if (this.viewingRoom) {
+                this.socket.emit('broadcast_ack');
+            }
         });
         
         // 에러 수신
@@ -75,6 +109,43 @@ class SocketHandler {
             console.log('🎨 흰색 배경 모드:', data.enabled ? '활성화' : '비활성화');
         });
         
+        // 전송 방식 협상 결과
+        this.socket.on('transport_updated', (data) => {
+            this.binaryTransport = data.binary;
+            console.log('📦 프레임 전송 방식:', data.binary ? '바이너리' : 'base64');
+        });
+        
+        // 응답 방식 업데이트 확인
+        this.socket.on('response_mode_updated', (data) => {
+            console.log('⚡ 응답 방식:', data.mode === 'metadata' ? '메타데이터 전용' : '이미지');
+        });
+        
+        // 유휴 시간 초과로 서버 파이프라인 세션이 제거됨 (다음 프레임부터 기본 설정으로 새로 시작)
+        this.socket.on('session_reset', (data) => {
+            console.log('♻️ 서버 세션 초기화:', data.reason);
+            if (this.onSessionReset) {
+                this.onSessionReset(data);
+            }
+        });
+        
+        // 적응형 품질 단계 변경 (캡처 해상도/JPEG 품질/전송 간격)
+        this.socket.on('quality_settings', (data) => {
+            if (this.onQualitySettings) {
+                this.onQualitySettings(data);
+            }
+        });
+        
+        // 방송 상태 변경 (created / updated / joined / closed / left)
+        ['broadcast_created', 'broadcast_updated', 'broadcast_joined',
+         'broadcast_closed', 'broadcast_left'].forEach((event) => {
+            this.socket.on(event, (data) => {
+                console.log('📡 방송:', event, data);
+                if (this.onBroadcastChange) {
+                    this.onBroadcastChange(event.replace('broadcast_', ''), data);
+                }
+            });
+        });
+        
         // 거울 모드 업데이트 확인
         this.socket.on('mirror_mode_updated', (data) => {
             console.log('🪞 거울 모드:', data.enabled ? '활성화' : '비활성화');
@@ -97,19 +168,41 @@ class SocketHandler {
         }
     }
     
+    /**
+     * 브라우저가 바이너리 프레임 전송을 지원하는지 확인
+     * @returns {boolean}
+     */
+    static supportsBinaryFrames() {
+        return typeof HTMLCanvasElement !== 'undefined' &&
+            typeof HTMLCanvasElement.prototype.toBlob === 'function' &&
+            typeof Blob !== 'undefined' &&
+            typeof Blob.prototype.arrayBuffer === 'function';
+    }
+    
+    /**
+     * 바이너리 프레임 전송 협상 요청 (서버가 transport_updated로 승인)
+     */
+    negotiateTransport() {
+        this.socket.emit('set_transport', { binary: SocketHandler.supportsBinaryFrames() });
+    }
+    
     /**
      * 비디오 프레임 전송
-     * @param {string} base64Image - Base64 인코딩된 이미지
+     * @param {ArrayBuffer|string} image - JPEG 바이트 (바이너리 모드) 또는 Base64 Data URL
      */
-    sendFrame(base64Image) {
+    sendFrame(image) {
         if (!this.isConnected) {
             console.warn('서버에 연결되지 않았습니다.');
             return;
         }
         
-        this.socket.emit('video_frame', {
-            image: base64Image
-        });
+        const frame = { image: image };
+        if (this.lastRoundTrip !== null) {
+            frame.rtt = Math.round(this.lastRoundTrip);
+        }
+        
+        this.frameSentAt = performance.now();
+        this.socket.emit('video_frame', frame);
     }
     
     /**
@@ -176,6 +269,54 @@ class SocketHandler {
         this.socket.emit('set_mirror_mode', { enabled: enabled });
     }
     
+    /**
+     * 응답 방식 설정
+     * @param {string} mode - 'image' (처리된 JPEG) 또는 'metadata' (탐지 데이터만)
+     */
+    setResponseMode(mode) {
+        if (!this.isConnected) {
+            console.warn('서버에 연결되지 않았습니다.');
+            return;
+        }
+        
+        this.socket.emit('set_response_mode', { mode: mode });
+    }
+    
+    /**
+     * 방송 시작 (이 클라이언트의 처리 결과를 시청자에게 전달)
+     */
+    createBroadcast() {
+        if (!this.isConnected) {
+            console.warn('서버에 연결되지 않았습니다.');
+            return;
+        }
+        
+        this.socket.emit('create_broadcast', {});
+    }
+    
+    /**
+     * 방송 종료
+     */
+    leaveBroadcast() {
+        if (!this.isConnected) {
+            console.warn('서버에 연결되지 않았습니다.');
+            return;
+        }
+        
+        this.socket.emit('leave_broadcast');
+    }
+    
+    /**
+     * 방송 시청 (연결 전이면 연결 후 참가)
+     * @param {string} room - 방 ID
+     */
+    joinBroadcast(room) {
+        this.viewingRoom = room;
+        if (this.isConnected) {
+            this.socket.emit('join_broadcast', { room: room });
+        }
+    }
+    
     /**
      * 연결 끊기
      */
@@ -0,0 +1,118 @@
+"""
+테스트 공통 설정
+저장소 최상위의 모듈(socket_events, shape_scoring 등)을 바로 임포트할 수 있도록 경로 추가
+"""
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# 테스트용 참조 형태 (귀 두 개가 달린 몸통 - 회전 방향을 구분할 수 있는 비대칭 다각형)
+REFERENCE_POLYGON = np.array([
+    [60, 200], [80, 120], [70, 40], [95, 30], [110, 110], [130, 110],
+    [150, 20], [175, 35], [160, 120], [190, 200], [150, 240], [100, 240],
+], np.int32)
+
+# 라이브러리 테스트용 추가 형태 (참조 형태와 Hu Moments가 뚜렷이 다른 다각형)
+DOG_POLYGON = np.array([
+    [40, 60], [200, 60], [200, 110], [110, 110], [110, 240], [40, 240],
+], np.int32)
+BIRD_POLYGON = np.array([
+    [30, 140], [130, 30], [230, 140], [170, 140], [130, 240], [90, 140],
+], np.int32)
+
+
+def write_shape(path, polygon):
+    """
+    흰 배경에 검은 형태를 그린 이미지 저장 (polygon이 None이면 빈 이미지)
+    """
+    image = np.full((280, 260, 3), 255, np.uint8)
+    if polygon is not None:
+        cv2.fillPoly(image, [polygon], (0, 0, 0))
+    cv2.imwrite(str(path), image)
+    return str(path)
+
+
+def shape_frame(polygon, offset=(200, 120), width=640, height=480):
+    """
+    흰 배경 프레임의 offset 위치에 형태를 그린 웹캠 프레임
+    """
+    frame = np.full((height, width, 3), 255, np.uint8)
+    cv2.fillPoly(frame, [polygon + np.array(offset, np.int32)], (0, 0, 0))
+    return frame
+
+
+def encode_jpeg(frame):
+    _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
+    return buffer.tobytes()
+
+
+class FakeHandDetector:
+    """
+    손이 없는 결과만 돌려주는 손 감지기 대역 (MediaPipe 없이 파이프라인 실행)
+    """
+    
+    def detect(self, frame, output_size=None):
+        return {'hands_found': False, 'hand_centers': [], 'landmarks': [], 'index_finger_tips': []}
+    
+    def check_collision(self, hand_centers, rabbit_corners, rabbit_center=None):
+        return {'collision': False}
+    
+    def check_index_tap(self, index_finger_tips, rabbit_corners):
+        return False
+    
+    def landmarks_to_points(self, landmarks_list, width, height):
+        return []
+    
+    def draw_landmarks(self, frame, landmarks_list):
+        return frame
+    
+    def reset(self):
+        pass
+    
+    def release(self):
+        pass
+
+
+class FakeVideoOverlay:
+    """
+    세션 관리에 필요한 메서드만 있는 비디오 오버레이 대역
+    """
+    is_flipped = False
+    
+    def clone(self):
+        return FakeVideoOverlay()
+    
+    def reset(self):
+        pass
+    
+    def release(self):
+        pass
+
+
+@pytest.fixture
+def reference_image(tmp_path):
+    """
+    흰 배경에 검은 참조 형태를 그린 이미지 파일 경로
+    """
+    return write_shape(tmp_path / 'rabbit reference.png', REFERENCE_POLYGON)
+
+
+@pytest.fixture
+def library_dir(tmp_path, reference_image):
+    """
+    기본 형태와 같은 이름의 파일, 형태 2개, 윤곽선 없는 이미지, 이미지가 아닌 파일이 있는 폴더
+    """
+    library = tmp_path / 'shapes'
+    library.mkdir()
+    write_shape(library / 'rabbit.png', DOG_POLYGON)
+    write_shape(library / 'dog.png', DOG_POLYGON)
+    write_shape(library / 'bird_reference.jpg', BIRD_POLYGON)
+    write_shape(library / 'blank.png', None)
+    (library / 'notes.txt').write_text('not an image')
+    return str(library)
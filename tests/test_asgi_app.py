@@ -0,0 +1,86 @@
+"""
+ASGI 서버 이벤트 핸들러 테스트
+AsyncServer에 등록된 핸들러를 이벤트 루프에서 직접 호출하고, 녹화 중에도 base64 디코딩과
+파일 쓰기가 이벤트 루프 스레드에서 실행되지 않는지 확인합니다.
+"""
+import asyncio
+import base64
+import threading
+
+import pytest
+
+import asgi_app
+import session_recorder
+import socket_events
+from conftest import REFERENCE_POLYGON, FakeHandDetector, FakeVideoOverlay, encode_jpeg, shape_frame
+from session_manager import SessionManager
+from session_recorder import read_recording
+from shape_detector import ShapeDetector
+
+
+@pytest.fixture
+def server(reference_image, tmp_path, monkeypatch):
+    """
+    가짜 손 감지기/비디오 오버레이로 만든 SocketEvents를 ASGI 앱에 연결 (녹화 켬)
+    """
+    emitted = []
+    manager = SessionManager(ShapeDetector(reference_image), FakeVideoOverlay(), FakeHandDetector)
+    events = socket_events.SocketEvents(
+        lambda: manager, lambda event, payload, to: emitted.append((event, to)),
+        record_dir=str(tmp_path / 'recordings')
+    )
+    monkeypatch.setattr(asgi_app, 'socket_events', events)
+    return emitted, tmp_path / 'recordings'
+
+
+async def run_client(monkeypatch, sid, frames):
+    """
+    connect → set_mirror_mode → video_frame × N → disconnect 순서로 핸들러 호출
+    """
+    monkeypatch.setattr(asgi_app, 'event_loop', asyncio.get_running_loop())
+    handlers = asgi_app.sio.handlers['/']
+    await handlers['connect'](sid, {})
+    await handlers['set_mirror_mode'](sid, {'enabled': False})
+    for seq, frame in enumerate(frames):
+        await handlers['video_frame'](sid, {'image': frame, 'seq': seq})
+    await handlers['disconnect'](sid)
+
+
+def test_handlers_process_and_record_frames(server, monkeypatch):
+    emitted, record_dir = server
+    image_bytes = encode_jpeg(shape_frame(REFERENCE_POLYGON))
+    data_url = 'data:image/jpeg;base64,' + base64.b64encode(image_bytes).decode('ascii')
+    
+    asyncio.run(run_client(monkeypatch, 'sid-1', [data_url, image_bytes]))
+    
+    assert [event for event, _ in emitted] == [
+        'status', 'mirror_mode_updated', 'processed_frame', 'processed_frame'
+    ]
+    assert all(to == 'sid-1' for _, to in emitted)
+    [path] = record_dir.iterdir()
+    records = [(event, data) for _, event, data in read_recording(str(path))]
+    assert records == [
+        ('set_mirror_mode', {'enabled': False}),
+        ('video_frame', image_bytes),
+        ('video_frame', image_bytes),
+    ]
+
+
+def test_frame_decoding_and_recording_stay_off_event_loop(server, monkeypatch):
+    threads = []
+    
+    def spy(decode):
+        def wrapper(image_data):
+            threads.append(threading.current_thread())
+            return decode(image_data)
+        return wrapper
+    monkeypatch.setattr(session_recorder, 'decode_image_payload', spy(session_recorder.decode_image_payload))
+    monkeypatch.setattr(socket_events, 'decode_image_payload', spy(socket_events.decode_image_payload))
+    image_bytes = encode_jpeg(shape_frame(REFERENCE_POLYGON))
+    data_url = 'data:image/jpeg;base64,' + base64.b64encode(image_bytes).decode('ascii')
+    
+    asyncio.run(run_client(monkeypatch, 'sid-1', [data_url] * 3))
+    
+    # 처리(실행기)와 녹화(녹화기 스레드)에서 프레임마다 한 번씩 디코딩
+    assert len(threads) == 6
+    assert threading.main_thread() not in threads
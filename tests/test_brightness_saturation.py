@@ -0,0 +1,88 @@
+"""
+ShapeDetector 명도/채도 조정 테스트
+룩업 테이블 결과가 이전 float 연산 결과와 같은지, 조정 값이 바뀔 때 테이블을 다시 만드는지 확인합니다.
+"""
+import cv2
+import numpy as np
+import pytest
+
+from shape_detector import ShapeDetector
+
+SETTINGS = range(-100, 101, 25)
+
+
+def float_adjust(image, brightness, saturation):
+    """
+    룩업 테이블 도입 전의 float32 연산 (비교 기준)
+    """
+    if brightness == 0 and saturation == 0:
+        return image
+    
+    if len(image.shape) == 2:
+        if brightness != 0:
+            return np.clip(image.astype(np.float32) + brightness, 0, 255).astype(np.uint8)
+        return image
+    
+    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV).astype(np.float32)
+    if saturation != 0:
+        hsv[:, :, 1] = np.clip(hsv[:, :, 1] * (1.0 + saturation / 100.0), 0, 255)
+    if brightness != 0:
+        hsv[:, :, 2] = np.clip(hsv[:, :, 2] + brightness, 0, 255)
+    return cv2.cvtColor(hsv.astype(np.uint8), cv2.COLOR_HSV2BGR)
+
+
+@pytest.fixture
+def detector(reference_image):
+    return ShapeDetector(reference_image)
+
+
+@pytest.fixture
+def color_image():
+    # 모든 밝기/채도 구간이 들어가도록 무작위 색상 + 흑백 계조
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (64, 64, 3), dtype=np.uint8)
+    image[0] = np.repeat(np.linspace(0, 255, 64).astype(np.uint8)[:, None], 3, axis=1)
+    return image
+
+
+@pytest.mark.parametrize('brightness', SETTINGS)
+@pytest.mark.parametrize('saturation', SETTINGS)
+def test_lut_matches_float_path(detector, color_image, brightness, saturation):
+    detector.set_adjustment(brightness, saturation)
+    gray = cv2.cvtColor(color_image, cv2.COLOR_BGR2GRAY)
+    
+    color = detector.apply_brightness_saturation(color_image)
+    gray_result = detector.apply_brightness_saturation(gray)
+    
+    expected = float_adjust(color_image, brightness, saturation)
+    diff = np.abs(color.astype(np.int16) - expected.astype(np.int16))
+    assert color.dtype == np.uint8 and color.shape == color_image.shape
+    assert diff.max() <= 1
+    gray_diff = np.abs(gray_result.astype(np.int16) - float_adjust(gray, brightness, saturation))
+    assert gray_diff.max() <= 1
+
+
+def test_tables_rebuilt_only_when_settings_change(detector, color_image):
+    detector.set_adjustment(30, -20)
+    detector.apply_brightness_saturation(color_image)
+    first = detector._adjustment_cache
+    
+    detector.apply_brightness_saturation(color_image)
+    assert detector._adjustment_cache is first
+    
+    detector.set_adjustment(brightness=-40)
+    detector.apply_brightness_saturation(color_image)
+    brightness_changed = detector._adjustment_cache
+    
+    # set_adjustment 없이 속성을 직접 바꿔도 다시 계산
+    detector.saturation = 50
+    detector.apply_brightness_saturation(color_image)
+    saturation_changed = detector._adjustment_cache
+    
+    assert brightness_changed is not first
+    assert brightness_changed[0] == (-40, -20)
+    assert saturation_changed is not brightness_changed
+    assert saturation_changed[0] == (-40, 50)
+    assert np.array_equal(
+        detector.apply_brightness_saturation(color_image), float_adjust(color_image, -40, 50)
+    )
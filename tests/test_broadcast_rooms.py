@@ -0,0 +1,64 @@
+"""
+BroadcastRooms 테스트 (응답하지 않은 시청자 건너뛰기, 방 정리)
+"""
+import pytest
+
+from broadcast_rooms import BroadcastRooms
+
+
+def make_room(*viewers, ack_timeout=2.0):
+    rooms = BroadcastRooms(ack_timeout=ack_timeout)
+    room_id = rooms.create('presenter')
+    for viewer_sid in viewers:
+        rooms.join(room_id, viewer_sid)
+    return rooms, room_id
+
+
+def test_not_broadcasting_has_no_viewers():
+    rooms = BroadcastRooms()
+    
+    assert rooms.take_ready_viewers('presenter', now=0.0) == ([], 0)
+
+
+def test_unacked_viewer_is_skipped_until_ack():
+    rooms, _ = make_room('viewer-1', 'viewer-2')
+    
+    assert rooms.take_ready_viewers('presenter', now=0.0) == (['viewer-1', 'viewer-2'], 0)
+    rooms.ack('viewer-1')
+    
+    assert rooms.take_ready_viewers('presenter', now=0.1) == (['viewer-1'], 1)
+    assert rooms.take_ready_viewers('presenter', now=0.2) == ([], 2)
+
+
+def test_lost_ack_times_out():
+    rooms, _ = make_room('viewer-1', ack_timeout=2.0)
+    rooms.take_ready_viewers('presenter', now=0.0)
+    
+    assert rooms.take_ready_viewers('presenter', now=1.9) == ([], 1)
+    assert rooms.take_ready_viewers('presenter', now=2.0) == (['viewer-1'], 0)
+
+
+def test_presenter_leave_closes_room():
+    rooms, room_id = make_room('viewer-1', 'viewer-2')
+    
+    assert rooms.leave('presenter') == ('closed', room_id, ['viewer-1', 'viewer-2'])
+    assert rooms.leave('viewer-1') is None
+    assert rooms.take_ready_viewers('presenter', now=0.0) == ([], 0)
+
+
+def test_viewer_leave_reports_remaining():
+    rooms, room_id = make_room('viewer-1', 'viewer-2')
+    
+    assert rooms.leave('viewer-1') == ('left', room_id, ('presenter', 1))
+    assert rooms.take_ready_viewers('presenter', now=0.0) == (['viewer-2'], 0)
+
+
+def test_roles_are_exclusive():
+    rooms, room_id = make_room('viewer-1')
+    
+    with pytest.raises(ValueError):
+        rooms.join(room_id, 'presenter')
+    with pytest.raises(ValueError):
+        rooms.create('viewer-1')
+    with pytest.raises(ValueError):
+        rooms.join('missing', 'viewer-2')
@@ -0,0 +1,37 @@
+"""
+FrameMailbox 테스트 (최신 프레임 우선)
+"""
+from frame_mailbox import FrameMailbox
+
+
+def test_first_put_makes_caller_consumer():
+    mailbox = FrameMailbox()
+    
+    assert mailbox.put('frame-1') is True
+    assert mailbox.put('frame-2') is False
+
+
+def test_latest_frame_wins():
+    drops = []
+    mailbox = FrameMailbox(on_drop=lambda: drops.append(1))
+    mailbox.put('frame-1')
+    assert mailbox.take() == 'frame-1'
+    
+    # 처리 중에 도착한 프레임은 더 새 프레임으로 교체됨
+    mailbox.put('frame-2')
+    mailbox.put('frame-3')
+    mailbox.put('frame-4')
+    
+    assert mailbox.take() == 'frame-4'
+    assert mailbox.take() is None
+    assert mailbox.stats() == {'received': 4, 'dropped': 2}
+    assert len(drops) == 2
+
+
+def test_empty_take_ends_consumer_role():
+    mailbox = FrameMailbox()
+    mailbox.put('frame-1')
+    mailbox.take()
+    
+    assert mailbox.take() is None
+    assert mailbox.put('frame-2') is True
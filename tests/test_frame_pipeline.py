@@ -0,0 +1,130 @@
+"""
+frame_pipeline.process_frame 테스트
+- processed_frame 이벤트 데이터 (shape_name)
+- 축소 추론 해상도에서 구한 좌표가 원본 해상도 탐지 결과와 같은지 확인
+형태 감지기는 실제 ShapeDetector를, 손 감지기/비디오 오버레이는 가벼운 가짜 객체를 사용합니다.
+"""
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+import frame_pipeline
+from conftest import (
+    BIRD_POLYGON, DOG_POLYGON, REFERENCE_POLYGON, FakeHandDetector, FakeVideoOverlay, encode_jpeg,
+    shape_frame
+)
+from hand_detector import HandDetector
+from session_manager import PipelineSession
+from shape_detector import ShapeDetector
+
+
+class MarkerHands:
+    """
+    MediaPipe Hands 대역 - 빨간 표식의 중심을 정규화 좌표의 랜드마크 21개로 돌려줌
+    """
+    
+    def process(self, rgb_frame):
+        red = (rgb_frame[:, :, 0] > 200) & (rgb_frame[:, :, 1] < 80) & (rgb_frame[:, :, 2] < 80)
+        ys, xs = np.nonzero(red)
+        if len(xs) == 0:
+            return SimpleNamespace(multi_hand_landmarks=None)
+        height, width = rgb_frame.shape[:2]
+        point = SimpleNamespace(x=(xs.mean() + 0.5) / width, y=(ys.mean() + 0.5) / height, z=0.0)
+        return SimpleNamespace(multi_hand_landmarks=[SimpleNamespace(landmark=[point] * 21)])
+    
+    def close(self):
+        pass
+
+
+def marker_hand_detector():
+    # MediaPipe 그래프 없이 좌표 변환 경로만 사용
+    detector = HandDetector.__new__(HandDetector)
+    detector.hands = MarkerHands()
+    detector.reset()
+    return detector
+
+
+def make_session(reference_image, library_dir=None):
+    detector = ShapeDetector(reference_image, library_dir)
+    detector.instant_start_mode = False
+    detector.lock_count_enter = 1
+    session = PipelineSession('sid-1', detector, FakeHandDetector(), FakeVideoOverlay())
+    session.metadata_only = True
+    session.mirror_mode = False
+    return session
+
+
+def test_shape_name_reaches_processed_frame_payload(reference_image, library_dir):
+    session = make_session(reference_image, library_dir)
+    
+    dog = frame_pipeline.process_frame(session, encode_jpeg(shape_frame(DOG_POLYGON)))
+    bird = frame_pipeline.process_frame(session, encode_jpeg(shape_frame(BIRD_POLYGON)))
+    
+    assert dog['image'] is None
+    assert dog['detection']['found']
+    assert dog['detection']['shape_name'] == 'dog'
+    assert bird['detection']['shape_name'] == 'bird'
+
+
+def test_undecodable_frame_returns_none(reference_image):
+    session = make_session(reference_image)
+    
+    assert frame_pipeline.process_frame(session, b'not a jpeg') is None
+
+
+def large_frame():
+    """
+    2배 크기 참조 형태와 빨간 손 표식이 있는 1280x960 프레임
+    """
+    frame = shape_frame(REFERENCE_POLYGON * 2, offset=(420, 260), width=1280, height=960)
+    cv2.circle(frame, (1000, 300), 24, (0, 0, 255), -1)
+    return frame
+
+
+def test_downscaled_geometry_maps_to_full_resolution(reference_image):
+    frame = large_frame()
+    full = make_session(reference_image).shape_detector
+    downscaled = make_session(reference_image).shape_detector
+    small = frame_pipeline.downscale_for_inference(frame, 640, {})
+    
+    expected = full.detect_geometry(frame)
+    result = downscaled.detect_geometry(small, output_size=(1280, 960))
+    
+    assert small.shape[:2] == (480, 640)
+    assert expected['found'] and result['found']
+    assert result['center'] == pytest.approx(expected['center'], abs=3)
+    assert np.allclose(result['frame_corners'], expected['frame_corners'], atol=6)
+
+
+def test_downscaled_hands_map_to_full_resolution():
+    frame = large_frame()
+    small = frame_pipeline.downscale_for_inference(frame, 320, {})
+    
+    expected = marker_hand_detector().detect(frame)
+    result = marker_hand_detector().detect(small, output_size=(1280, 960))
+    
+    assert expected['hand_centers'] == [pytest.approx((1000, 300), abs=2)]
+    assert result['hand_centers'] == [pytest.approx(expected['hand_centers'][0], abs=2)]
+    assert result['index_finger_tips'] == [pytest.approx(expected['index_finger_tips'][0], abs=2)]
+
+
+@pytest.mark.parametrize('metadata_only', [False, True])
+def test_inference_width_does_not_move_payload_coordinates(reference_image, metadata_only):
+    image_bytes = encode_jpeg(large_frame())
+    sessions = []
+    for hand_width, shape_width in ((None, None), (320, 640)):
+        session = make_session(reference_image)
+        session.hand_detector = marker_hand_detector()
+        session.metadata_only = metadata_only
+        session.hand_inference_width = hand_width
+        session.shape_inference_width = shape_width
+        sessions.append(session)
+    
+    expected, result = (frame_pipeline.process_frame(session, image_bytes) for session in sessions)
+    
+    assert result['frame_size'] == expected['frame_size'] == [1280, 960]
+    assert result['detection']['found']
+    assert result['detection']['center'] == pytest.approx(expected['detection']['center'], abs=3)
+    assert result['hands']['index_tips'] == [pytest.approx(expected['hands']['index_tips'][0], abs=2)]
@@ -0,0 +1,65 @@
+"""
+이미지 페이로드 변환 테스트 (JPEG 헤더 크기 읽기, base64 Data URL 변환)
+"""
+import cv2
+import numpy as np
+import pytest
+
+from image_payload import decode_image_payload, encode_image_payload, jpeg_size
+
+
+def encode_jpeg(width, height, *params):
+    image = np.random.default_rng(0).integers(0, 256, (height, width, 3), np.uint8)
+    ok, buffer = cv2.imencode('.jpg', image, list(params))
+    assert ok
+    return buffer.tobytes()
+
+
+@pytest.mark.parametrize('width, height', [(640, 480), (1, 1), (1281, 719)])
+def test_jpeg_size_reads_sof(width, height):
+    assert jpeg_size(encode_jpeg(width, height)) == (width, height)
+
+
+def test_jpeg_size_progressive():
+    data = encode_jpeg(320, 240, cv2.IMWRITE_JPEG_PROGRESSIVE, 1)
+    
+    assert jpeg_size(data) == (320, 240)
+
+
+def test_jpeg_size_skips_fill_bytes():
+    data = encode_jpeg(64, 48)
+    # SOI 뒤 첫 마커 앞에 채움 바이트(0xFF) 삽입
+    padded = data[:2] + b'\xff\xff' + data[2:]
+    
+    assert jpeg_size(padded) == (64, 48)
+    assert jpeg_size(memoryview(padded)) == (64, 48)
+
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'\xff\xd8',
+    b'\x89PNG\r\n\x1a\n',
+    b'\xff\xd8\xff\xda\x00\x02',          # SOF 없이 영상 데이터 시작
+    b'\xff\xd8\xff\xc0\x00\x11\x08\x00',  # 잘린 SOF
+])
+def test_jpeg_size_rejects_invalid(data):
+    assert jpeg_size(data) is None
+
+
+def test_jpeg_size_truncated_after_sof_header():
+    data = encode_jpeg(64, 48)
+    sof = data.index(b'\xff\xc0')
+    
+    assert jpeg_size(data[:sof + 9]) == (64, 48)
+    assert jpeg_size(data[:sof + 8]) is None
+
+
+def test_payload_round_trip():
+    data = encode_jpeg(16, 16)
+    
+    assert encode_image_payload(data, True) is data
+    text = encode_image_payload(data, False)
+    assert text.startswith('data:image/jpeg;base64,')
+    assert decode_image_payload(text) == data
+    assert decode_image_payload(bytearray(data)) == data
+    assert decode_image_payload(None) is None
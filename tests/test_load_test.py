@@ -0,0 +1,29 @@
+"""
+부하 테스트 클라이언트 응답 매칭 테스트 (서버 연결 없이 이벤트 핸들러만 호출)
+"""
+from load_test import LoadClient
+
+
+def test_late_reply_is_not_counted_for_next_frame():
+    client = LoadClient(0, 'http://localhost:5000', [b''])
+    client._seq = 2
+    
+    client._on_processed_frame({'seq': 1})
+    assert not client._reply.is_set()
+    assert client.late_replies == 1
+    
+    client._on_processed_frame({'seq': 2})
+    assert client._reply.is_set()
+
+
+def test_error_matches_by_sequence_number():
+    client = LoadClient(0, 'http://localhost:5000', [b''])
+    client._seq = 5
+    
+    client._on_error({'message': '프레임 디코딩 실패', 'seq': 4})
+    assert not client._reply.is_set()
+    
+    # 번호 없는 오류(이전 서버, 초기화 전 등)는 현재 프레임의 응답으로 간주
+    client._on_error({'message': '시스템이 초기화되지 않았습니다.'})
+    assert client._reply.is_set()
+    assert client.errors == 2
@@ -0,0 +1,63 @@
+"""
+MetricsRegistry 테스트 (롤링 분위수, Prometheus 텍스트 형식)
+"""
+from metrics import MetricsRegistry, RollingStats
+
+
+def test_nearest_rank_quantiles():
+    stats = RollingStats(window=1000)
+    for value in range(1, 101):
+        stats.add(float(value))
+    
+    assert stats.quantiles() == {0.5: 50.0, 0.95: 95.0, 0.99: 99.0}
+    assert (stats.count, stats.total) == (100, 5050.0)
+
+
+def test_quantiles_use_recent_window_only():
+    stats = RollingStats(window=4)
+    for value in (100.0, 100.0, 1.0, 2.0, 3.0, 4.0):
+        stats.add(value)
+    
+    assert stats.quantiles((0.5, 1.0)) == {0.5: 2.0, 1.0: 4.0}
+    assert stats.count == 6
+    assert RollingStats(window=4).quantiles() == {}
+
+
+def test_single_sample():
+    stats = RollingStats(window=4)
+    stats.add(0.25)
+    
+    assert stats.quantiles() == {0.5: 0.25, 0.95: 0.25, 0.99: 0.25}
+
+
+def test_prometheus_text():
+    registry = MetricsRegistry()
+    registry.increment('frames_received', 3)
+    registry.increment('frames_processed')
+    registry.observe('sid-1', {'decode': 0.002, 'total': 0.01})
+    registry.observe('sid-1', {'decode': 0.004, 'total': 0.03})
+    
+    lines = registry.render_prometheus(gauges={'active_sessions': 1}).splitlines()
+    
+    assert '# TYPE shadow_puppet_frames_received_total counter' in lines
+    assert 'shadow_puppet_frames_received_total 3' in lines
+    assert 'shadow_puppet_frames_dropped_total 0' in lines
+    assert 'shadow_puppet_frames_processed_total 1' in lines
+    assert 'shadow_puppet_active_sessions 1' in lines
+    assert '# TYPE shadow_puppet_stage_seconds summary' in lines
+    assert 'shadow_puppet_stage_seconds{stage="decode",quantile="0.5"} 0.002000' in lines
+    assert 'shadow_puppet_stage_seconds{stage="total",quantile="0.99"} 0.030000' in lines
+    assert 'shadow_puppet_stage_seconds_sum{stage="total"} 0.040000' in lines
+    assert 'shadow_puppet_stage_seconds_count{stage="total"} 2' in lines
+    assert 'shadow_puppet_session_stage_seconds_count{session="sid-1",stage="decode"} 2' in lines
+
+
+def test_drop_session_removes_session_series():
+    registry = MetricsRegistry()
+    registry.observe('sid-1', {'total': 0.01})
+    
+    registry.drop_session('sid-1')
+    
+    snapshot = registry.snapshot()
+    assert snapshot['sessions'] == {}
+    assert snapshot['stages']['total']['count'] == 1
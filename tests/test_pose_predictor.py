@@ -0,0 +1,73 @@
+"""
+PosePredictor 테스트 (등속도 외삽, 각도 순환, 긴 공백 후 재시작)
+"""
+import pytest
+
+from pose_predictor import PosePredictor
+
+
+def feed(predictor, samples):
+    for timestamp, cx, cy, angle, scale in samples:
+        predictor.update(timestamp, cx, cy, angle, scale)
+
+
+def test_no_measurement_predicts_nothing():
+    assert PosePredictor().predict(1.0) is None
+
+
+def test_first_measurement_is_held():
+    predictor = PosePredictor()
+    predictor.update(0.0, 100.0, 50.0, 10.0, 1.2)
+    
+    assert predictor.predict(0.1) == pytest.approx((100.0, 50.0, 10.0, 1.2))
+
+
+def test_constant_velocity_is_extrapolated():
+    predictor = PosePredictor()
+    # 초당 x +300px, y -100px, 각도 +20도, 스케일 일정
+    feed(predictor, [(t / 30, 100 + 10 * t, 200 - t * 10 / 3, 2 * t / 3, 1.0) for t in range(30)])
+    last = 29 / 30
+    
+    cx, cy, angle, scale = predictor.predict(last + 0.1)
+    
+    assert cx == pytest.approx(100 + 300 * (last + 0.1), abs=1.0)
+    assert cy == pytest.approx(200 - 100 * (last + 0.1), abs=1.0)
+    assert angle == pytest.approx(20 * (last + 0.1), abs=0.5)
+    assert scale == pytest.approx(1.0, abs=1e-3)
+
+
+def test_lead_is_capped():
+    predictor = PosePredictor(max_lead=0.1)
+    feed(predictor, [(t / 30, 10.0 * t, 0.0, 0.0, 1.0) for t in range(30)])
+    
+    assert predictor.predict(29 / 30 + 5.0) == pytest.approx(predictor.predict(29 / 30 + 0.1))
+    # 마지막 측정보다 이전 시각은 외삽하지 않음
+    assert predictor.predict(0.0) == pytest.approx(predictor.predict(29 / 30))
+
+
+def test_angle_wraps_across_180():
+    predictor = PosePredictor()
+    # 175도에서 -175도로 넘어가는 +5도/프레임 회전
+    feed(predictor, [(t / 30, 0.0, 0.0, (170 + 5 * t + 180) % 360 - 180, 1.0) for t in range(6)])
+    
+    _, _, angle, _ = predictor.predict(5 / 30)
+    
+    assert (angle + 180) % 360 - 180 == pytest.approx(-165.0, abs=2.0)
+
+
+def test_long_gap_restarts_without_velocity():
+    predictor = PosePredictor(max_gap=0.5)
+    feed(predictor, [(t / 30, 10.0 * t, 0.0, 0.0, 1.0) for t in range(30)])
+    
+    predictor.update(2.0, 500.0, 80.0, 0.0, 2.0)
+    
+    assert predictor.predict(2.2) == pytest.approx((500.0, 80.0, 0.0, 2.0))
+
+
+def test_reset_forgets_state():
+    predictor = PosePredictor()
+    predictor.update(0.0, 1.0, 2.0, 3.0, 1.0)
+    
+    predictor.reset()
+    
+    assert predictor.predict(0.0) is None
@@ -0,0 +1,75 @@
+"""
+QualityController 테스트 (예산 초과 시 단계 낮춤, 여유가 더 오래 이어져야 단계 올림)
+"""
+from quality_controller import QUALITY_LEVELS, QualityController
+
+
+def make_controller():
+    # 목표 10 FPS → 프레임 예산 0.1초, 여유 기준 0.06초 미만
+    return QualityController(target_fps=10, smoothing=1.0, degrade_after=3, upgrade_after=5)
+
+
+def test_first_observation_announces_settings():
+    controller = make_controller()
+    
+    assert controller.observe_processing(0.08) == dict(QUALITY_LEVELS[0], level=0)
+    assert controller.observe_processing(0.08) is None
+
+
+def test_steps_down_after_consecutive_over_budget():
+    controller = make_controller()
+    controller.observe_processing(0.08)
+    
+    assert controller.observe_processing(0.2) is None
+    assert controller.observe_processing(0.2) is None
+    settings = controller.observe_processing(0.2)
+    
+    assert settings['level'] == 1
+    assert settings['capture_width'] == QUALITY_LEVELS[1]['capture_width']
+
+
+def test_in_band_cost_resets_streaks():
+    controller = make_controller()
+    controller.observe_processing(0.08)
+    
+    controller.observe_processing(0.2)
+    controller.observe_processing(0.2)
+    controller.observe_processing(0.08)   # 예산 안, 여유 기준 밖 → 연속 횟수 초기화
+    controller.observe_processing(0.2)
+    controller.observe_processing(0.2)
+    
+    assert controller.level == 0
+
+
+def test_steps_up_only_after_longer_headroom():
+    controller = make_controller()
+    controller.observe_processing(0.08)
+    for _ in range(3):
+        controller.observe_processing(0.2)
+    assert controller.level == 1
+    
+    results = [controller.observe_processing(0.01) for _ in range(5)]
+    
+    assert results[:4] == [None] * 4
+    assert results[4]['level'] == 0
+
+
+def test_round_trip_counts_toward_cost():
+    controller = make_controller()
+    controller.observe_round_trip(0.3)
+    for _ in range(4):
+        controller.observe_processing(0.01)
+    
+    assert controller.level == 1
+
+
+def test_level_is_clamped():
+    controller = make_controller()
+    for _ in range(100):
+        controller.observe_processing(1.0)
+    
+    assert controller.level == len(QUALITY_LEVELS) - 1
+    for _ in range(100):
+        controller.observe_processing(0.0)
+    
+    assert controller.level == 0
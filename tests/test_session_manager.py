@@ -0,0 +1,98 @@
+"""
+SessionManager 테스트 (연결 해제된 sid 재생성 거부, 유휴 제거 후 재생성)
+감지기 대신 가벼운 가짜 객체를 사용합니다.
+"""
+import pytest
+
+from session_manager import SessionManager
+
+
+class FakeDetector:
+    """
+    clone/reset/release만 있는 감지기 대역
+    """
+    
+    def __init__(self):
+        self.released = False
+    
+    def clone(self):
+        return FakeDetector()
+    
+    def reset(self):
+        pass
+    
+    def release(self):
+        self.released = True
+
+
+def make_manager(**kwargs):
+    return SessionManager(FakeDetector(), FakeDetector(), FakeDetector, **kwargs)
+
+
+def test_released_sid_is_not_recreated():
+    manager = make_manager()
+    manager.get('sid-1')
+    
+    assert manager.release('sid-1') is True
+    
+    with pytest.raises(RuntimeError):
+        manager.get('sid-1')
+    with pytest.raises(RuntimeError):
+        manager.control('sid-1', 'set_option', 'mirror_mode', False)
+    assert len(manager) == 0
+
+
+def test_release_before_first_use_blocks_creation():
+    manager = make_manager()
+    
+    assert manager.release('sid-1') is False
+    
+    with pytest.raises(RuntimeError):
+        manager.get('sid-1')
+
+
+def test_evicted_sid_can_come_back():
+    manager = make_manager(idle_timeout=10.0)
+    first = manager.get('sid-1')
+    
+    assert manager.evict_idle(now=first.last_active + 11.0) == ['sid-1']
+    
+    second = manager.get('sid-1')
+    assert second is not first
+    assert first.closed and not second.closed
+
+
+def test_released_history_is_bounded(monkeypatch):
+    monkeypatch.setattr(SessionManager, 'RELEASED_HISTORY', 2)
+    manager = make_manager()
+    
+    for sid in ('sid-1', 'sid-2', 'sid-3'):
+        manager.release(sid)
+    
+    # 가장 오래된 sid는 잊음 (Socket.IO sid는 재사용되지 않음)
+    assert manager.get('sid-1') is not None
+    with pytest.raises(RuntimeError):
+        manager.get('sid-3')
+
+
+def test_closed_session_retry_is_refused():
+    manager = make_manager()
+    stale = manager.get('sid-1')
+    manager.release('sid-1')
+    
+    # 잠금을 기다리던 요청이 닫힌 세션을 받은 뒤 재시도하는 경로
+    manager._sessions['sid-1'] = stale
+    calls = []
+    original_get = manager.get
+    
+    def get_once(sid):
+        calls.append(sid)
+        if len(calls) == 1:
+            return manager._sessions.pop(sid)
+        return original_get(sid)
+    
+    manager.get = get_once
+    with pytest.raises(RuntimeError):
+        with manager.session('sid-1'):
+            pass
+    assert calls == ['sid-1', 'sid-1']
@@ -0,0 +1,96 @@
+"""
+세션 녹화 테스트
+- .sprec 파일에 기록한 (타임스탬프, 이벤트, 데이터)를 read_recording으로 그대로 읽는지 확인
+- 녹화를 replay_benchmark.replay로 재생 (손 감지기/비디오 오버레이는 가짜 객체)
+"""
+import pytest
+
+import session_recorder
+from conftest import REFERENCE_POLYGON, FakeHandDetector, FakeVideoOverlay, encode_jpeg, shape_frame
+from replay_benchmark import replay
+from session_manager import SessionManager
+from session_recorder import SessionRecorder, read_recording
+from shape_detector import ShapeDetector
+from socket_events import SocketEvents
+
+
+def fake_clock(monkeypatch, *times):
+    ticks = iter(times)
+    monkeypatch.setattr(session_recorder.time, 'monotonic', lambda: next(ticks))
+
+
+def test_recording_round_trip(tmp_path, monkeypatch):
+    path = str(tmp_path / 'session.sprec')
+    fake_clock(monkeypatch, 100.0, 100.5, 101.0, 101.25, 102.0)
+    
+    recorder = SessionRecorder(path)
+    recorder.record_frame(b'\xff\xd8jpeg-1')
+    recorder.record_control('set_adjustment', {'brightness': 20, 'saturation': -10})
+    recorder.record_frame(bytearray(b'\xff\xd8jpeg-2'))
+    recorder.record_control('set_mirror_mode', {'enabled': False, 'label': '거울'})
+    recorder.close()
+    
+    assert list(read_recording(path)) == [
+        (0.5, 'video_frame', b'\xff\xd8jpeg-1'),
+        (1.0, 'set_adjustment', {'brightness': 20, 'saturation': -10}),
+        (1.25, 'video_frame', b'\xff\xd8jpeg-2'),
+        (2.0, 'set_mirror_mode', {'enabled': False, 'label': '거울'}),
+    ]
+
+
+def test_truncated_last_record_is_ignored(tmp_path):
+    path = str(tmp_path / 'session.sprec')
+    recorder = SessionRecorder(path)
+    recorder.record_frame(b'jpeg-1')
+    recorder.record_frame(b'jpeg-2')
+    recorder.close()
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:-3])
+    
+    assert [data for _, _, data in read_recording(path)] == [b'jpeg-1']
+
+
+def test_non_recording_file_is_rejected(tmp_path):
+    path = tmp_path / 'session.sprec'
+    path.write_bytes(b'not a recording')
+    
+    with pytest.raises(ValueError):
+        list(read_recording(str(path)))
+
+
+def make_events(reference_image, emitted, record_dir=None):
+    manager = SessionManager(ShapeDetector(reference_image), FakeVideoOverlay(), FakeHandDetector)
+    events = SocketEvents(
+        lambda: manager, lambda event, payload, to: emitted.append((event, payload)),
+        record_dir=record_dir
+    )
+    return manager, events
+
+
+def test_recorded_session_replays_through_socket_events(reference_image, tmp_path):
+    frame = encode_jpeg(shape_frame(REFERENCE_POLYGON))
+    record_dir = str(tmp_path / 'recordings')
+    live = []
+    _, events = make_events(reference_image, live, record_dir)
+    events.dispatch('sid-1', 'set_mirror_mode', {'enabled': False})
+    for _ in range(3):
+        events.dispatch('sid-1', 'video_frame', {'image': frame})
+    events.on_disconnect('sid-1')
+    
+    [path] = (tmp_path / 'recordings').iterdir()
+    records = list(read_recording(str(path)))
+    replayed = []
+    manager, events = make_events(reference_image, replayed)
+    
+    latencies = replay(records, manager, events, 'replay-0')
+    
+    assert [event for _, event, _ in records] == ['set_mirror_mode'] + ['video_frame'] * 3
+    assert len(latencies) == 3
+    assert [event for event, _ in replayed] == [event for event, _ in live if event != 'status']
+    frames = [payload for event, payload in replayed if event == 'processed_frame']
+    assert len(frames) == 3
+    assert all(payload['detection']['found'] for payload in frames)
+    # 재생이 끝나면 세션 해제
+    assert len(manager) == 0
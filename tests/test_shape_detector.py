@@ -0,0 +1,181 @@
+"""
+ShapeDetector 테스트
+- 해상도 변경: 화질 조절로 세션 중 캡처 해상도가 바뀌어도 좌표 상태가 같은 화면 위치를 가리키는지 확인
+- ROI 탐색 창, 피라미드 탐색 결과가 원래 해상도 탐색과 같은지 확인
+"""
+import cv2
+import numpy as np
+import pytest
+
+from conftest import REFERENCE_POLYGON
+from shape_detector import ShapeDetector
+
+
+def blank_frame(width, height):
+    return np.full((height, width, 3), 255, np.uint8)
+
+
+def shape_frame(offset, width=640, height=480):
+    """
+    흰 배경의 offset 위치에 참조 형태를 그린 프레임
+    """
+    frame = blank_frame(width, height)
+    cv2.fillPoly(frame, [REFERENCE_POLYGON + offset], (0, 0, 0))
+    return frame
+
+
+def locked_detector(reference_image):
+    """
+    첫 프레임에 바로 잠기고 광류 추적 없이 매 프레임 탐지하는 감지기
+    """
+    detector = ShapeDetector(reference_image)
+    detector.instant_start_mode = False
+    detector.flow_tracking = False
+    detector.lock_count_enter = 1
+    return detector
+
+
+def test_instant_start_follows_resolution_change(reference_image):
+    detector = ShapeDetector(reference_image)
+    first = detector.detect_geometry(blank_frame(640, 480))
+    
+    second = detector.detect_geometry(blank_frame(320, 240))
+    
+    assert first['center'] == (320, 240)
+    assert second['center'] == pytest.approx((160, 120))
+    assert second['scale'] == pytest.approx(first['scale'] / 2)
+    assert np.allclose(second['frame_corners'], np.asarray(first['frame_corners']) / 2)
+
+
+def test_resolution_change_rescales_drag_and_tracking_state(reference_image):
+    detector = ShapeDetector(reference_image)
+    detector.detect_geometry(blank_frame(640, 480))
+    detector.drag_offset_x, detector.drag_offset_y = 100.0, -60.0
+    detector.is_grabbed = True
+    detector.grab_hand_position = (300, 200)
+    detector._roi_box = (100, 100, 300, 300)
+    detector._flow = object()
+    
+    detector.detect_geometry(blank_frame(320, 240))
+    
+    assert (detector.drag_offset_x, detector.drag_offset_y) == pytest.approx((50.0, -30.0))
+    assert not detector.is_grabbed
+    assert detector._roi_box == pytest.approx((50, 50, 150, 150))
+    assert detector._flow is None
+    assert (detector.screen_width, detector.screen_height) == (320, 240)
+
+
+def test_same_resolution_keeps_state(reference_image):
+    detector = ShapeDetector(reference_image)
+    detector.detect_geometry(blank_frame(640, 480))
+    detector.drag_offset_x = 100.0
+    detector.is_grabbed = True
+    
+    detector.detect_geometry(blank_frame(640, 480))
+    
+    assert detector.drag_offset_x == 100.0
+    assert detector.is_grabbed
+
+
+def test_flow_image_only_computed_while_tracking(reference_image, monkeypatch):
+    detector = ShapeDetector(reference_image)
+    detector.instant_start_mode = False
+    calls = []
+    original = detector._flow_gray
+    monkeypatch.setattr(detector, '_flow_gray', lambda frame: calls.append(1) or original(frame))
+    
+    for _ in range(3):
+        detector.detect_geometry(blank_frame(640, 480))
+    
+    assert calls == []
+
+
+def test_prediction_uses_capture_time_and_downlink(reference_image):
+    detector = ShapeDetector(reference_image, motion_prediction=True)
+    detector.network_latency = 0.1
+    now = [0.0]
+    detector.clock = lambda: now[0]
+    
+    # 초당 x +100px로 움직이는 형태, 도착 후 서버에서 30ms 처리
+    for k in range(30):
+        captured = k / 30
+        detector._frame_time = captured + 0.05
+        now[0] = detector._frame_time + 0.03
+        result = detector._predicted_shape_info(
+            None, 0.1, detector.reference, 100 + 100 * captured, 200.0, 0.0, 1.0
+        )
+    
+    # 표시 시각 = 처리 완료 + 다운로드 50ms → 촬영 후 130ms
+    assert result['center'][0] == pytest.approx(100 + 100 * (29 / 30 + 0.13), abs=0.5)
+    assert detector.smoothed_cx == pytest.approx(100 + 100 * 29 / 30, abs=0.5)
+
+
+def test_drag_offset_accumulates_while_grabbed(reference_image):
+    detector = ShapeDetector(reference_image)
+    detector.drag_smoothing = 1.0
+    
+    for hand_x in (300, 310, 325):
+        detector.update_interaction({
+            'collision': True,
+            'collision_point': (hand_x, 200),
+            'rabbit_center': (320, 240)
+        })
+    
+    assert detector.is_grabbed
+    assert (detector.drag_offset_x, detector.drag_offset_y) == pytest.approx((25.0, 0.0))
+    
+    detector.update_interaction(None)
+    
+    assert not detector.is_grabbed
+    assert detector.drag_offset_x == pytest.approx(25.0)
+
+
+def test_roi_window_pads_contour_not_overlay_corners(reference_image):
+    detector = locked_detector(reference_image)
+    detector.detect_geometry(shape_frame((40, 20)))
+    
+    result = detector.detect_geometry(shape_frame((50, 30)))
+    
+    assert result['found']
+    x0, y0, x1, y1 = detector.last_search_window
+    # 형태 바운딩 박스(131x221) + 긴 변의 25% 여백 - 프레임의 1/3 미만
+    assert (x1 - x0) * (y1 - y0) < 640 * 480 / 3
+    assert x0 <= 50 + 60 and x1 >= 50 + 190 and y0 <= 30 + 20 and y1 >= 30 + 240
+
+
+def test_roi_miss_falls_back_to_full_frame(reference_image):
+    detector = locked_detector(reference_image)
+    detector.detect_geometry(shape_frame((40, 20)))
+    first = detector.detect_geometry(shape_frame((40, 20)))
+    
+    moved = detector.detect_geometry(shape_frame((400, 220)))
+    
+    assert detector.last_search_window is None
+    assert moved['found']
+    assert moved['contour'][:, 0, 0].min() >= 400
+    assert first['contour'][:, 0, 0].max() < 400
+
+
+@pytest.mark.parametrize('pyramid_levels', [1, 2])
+def test_pyramid_search_matches_full_resolution(reference_image, pyramid_levels, monkeypatch):
+    frame = shape_frame((230, 150))
+    # 다른 형태의 방해물 (축소 단계 후보가 여러 개가 되도록)
+    cv2.rectangle(frame, (30, 30), (130, 90), (0, 0, 0), -1)
+    cv2.circle(frame, (560, 400), 40, (0, 0, 0), -1)
+    full = locked_detector(reference_image)
+    pyramid = locked_detector(reference_image)
+    pyramid.pyramid_levels = pyramid_levels
+    expected = full.detect_geometry(frame)
+    
+    # 축소 단계를 실제로 거치는지 확인
+    pyr_down_calls = []
+    pyr_down = cv2.pyrDown
+    monkeypatch.setattr(cv2, 'pyrDown', lambda image: pyr_down_calls.append(image.shape) or pyr_down(image))
+    result = pyramid.detect_geometry(frame)
+    
+    assert len(pyr_down_calls) == pyramid_levels
+    assert expected['found'] and result['found']
+    assert result['center'] == pytest.approx(expected['center'], abs=3)
+    assert np.allclose(cv2.boundingRect(result['contour']), cv2.boundingRect(expected['contour']), atol=3)
+    expected_area = cv2.contourArea(expected['contour'])
+    assert cv2.contourArea(result['contour']) == pytest.approx(expected_area, rel=0.02)
@@ -0,0 +1,143 @@
+"""
+형태 라이브러리 테스트
+- 기술자 캐시 (.shape_cache 저장/재사용, 손상된 파일, 캐시 키 무효화)
+- 라이브러리 폴더 로드와 가장 가까운 참조 형태 선택 (shape_name)
+"""
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+import shape_library
+from conftest import BIRD_POLYGON, DOG_POLYGON, REFERENCE_POLYGON, shape_frame
+from shape_detector import ShapeDetector
+from shape_library import CACHE_DIRNAME, ShapeLibrary, cache_key, load_reference
+
+
+def cache_files(reference_image):
+    cache_dir = os.path.join(os.path.dirname(reference_image), CACHE_DIRNAME)
+    if not os.path.isdir(cache_dir):
+        return []
+    return sorted(os.listdir(cache_dir))
+
+
+def cache_path(reference_image):
+    with open(reference_image, 'rb') as f:
+        key = cache_key(f.read())
+    return os.path.join(os.path.dirname(reference_image), CACHE_DIRNAME, key + '.npy')
+
+
+def assert_same_descriptor(cached, fresh):
+    assert cached.name == fresh.name
+    assert np.array_equal(cached.contour, fresh.contour)
+    assert cached.bounding_box == fresh.bounding_box
+    assert dict(cached.moments) == pytest.approx(dict(fresh.moments))
+    assert np.allclose(cached.hu_moments, fresh.hu_moments)
+
+
+def test_cache_miss_writes_file(reference_image):
+    assert cache_files(reference_image) == []
+    
+    load_reference(reference_image)
+    
+    assert cache_files(reference_image) == [os.path.basename(cache_path(reference_image))]
+
+
+def test_cache_hit_matches_fresh_extraction(reference_image, monkeypatch):
+    load_reference(reference_image)
+    fresh = load_reference(reference_image, use_cache=False)
+    
+    # 캐시를 읽으면 이미지 디코딩/윤곽선 추출을 하지 않음
+    def fail(*args):
+        raise AssertionError('캐시 적중 시 이미지를 디코딩하면 안 됨')
+    monkeypatch.setattr(shape_library.cv2, 'imdecode', fail)
+    cached = load_reference(reference_image)
+    
+    assert_same_descriptor(cached, fresh)
+
+
+@pytest.mark.parametrize('damage', ['garbage', 'truncated', 'empty'])
+def test_corrupt_cache_falls_back_to_extraction(reference_image, damage):
+    fresh = load_reference(reference_image, use_cache=False)
+    load_reference(reference_image)
+    path = cache_path(reference_image)
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        if damage == 'garbage':
+            f.write(b'not a numpy file' * 8)
+        elif damage == 'truncated':
+            f.write(data[:len(data) // 2])
+    
+    descriptor = load_reference(reference_image)
+    
+    assert_same_descriptor(descriptor, fresh)
+    # 다시 추출한 기술자로 캐시를 복구
+    assert shape_library._read_cache(path) is not None
+
+
+def test_cache_key_changes_with_image_bytes(reference_image):
+    with open(reference_image, 'rb') as f:
+        image_bytes = f.read()
+    
+    assert cache_key(image_bytes) == cache_key(image_bytes)
+    assert cache_key(image_bytes) != cache_key(image_bytes + b'\0')
+
+
+def test_cache_key_changes_with_extraction_params(monkeypatch):
+    before = cache_key(b'image')
+    monkeypatch.setitem(shape_library.EXTRACTION_PARAMS, 'block_size', 13)
+    
+    assert cache_key(b'image') != before
+
+
+def test_cache_key_changes_with_opencv_version(monkeypatch):
+    before = cache_key(b'image')
+    monkeypatch.setattr(cv2, '__version__', cv2.__version__ + '-other')
+    
+    assert cache_key(b'image') != before
+
+
+def test_changed_image_is_extracted_again(reference_image):
+    load_reference(reference_image)
+    image = cv2.imread(reference_image)
+    cv2.rectangle(image, (0, 0), (10, 10), (255, 255, 255), -1)
+    image[0, 0] = (254, 254, 254)
+    cv2.imwrite(reference_image, image)
+    
+    load_reference(reference_image)
+    
+    assert len(cache_files(reference_image)) == 2
+
+
+def test_library_loads_primary_first_then_sorted_references(reference_image, library_dir):
+    library = ShapeLibrary.load(reference_image, library_dir)
+    
+    # 기본 형태와 이름이 같은 파일, 윤곽선 없는 이미지, 이미지가 아닌 파일은 건너뜀
+    assert library.names == ['rabbit', 'bird', 'dog']
+    assert library.primary.name == 'rabbit'
+    assert library.hu_moments.shape == (3, 7)
+
+
+def test_library_without_directory_has_only_primary(reference_image):
+    library = ShapeLibrary.load(reference_image)
+    
+    assert library.names == ['rabbit']
+
+
+@pytest.mark.parametrize('polygon, expected', [
+    (REFERENCE_POLYGON, 'rabbit'),
+    (DOG_POLYGON, 'dog'),
+    (BIRD_POLYGON, 'bird'),
+])
+def test_closest_reference_wins(reference_image, library_dir, polygon, expected):
+    detector = ShapeDetector(reference_image, library_dir)
+    detector.instant_start_mode = False
+    detector.lock_count_enter = 1
+    
+    result = detector.detect_geometry(shape_frame(polygon))
+    
+    assert result['found']
+    assert result['shape_name'] == expected
+    assert result['score'] < detector.threshold_enter
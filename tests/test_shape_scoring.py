@@ -0,0 +1,87 @@
+"""
+윤곽선 일괄 점수 계산 테스트
+배열 연산 결과가 OpenCV 함수(cv2.matchShapes, cv2.boundingRect, cv2.contourArea)와
+같은 값인지 확인합니다.
+"""
+import cv2
+import numpy as np
+import pytest
+
+from conftest import REFERENCE_POLYGON
+from shape_scoring import bounding_sizes, contour_moments, i3_distances, score_contours
+
+
+def sample_contours():
+    """
+    크기/회전/형태가 다양한 윤곽선 (참조 형태 변형, 타원, 사각형, 삼각형)
+    """
+    contours = []
+    for scale, angle in ((0.5, 0), (1.0, 30), (1.7, 115), (2.3, 250)):
+        rotation = cv2.getRotationMatrix2D((0, 0), angle, scale)
+        points = cv2.transform(REFERENCE_POLYGON.reshape(-1, 1, 2).astype(np.float64), rotation)
+        contours.append(np.round(points + 400).astype(np.int32))
+    for axes, angle in (((80, 40), 0), ((30, 30), 0), ((120, 20), 45)):
+        contours.append(cv2.ellipse2Poly((300, 300), axes, angle, 0, 360, 5).reshape(-1, 1, 2))
+    contours.append(np.array([[[10, 10]], [[210, 10]], [[210, 110]], [[10, 110]]], np.int32))
+    contours.append(np.array([[[0, 0]], [[150, 20]], [[40, 130]]], np.int32))
+    return contours
+
+
+def test_i3_matches_opencv():
+    reference = REFERENCE_POLYGON.reshape(-1, 1, 2)
+    contours = sample_contours()
+    reference_hu = cv2.HuMoments(cv2.moments(reference)).ravel()
+    _, hu = contour_moments(contours)
+    
+    distances = i3_distances(reference_hu, hu)
+    
+    expected = [cv2.matchShapes(reference, contour, cv2.CONTOURS_MATCH_I3, 0) for contour in contours]
+    assert distances == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+
+def test_i3_multiple_references():
+    contours = sample_contours()
+    _, hu = contour_moments(contours)
+    
+    distances = i3_distances(hu[:3], hu)
+    
+    assert distances.shape == (len(contours), 3)
+    for column in range(3):
+        assert distances[:, column] == pytest.approx(i3_distances(hu[column], hu))
+    assert np.diagonal(distances[:3]) == pytest.approx(0.0)
+
+
+def test_bounding_sizes_match_opencv():
+    contours = sample_contours()
+    
+    widths, heights = bounding_sizes(contours)
+    
+    expected = [cv2.boundingRect(contour)[2:] for contour in contours]
+    assert list(zip(widths, heights)) == expected
+
+
+def test_score_contours_filters_like_opencv():
+    reference_hu = cv2.HuMoments(cv2.moments(REFERENCE_POLYGON)).ravel()
+    contours = sample_contours() + [np.array([[[5, 5]], [[6, 6]]], np.int32)]
+    min_area, max_area = 2000, 60000
+    
+    indices, distances = score_contours(contours, reference_hu, min_area, max_area)
+    
+    expected = []
+    for index, contour in enumerate(contours):
+        if len(contour) < 3:
+            continue
+        _, _, width, height = cv2.boundingRect(contour)
+        area = cv2.contourArea(contour)
+        if 0.5 <= width / height <= 2.0 and min_area <= area <= max_area:
+            expected.append(index)
+    assert list(indices) == expected
+    assert distances == pytest.approx(i3_distances(reference_hu, contour_moments(
+        [contours[index] for index in expected])[1]))
+
+
+def test_score_contours_empty():
+    indices, distances = score_contours([], np.ones(7), 0, 1)
+    
+    assert len(indices) == 0
+    assert distances.shape == (0,)
@@ -0,0 +1,249 @@
+"""
+SocketEvents 오류 경로 테스트
+엔진(SessionManager/WorkerPool) 대신 가짜 엔진을 사용하여 핸들러가 예외를 삼키고
+클라이언트에 error 이벤트를 보내는지 확인합니다.
+"""
+import pytest
+
+from socket_events import SocketEvents
+
+
+class FailingEngine:
+    """
+    모든 제어 호출이 실패하는 엔진
+    """
+    
+    def control(self, sid, method, *args):
+        raise RuntimeError(f'{method} 실패')
+    
+    def release(self, sid, blocking=True):
+        return False
+
+
+def make_events(engine):
+    """
+    emit 호출을 기록하는 SocketEvents 생성
+    
+    Returns:
+        tuple: (SocketEvents, [(event, payload, to), ...])
+    """
+    emitted = []
+    events = SocketEvents(lambda: engine, lambda event, payload, to=None: emitted.append((event, payload, to)))
+    return events, emitted
+
+
+CONTROL_EVENTS = [
+    ('set_response_mode', {'mode': 'metadata'}),
+    ('set_adjustment', {'brightness': 10, 'saturation': 0}),
+    ('set_thresholds', {'threshold_enter': 0.3, 'threshold_exit': 0.5}),
+    ('set_white_background', {'enabled': True}),
+    ('set_mirror_mode', {'enabled': False}),
+    ('set_inference_resolution', {'hand_width': 320, 'shape_width': 320}),
+]
+
+
+@pytest.mark.parametrize('event, data', CONTROL_EVENTS)
+def test_control_failure_emits_error(event, data):
+    events, emitted = make_events(FailingEngine())
+    
+    events.dispatch('sid-1', event, data)
+    
+    assert [(name, to) for name, _, to in emitted] == [('error', 'sid-1')]
+    assert '실패' in emitted[0][1]['message']
+
+
+@pytest.mark.parametrize('event', [name for name, _ in CONTROL_EVENTS])
+def test_control_bad_payload_emits_error(event):
+    events, emitted = make_events(FailingEngine())
+    
+    events.dispatch('sid-1', event, None)
+    
+    assert [name for name, _, _ in emitted] == ['error']
+
+
+class RecordingEngine:
+    """
+    제어 호출을 기록하고 고정된 결과 이미지를 돌려주는 엔진
+    """
+    
+    def __init__(self):
+        self.calls = []
+    
+    def control(self, sid, method, *args):
+        self.calls.append((sid, method, args))
+    
+    def process_frame(self, sid, image_bytes, display_latency=None, timestamp=None):
+        return {'image': b'\xff\xd8result', 'shape_info': None}
+    
+    def release(self, sid, blocking=True):
+        return True
+
+
+def test_set_transport_without_engine():
+    events, emitted = make_events(None)
+    
+    events.dispatch('sid-1', 'set_transport', {'binary': True})
+    
+    assert emitted == [('transport_updated', {'binary': True}, 'sid-1')]
+    assert events.binary_transports == {'sid-1': True}
+
+
+def test_set_transport_does_not_touch_pipeline():
+    engine = RecordingEngine()
+    events, _ = make_events(engine)
+    
+    events.dispatch('viewer', 'set_transport', {'binary': True})
+    
+    assert engine.calls == []
+
+
+@pytest.mark.parametrize('binary, expected', [
+    (True, b'\xff\xd8result'),
+    (False, 'data:image/jpeg;base64,/9hyZXN1bHQ='),
+])
+def test_processed_frame_uses_negotiated_transport(binary, expected):
+    events, emitted = make_events(RecordingEngine())
+    events.dispatch('sid-1', 'set_transport', {'binary': binary})
+    emitted.clear()
+    
+    events.dispatch('sid-1', 'video_frame', {'image': b'\xff\xd8frame'})
+    
+    assert [name for name, _, _ in emitted] == ['processed_frame']
+    assert emitted[0][1]['image'] == expected
+
+
+def test_disconnect_forgets_transport():
+    events, _ = make_events(RecordingEngine())
+    events.dispatch('sid-1', 'set_transport', {'binary': True})
+    
+    events.on_disconnect('sid-1')
+    
+    assert 'sid-1' not in events.binary_transports
+
+
+@pytest.mark.parametrize('data', [None, 'frame', [b'\xff\xd8']])
+def test_video_frame_bad_payload_emits_error(data):
+    events, emitted = make_events(RecordingEngine())
+    
+    events.dispatch('sid-1', 'video_frame', data)
+    
+    assert [(name, to) for name, _, to in emitted] == [('error', 'sid-1')]
+    assert emitted[0][1]['message'].startswith('프레임 처리 오류')
+
+
+def test_video_frame_without_engine_emits_error():
+    events, emitted = make_events(None)
+    
+    events.dispatch('sid-1', 'video_frame', {'image': b'\xff\xd8frame'})
+    
+    assert emitted == [('error', {'message': '시스템이 초기화되지 않았습니다.'}, 'sid-1')]
+
+
+def test_broadcast_skips_viewer_until_ack():
+    events, emitted = make_events(RecordingEngine())
+    events.dispatch('presenter', 'create_broadcast')
+    room = emitted[-1][1]['room']
+    events.dispatch('viewer', 'join_broadcast', {'room': room})
+    emitted.clear()
+    
+    events.dispatch('presenter', 'video_frame', {'image': b'\xff\xd8frame'})
+    events.dispatch('presenter', 'video_frame', {'image': b'\xff\xd8frame'})
+    events.dispatch('viewer', 'broadcast_ack')
+    events.dispatch('presenter', 'video_frame', {'image': b'\xff\xd8frame'})
+    
+    assert [to for name, _, to in emitted if name == 'processed_frame'] == [
+        ['presenter', 'viewer'], 'presenter', ['presenter', 'viewer']
+    ]
+
+
+def test_disconnect_while_processing_drops_pending_frames():
+    engine = RecordingEngine()
+    events, _ = make_events(engine)
+    processed = []
+    
+    def process_frame(sid, image_bytes, display_latency=None, timestamp=None):
+        processed.append(image_bytes)
+        if len(processed) == 1:
+            # 처리 중에 새 프레임이 도착한 뒤 연결 해제
+            assert events.accept_frame(sid, {'image': b'\xff\xd8second'}) is None
+            events.on_disconnect(sid)
+        return {'image': None}
+    
+    engine.process_frame = process_frame
+    events.dispatch('sid-1', 'video_frame', {'image': b'\xff\xd8first'})
+    
+    assert processed == [b'\xff\xd8first']
+
+
+def test_frame_timestamp_and_network_latency_reach_engine():
+    engine = RecordingEngine()
+    events, _ = make_events(engine)
+    ticks = iter([10.0, 10.05, 11.0, 11.02])
+    events.clock = lambda: next(ticks)
+    received = []
+    
+    def process_frame(sid, image_bytes, network_latency=None, timestamp=None):
+        received.append((network_latency, timestamp))
+        return {'image': None}
+    
+    engine.process_frame = process_frame
+    events.dispatch('sid-1', 'video_frame', {'image': b'\xff\xd8first'})
+    # 보고된 왕복 시간 150ms 중 서버에 머문 50ms를 빼면 네트워크 구간은 100ms
+    events.dispatch('sid-1', 'video_frame', {'image': b'\xff\xd8second', 'rtt': 150})
+    
+    assert received[0] == (None, 10.0)
+    assert received[1][0] == pytest.approx(0.1)
+    assert received[1][1] == 11.0
+
+
+def test_frame_sequence_number_is_echoed():
+    events, emitted = make_events(RecordingEngine())
+    
+    events.dispatch('sid-1', 'video_frame', {'image': b'\xff\xd8frame', 'seq': 7})
+    
+    assert emitted[0][0] == 'processed_frame'
+    assert emitted[0][1]['seq'] == 7
+
+
+def test_frame_error_carries_sequence_number():
+    engine = RecordingEngine()
+    engine.process_frame = lambda *args: None
+    events, emitted = make_events(engine)
+    
+    events.dispatch('sid-1', 'video_frame', {'image': b'\xff\xd8frame', 'seq': 8})
+    
+    assert emitted == [('error', {'message': '프레임 디코딩 실패', 'seq': 8}, 'sid-1')]
+
+
+def test_idle_eviction_keeps_connection_state_and_asks_for_settings():
+    engine = RecordingEngine()
+    engine.evict_idle = lambda: ['presenter']
+    emitted = []
+    events = SocketEvents(lambda: engine, lambda event, payload, to=None: emitted.append((event, payload, to)),
+                          target_fps=15)
+    events.dispatch('presenter', 'set_transport', {'binary': True})
+    events.dispatch('presenter', 'create_broadcast')
+    room = emitted[-1][1]['room']
+    events.dispatch('viewer', 'join_broadcast', {'room': room})
+    events.dispatch('presenter', 'video_frame', {'image': b'\xff\xd8frame'})
+    events.quality_controllers['presenter'].level = 2
+    emitted.clear()
+    
+    events.reap_idle_sessions()
+    
+    assert [(name, to) for name, _, to in emitted] == [
+        ('quality_settings', 'presenter'), ('session_reset', 'presenter')
+    ]
+    assert emitted[0][1]['level'] == 0
+    
+    # 클라이언트는 연결된 상태로 다음 프레임을 보냄 - 전송 방식과 방송 방은 그대로
+    emitted.clear()
+    events.dispatch('presenter', 'set_mirror_mode', {'enabled': False})
+    events.dispatch('viewer', 'broadcast_ack')
+    events.dispatch('presenter', 'video_frame', {'image': b'\xff\xd8frame'})
+    
+    frames = [(payload, to) for name, payload, to in emitted if name == 'processed_frame']
+    assert frames[0][0]['image'] == b'\xff\xd8result'
+    assert frames[0][1] == ['presenter', 'viewer']
+    assert ('presenter', 'set_option', ('mirror_mode', False)) in engine.calls
+    assert events.binary_transports == {'presenter': True}
@@ -0,0 +1,53 @@
+"""
+VideoOverlay 테스트 (비디오 프레임은 오버레이를 그릴 때만 세션별로 디코딩)
+"""
+import cv2
+import numpy as np
+import pytest
+
+from video_overlay import VideoOverlay
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    """
+    단색 프레임 3장짜리 작은 비디오 파일 경로
+    """
+    path = str(tmp_path / 'overlay.avi')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (32, 24))
+    for level in (50, 100, 150):
+        writer.write(np.full((24, 32, 3), level, np.uint8))
+    writer.release()
+    return path
+
+
+def test_frames_are_not_decoded_until_overlay_is_drawn(video_path):
+    template = VideoOverlay(video_path)
+    overlay = template.clone()
+    overlay.reset()
+    
+    assert (template.video_width, template.video_height) == (32, 24)
+    assert template.total_frames == 3
+    assert template.video_capture is None
+    assert overlay.video_capture is None
+    assert overlay.current_video_frame is None
+
+
+def test_overlay_streams_frames_and_loops(video_path):
+    overlay = VideoOverlay(video_path).clone()
+    base = np.full((48, 64, 3), 255, np.uint8)
+    corners = [[0, 0], [63, 0], [63, 47], [0, 47]]
+    
+    result = overlay.overlay(base, corners)
+    
+    assert overlay.video_capture is not None
+    assert result.shape == base.shape
+    assert result.mean() < 255
+    
+    for _ in range(5):
+        overlay.overlay(base, corners)
+    assert 1 <= overlay.current_frame_idx <= overlay.total_frames
+    
+    overlay.release()
+    assert overlay.video_capture is None
+    assert overlay.overlay(base, corners).shape == base.shape
@@ -0,0 +1,77 @@
+"""
+WorkerPool 테스트 (워커 프로세스가 종료되면 대기 중인 요청을 바로 실패시키고 재시작)
+MediaPipe 대신 프로세스 ID만 돌려주는 가벼운 워커를 사용합니다.
+"""
+import os
+import time
+
+import pytest
+
+from worker_pool import WorkerPool
+
+
+def fake_worker_main(task_queue, result_conn, worker_index, *config):
+    """
+    process_frame에 (워커 인덱스, PID)를 돌려주고 'crash' 제어 요청에 비정상 종료하는 워커
+    """
+    result_conn.send((None, True, worker_index))
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        request_id, op, sid, args = task
+        if op == 'control' and args[0] == 'crash':
+            os._exit(1)
+        result_conn.send((request_id, True, (worker_index, os.getpid())))
+
+
+class FakeWorkerPool(WorkerPool):
+    worker_main = staticmethod(fake_worker_main)
+
+
+@pytest.fixture
+def pool():
+    pool = FakeWorkerPool(2, 'reference.png', 'video.mov', request_timeout=10.0)
+    pool.start(timeout=30.0)
+    yield pool
+    pool.shutdown()
+
+
+def test_dead_worker_fails_fast_and_sessions_move_to_respawned_worker(pool):
+    index, pid = pool.process_frame('sid-1', b'jpeg')
+    pool.process_frame('sid-2', b'jpeg')
+    
+    started = time.monotonic()
+    with pytest.raises(RuntimeError):
+        pool.control('sid-1', 'crash')
+    
+    # request_timeout(10초)까지 기다리지 않고 실패
+    assert time.monotonic() - started < 5.0
+    assert 'sid-1' not in pool._assignments
+    
+    new_index, new_pid = pool.process_frame('sid-1', b'jpeg')
+    
+    assert new_pid != pid
+    assert pool._processes[index].is_alive()
+    assert not pool._pending
+
+
+def test_dead_worker_is_respawned_before_submit(pool):
+    index, pid = pool.process_frame('sid-1', b'jpeg')
+    pool._processes[index].kill()
+    pool._processes[index].join(timeout=5)
+    
+    new_index, new_pid = pool.process_frame('sid-1', b'jpeg')
+    
+    assert new_pid != pid
+    assert pool._processes[index].pid != pid
+
+
+def test_check_workers_respawns_idle_dead_worker(pool):
+    process = pool._processes[0]
+    process.kill()
+    process.join(timeout=5)
+    
+    assert pool.check_workers() == [0]
+    assert pool._processes[0] is not process
+    assert pool.check_workers() == []
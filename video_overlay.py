@@ -5,6 +5,10 @@
 import cv2
 import numpy as np
 
+from event_log import get_logger
+
+log = get_logger('video_overlay')
+
 
 class VideoOverlay:
     """
@@ -21,38 +25,66 @@ class VideoOverlay:
             video_path: 오버레이할 비디오 파일 경로
         """
         self.video_path = video_path
-        self.video_capture = cv2.VideoCapture(video_path)
+        video_capture = cv2.VideoCapture(video_path)
         
-        if not self.video_capture.isOpened():
+        if not video_capture.isOpened():
             raise ValueError(f"비디오 파일을 열 수 없습니다: {video_path}")
         
-        # 비디오 정보
-        self.video_width = int(self.video_capture.get(cv2.CAP_PROP_FRAME_WIDTH))
-        self.video_height = int(self.video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        self.fps = self.video_capture.get(cv2.CAP_PROP_FPS)
-        self.total_frames = int(self.video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        # 비디오 정보 (헤더만 읽음 - 프레임은 오버레이를 그릴 때 세션별로 스트리밍 디코딩)
+        self.video_width = int(video_capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.video_height = int(video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = video_capture.get(cv2.CAP_PROP_FPS)
+        self.total_frames = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        video_capture.release()
+        
+        self._init_state()
+    
+    def clone(self):
+        """
+        비디오 정보를 공유하는 새 오버레이 생성 (세션별 인스턴스용)
         
+        Returns:
+            VideoOverlay: 재생 위치/반전 상태가 초기화된 새 오버레이
+        """
+        overlay = VideoOverlay.__new__(VideoOverlay)
+        overlay.video_path = self.video_path
+        overlay.video_width = self.video_width
+        overlay.video_height = self.video_height
+        overlay.fps = self.fps
+        overlay.total_frames = self.total_frames
+        overlay._init_state()
+        return overlay
+    
+    def _init_state(self):
+        """
+        세션별 재생 상태 초기화
+        """
         self.current_frame_idx = 0
         self.current_video_frame = None
         
+        # 비디오 캡처는 첫 overlay 호출 때 연다 (오버레이를 쓰지 않으면 디코딩하지 않음)
+        self.video_capture = None
+        
         # 좌우 반전 상태
         self.is_flipped = False
-        
-        # 첫 프레임 로드
-        self._read_next_frame()
     
     def toggle_flip(self):
         """
         좌우 반전 토글
         """
         self.is_flipped = not self.is_flipped
-        flip_status = "반전됨" if self.is_flipped else "원본"
-        print(f"🔄 비디오 좌우 반전: {flip_status}")
+        log.info('video_flip', '비디오 좌우 반전', flipped=self.is_flipped)
     
     def _read_next_frame(self):
         """
         다음 비디오 프레임 읽기
         """
+        if self.video_capture is None:
+            self.video_capture = cv2.VideoCapture(self.video_path)
+            if not self.video_capture.isOpened():
+                self.video_capture = None
+                return False
+        
         ret, frame = self.video_capture.read()
         
         if not ret:
@@ -79,7 +111,8 @@ class VideoOverlay:
         Returns:
             오버레이된 프레임
         """
-        if self.current_video_frame is None:
+        # 첫 호출이면 비디오를 열고 첫 프레임 로드
+        if self.current_video_frame is None and not self._read_next_frame():
             return base_frame
         
         # 다음 프레임 읽기
@@ -157,6 +190,11 @@ class VideoOverlay:
             frame_idx: 프레임 인덱스
         """
         frame_idx = max(0, min(frame_idx, self.total_frames - 1))
+        if self.video_capture is None:
+            # 아직 비디오를 열지 않음 - 첫 overlay 호출 때 처음부터 재생
+            self.current_frame_idx = 0
+            self.current_video_frame = None
+            return
         self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
         self.current_frame_idx = frame_idx
         self._read_next_frame()
@@ -174,10 +212,4 @@ class VideoOverlay:
         if self.video_capture is not None:
             self.video_capture.release()
             self.video_capture = None
-    
-    def __del__(self):
-        """
-        소멸자
-        """
-        self.release()
-
+        self.current_video_frame = None
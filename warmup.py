@@ -0,0 +1,91 @@
+"""
+워밍업 상태 모듈
+서버 시작 후 백그라운드에서 진행되는 감지기 초기화(모듈 로드, MediaPipe 그래프 생성,
+첫 추론)의 진행 상황을 보관하고 변경 시 알립니다.
+"""
+import threading
+
+from event_log import get_logger
+
+log = get_logger('warmup')
+
+
+class WarmupStatus:
+    """
+    워밍업 진행 상태
+    - state: 'pending' (시작 전) | 'loading' (진행 중) | 'ready' (완료) | 'failed' (실패)
+    - progress: 0.0 ~ 1.0
+    - 상태가 바뀔 때마다 등록된 리스너에 snapshot()을 전달
+    """
+    
+    def __init__(self):
+        """
+        초기화
+        """
+        self.state = 'pending'
+        self.progress = 0.0
+        self.message = '초기화 대기 중'
+        self._listeners = []
+        self._lock = threading.Lock()
+    
+    def add_listener(self, listener):
+        """
+        상태 변경 리스너 등록
+        
+        Args:
+            listener: listener(snapshot) 형태의 함수
+        """
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+    
+    def update(self, progress, message):
+        """
+        진행 상황 갱신
+        
+        Args:
+            progress: 진행률 (0.0 ~ 1.0)
+            message: 현재 단계 설명
+        """
+        self._set('loading', progress, message)
+    
+    def finish(self, success, message):
+        """
+        워밍업 종료
+        
+        Args:
+            success: 성공 여부
+            message: 결과 설명
+        """
+        self._set('ready' if success else 'failed', 1.0 if success else self.progress, message)
+    
+    def _set(self, state, progress, message):
+        """
+        상태 변경 후 리스너 호출
+        """
+        with self._lock:
+            self.state = state
+            self.progress = progress
+            self.message = message
+            listeners = list(self._listeners)
+        
+        snapshot = self.snapshot()
+        for listener in listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                log.error('warmup_listener_error', '워밍업 상태 알림 오류', error=str(e))
+    
+    def snapshot(self):
+        """
+        현재 상태
+        
+        Returns:
+            dict: {'state': str, 'progress': float, 'message': str}
+        """
+        with self._lock:
+            return {
+                'state': self.state,
+                'progress': round(self.progress, 2),
+                'message': self.message
+            }
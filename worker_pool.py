@@ -0,0 +1,481 @@
+"""
+워커 프로세스 풀 모듈
+세션별 프레임 처리를 전용 워커 프로세스로 보내 여러 CPU 코어를 사용합니다.
+"""
+import itertools
+import multiprocessing
+import multiprocessing.connection
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+import event_log
+
+log = event_log.get_logger('worker_pool')
+
+
+def _worker_main(task_queue, result_conn, worker_index, reference_image_path, video_path,
+                 library_dir, pyramid_levels, motion_prediction, max_pool_size):
+    """
+    워커 프로세스 진입점
+    
+    워커마다 자체 SessionManager를 두고, 배정된 세션의 감지기 상태를 보관합니다.
+    작업은 (request_id, op, sid, args) 튜플로 받아 순서대로 처리하고,
+    결과는 이 워커 전용 파이프(result_conn)로 보냅니다.
+    """
+    # 워커의 로그도 큐를 거쳐 출력 (최근 이벤트 링 버퍼는 메인 프로세스에만 둠)
+    event_log.setup_logging(os.environ.get('SHADOW_PUPPET_LOG_LEVEL', 'INFO').upper(), ring_size=0)
+    
+    # 무거운 모듈은 워커 프로세스에서만 임포트
+    from shape_detector import ShapeDetector
+    from video_overlay import VideoOverlay
+    from hand_detector import HandDetector
+    from session_manager import SessionManager
+    
+    try:
+        hand_detector = HandDetector()
+        # 세션이 자기 워커에 고정되므로 유휴 제거는 메인 프로세스가 release로 지시
+        manager = SessionManager(
+            ShapeDetector(reference_image_path, library_dir, pyramid_levels, motion_prediction),
+            VideoOverlay(video_path),
+            HandDetector,
+            idle_timeout=float('inf'),
+            max_pool_size=max_pool_size
+        )
+        manager.add_to_pool(hand_detector)
+    except Exception as e:
+        result_conn.send((None, False, f"워커 {worker_index} 초기화 오류: {e}"))
+        return
+    
+    result_conn.send((None, True, worker_index))
+    
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        
+        request_id, op, sid, args = task
+        try:
+            if op == 'process_frame':
+                result = manager.process_frame(sid, *args)
+            elif op == 'control':
+                result = manager.control(sid, *args)
+            elif op == 'release':
+                result = manager.release(sid)
+            elif op == 'evict':
+                result = manager.evict(sid)
+            else:
+                raise ValueError(f"알 수 없는 작업: {op}")
+            result_conn.send((request_id, True, result))
+        except Exception as e:
+            result_conn.send((request_id, False, str(e)))
+
+
+class WorkerPool:
+    """
+    세션 고정(affinity) 워커 프로세스 풀
+    - 세션은 처음 사용될 때 가장 한가한 워커에 배정되고 이후 같은 워커에서만 처리
+    - 감지기 상태(히스테리시스, 드래그, 핀치 등)는 해당 워커 안에만 존재
+    - SessionManager와 같은 인터페이스(process_frame / control / release / evict_idle)
+    """
+    
+    # 기억할 연결 해제 sid 최대 개수 (SessionManager.RELEASED_HISTORY와 같은 값)
+    RELEASED_HISTORY = 4096
+    
+    # 응답을 기다리는 동안 워커 생존 여부를 확인하는 간격 (초)
+    LIVENESS_INTERVAL = 0.5
+    
+    # 워커 프로세스 진입점 (테스트에서 가벼운 워커로 교체)
+    worker_main = staticmethod(_worker_main)
+    
+    def __init__(self, num_workers, reference_image_path, video_path, library_dir=None,
+                 pyramid_levels=0, motion_prediction=False, idle_timeout=300.0, max_pool_size=4,
+                 request_timeout=10.0):
+        """
+        초기화
+        
+        Args:
+            num_workers: 워커 프로세스 수
+            reference_image_path: 참조 이미지 경로
+            video_path: 오버레이 비디오 경로
+            library_dir: 형태 라이브러리 폴더 (선택적)
+            pyramid_levels: 윤곽선 탐색 피라미드 단계 (0이면 끔)
+            motion_prediction: 지연 보상 자세 예측 사용 여부
+            idle_timeout: 유휴 세션 제거 시간 (초)
+            max_pool_size: 워커별 HandDetector 풀 크기
+            request_timeout: 워커 응답 대기 시간 (초)
+        """
+        self.num_workers = num_workers
+        self.reference_image_path = reference_image_path
+        self.video_path = video_path
+        self.library_dir = library_dir
+        self.pyramid_levels = pyramid_levels
+        self.motion_prediction = motion_prediction
+        self.idle_timeout = idle_timeout
+        self.max_pool_size = max_pool_size
+        self.request_timeout = request_timeout
+        
+        # spawn: 부모의 스레드/MediaPipe 상태를 물려받지 않도록 (Windows와 동일 동작)
+        self._context = multiprocessing.get_context('spawn')
+        self._processes = []
+        self._task_queues = []
+        self._result_conns = []  # 워커별 결과 파이프 (다른 워커가 죽어도 공유 락에 막히지 않음)
+        
+        self._assignments = {}  # sid -> 워커 인덱스
+        self._released = OrderedDict()  # 연결 해제된 sid (다른 워커에 다시 배정하지 않도록)
+        self._last_active = {}  # sid -> 마지막 활동 시간
+        self._pending = {}  # request_id -> (워커 인덱스, Future)
+        self._request_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._respawn_lock = threading.Lock()  # 같은 워커를 여러 스레드가 동시에 재시작하지 않도록
+        self._shutting_down = False
+        self._listener = None
+    
+    def __len__(self):
+        return len(self._assignments)
+    
+    def start(self, timeout=60.0):
+        """
+        워커 프로세스 시작 및 초기화 완료 대기
+        
+        Args:
+            timeout: 워커 초기화 대기 시간 (초)
+        
+        Raises:
+            RuntimeError: 워커 초기화 실패
+        """
+        self._task_queues = [None] * self.num_workers
+        self._result_conns = [None] * self.num_workers
+        self._processes = [None] * self.num_workers
+        
+        for index in range(self.num_workers):
+            self._start_worker(index)
+        
+        # 모든 워커의 초기화 결과 수신
+        deadline = time.time() + timeout
+        waiting = list(self._result_conns)
+        while waiting:
+            if time.time() > deadline:
+                self.shutdown()
+                raise RuntimeError("워커 초기화 시간 초과")
+            for conn in multiprocessing.connection.wait(waiting, timeout=0.5):
+                waiting.remove(conn)
+                try:
+                    _, ok, result = conn.recv()
+                except (EOFError, OSError):
+                    # 초기화 도중 비정상 종료된 워커 - 바로 실패 처리
+                    name = self._processes[self._result_conns.index(conn)].name
+                    self.shutdown()
+                    raise RuntimeError(f"워커 프로세스가 초기화 중 종료되었습니다: {name}")
+                if not ok:
+                    self.shutdown()
+                    raise RuntimeError(result)
+        
+        self._listener = threading.Thread(target=self._listen, name='worker-results', daemon=True)
+        self._listener.start()
+    
+    def _start_worker(self, index):
+        """
+        워커 프로세스 1개 시작 (새 작업 큐/결과 파이프와 함께 index 자리에 배치)
+        
+        Args:
+            index: 워커 인덱스
+        """
+        task_queue = self._context.Queue()
+        result_conn, worker_conn = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=self.worker_main,
+            args=(task_queue, worker_conn, index, self.reference_image_path,
+                  self.video_path, self.library_dir, self.pyramid_levels,
+                  self.motion_prediction, self.max_pool_size),
+            name=f'frame-worker-{index}',
+            daemon=True
+        )
+        process.start()
+        # 쓰기 쪽은 워커만 가지고 있어야 워커 종료 시 읽기 쪽에서 EOF를 받음
+        worker_conn.close()
+        self._task_queues[index] = task_queue
+        self._result_conns[index] = result_conn
+        self._processes[index] = process
+    
+    def _check_worker(self, index):
+        """
+        워커 생존 확인 (종료되었으면 대기 중인 요청을 실패 처리하고 재시작)
+        
+        종료된 워커의 세션 상태는 복구할 수 없으므로 배정을 지우고,
+        해당 세션의 다음 요청은 가장 한가한 워커에서 새 세션으로 시작합니다.
+        
+        Args:
+            index: 워커 인덱스
+        
+        Returns:
+            bool: 워커가 살아 있으면 True
+        """
+        process = self._processes[index]
+        if process.is_alive():
+            return True
+        
+        with self._respawn_lock:
+            # 다른 스레드가 이미 재시작함
+            if self._processes[index] is not process:
+                return False
+            
+            with self._lock:
+                failed = [
+                    request_id for request_id, (worker, _) in self._pending.items()
+                    if worker == index
+                ]
+                futures = [self._pending.pop(request_id)[1] for request_id in failed]
+                orphaned = [sid for sid, worker in self._assignments.items() if worker == index]
+                for sid in orphaned:
+                    del self._assignments[sid]
+                    self._last_active.pop(sid, None)
+            
+            log.error('worker_died', '워커 프로세스가 종료되어 재시작합니다',
+                      worker=index, exitcode=process.exitcode, sessions=len(orphaned),
+                      pending=len(futures))
+            for future in futures:
+                future.set_exception(RuntimeError(f"워커 프로세스 {index}가 종료되었습니다"))
+            
+            # 종료된 워커의 큐는 더 읽히지 않으므로 종료 시 대기하지 않도록 정리
+            old_queue = self._task_queues[index]
+            old_queue.cancel_join_thread()
+            old_queue.close()
+            self._result_conns[index].close()
+            if self._shutting_down:
+                self._task_queues[index] = None
+                self._result_conns[index] = None
+            else:
+                self._start_worker(index)
+        return False
+    
+    def check_workers(self):
+        """
+        모든 워커 생존 확인 (종료된 워커는 재시작)
+        
+        Returns:
+            list: 재시작한 워커 인덱스 목록
+        """
+        return [index for index in range(len(self._processes)) if not self._check_worker(index)]
+    
+    def _listen(self):
+        """
+        워커 결과 수신 스레드 - 요청별 Future 완료 처리
+        
+        결과 파이프가 닫히면(워커 종료) 바로 워커를 재시작하고 대기 중인 요청을 실패 처리합니다.
+        """
+        while not self._shutting_down:
+            conns = {conn: index for index, conn in enumerate(self._result_conns) if conn is not None}
+            try:
+                ready = multiprocessing.connection.wait(list(conns), timeout=self.LIVENESS_INTERVAL)
+            except (OSError, ValueError):
+                # 재시작 중 닫힌 파이프 - 목록을 다시 만들어 대기
+                continue
+            
+            for conn in ready:
+                index = conns[conn]
+                try:
+                    item = conn.recv()
+                except (EOFError, OSError):
+                    # 이미 재시작되어 교체된 파이프가 아니면 워커 종료로 처리
+                    if not self._shutting_down and self._result_conns[index] is conn:
+                        self._processes[index].join(timeout=1.0)
+                        self._check_worker(index)
+                    continue
+                self._complete(item)
+    
+    def _complete(self, item):
+        """
+        워커 결과 1개로 Future 완료
+        
+        Args:
+            item: (request_id, ok, result) 튜플
+        """
+        request_id, ok, result = item
+        if request_id is None:
+            # 재시작한 워커의 초기화 결과
+            if not ok:
+                log.error('worker_init_error', '워커 재시작 실패', error=result)
+            return
+        with self._lock:
+            entry = self._pending.pop(request_id, None)
+        if entry is None:
+            return
+        future = entry[1]
+        if ok:
+            future.set_result(result)
+        else:
+            future.set_exception(RuntimeError(result))
+    
+    def _worker_for(self, sid):
+        """
+        세션이 배정된 워커 인덱스 반환 (없으면 가장 한가한 워커에 배정)
+        
+        Raises:
+            RuntimeError: 연결 해제된 sid
+        """
+        with self._lock:
+            index = self._assignments.get(sid)
+            if index is None:
+                if sid in self._released:
+                    raise RuntimeError(f"연결이 해제된 세션입니다: {sid}")
+                loads = [0] * self.num_workers
+                for assigned in self._assignments.values():
+                    loads[assigned] += 1
+                index = loads.index(min(loads))
+                self._assignments[sid] = index
+            self._last_active[sid] = time.time()
+            return index
+    
+    def _call(self, sid, op, args):
+        """
+        세션이 배정된 워커에 작업 전송 (워커가 종료되었으면 다른 워커에 다시 배정)
+        """
+        index = self._worker_for(sid)
+        if not self._check_worker(index):
+            index = self._worker_for(sid)
+        return self._submit(index, op, sid, args)
+    
+    def _submit(self, index, op, sid, args):
+        """
+        워커에 작업 전송 후 결과 대기
+        
+        대기 중에도 주기적으로 워커 생존을 확인하여, 워커가 종료되면
+        request_timeout까지 기다리지 않고 바로 실패합니다.
+        """
+        future = Future()
+        with self._lock:
+            request_id = next(self._request_ids)
+            self._pending[request_id] = (index, future)
+        
+        self._task_queues[index].put((request_id, op, sid, args))
+        deadline = time.monotonic() + self.request_timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    return future.result(timeout=max(0.0, min(self.LIVENESS_INTERVAL, remaining)))
+                except FutureTimeoutError:
+                    if remaining <= self.LIVENESS_INTERVAL:
+                        raise
+                    # 워커가 종료되었으면 Future가 실패 처리되어 다음 대기에서 바로 예외 발생
+                    self._check_worker(index)
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+    
+    def process_frame(self, sid, image_bytes, network_latency=None, timestamp=None):
+        """
+        세션 워커에서 프레임 처리
+        
+        Args:
+            sid: Socket.IO 세션 ID
+            image_bytes: JPEG 바이트
+            network_latency: 네트워크 왕복 시간 (초, 선택적)
+            timestamp: 프레임 도착 시각 (초, 선택적 - 워커와 같은 time.time 기준)
+        
+        Returns:
+            dict: processed_frame 이벤트 데이터 (디코딩 실패 시 None)
+        """
+        return self._call(sid, 'process_frame', (image_bytes, network_latency, timestamp))
+    
+    def control(self, sid, method, *args):
+        """
+        세션 워커에서 제어 메서드 호출
+        
+        Args:
+            sid: Socket.IO 세션 ID
+            method: PipelineSession 메서드 이름
+            *args: 메서드 인자
+        """
+        return self._call(sid, 'control', (method,) + args)
+    
+    def release(self, sid, blocking=True):
+        """
+        연결 해제된 세션 제거 (이후 같은 sid로는 세션을 다시 만들지 않음)
+        
+        Args:
+            sid: Socket.IO 세션 ID
+            blocking: 워커의 처리 완료까지 대기할지 여부
+        
+        Returns:
+            bool: 제거되었으면 True
+        """
+        with self._lock:
+            self._released[sid] = True
+            while len(self._released) > self.RELEASED_HISTORY:
+                self._released.popitem(last=False)
+        return self._remove(sid, 'release', blocking)
+    
+    def _remove(self, sid, op, blocking):
+        """
+        워커의 세션 제거 요청 (op: 'release' 연결 해제, 'evict' 유휴 제거)
+        """
+        with self._lock:
+            index = self._assignments.pop(sid, None)
+            self._last_active.pop(sid, None)
+        if index is None:
+            return False
+        
+        # 종료된 워커의 세션은 이미 사라짐 (재시작한 워커에는 해당 세션이 없음)
+        if not self._check_worker(index):
+            return True
+        
+        if blocking:
+            return self._submit(index, op, sid, ())
+        
+        # 결과를 기다리지 않음 (요청 ID는 결과 수신 시 무시됨)
+        self._task_queues[index].put((None, op, sid, ()))
+        return True
+    
+    def evict_idle(self, now=None):
+        """
+        유휴 시간이 초과된 세션 제거
+        
+        Args:
+            now: 기준 시간 (기본값: 현재 시간)
+        
+        Returns:
+            list: 제거된 세션 ID 목록
+        """
+        if now is None:
+            now = time.time()
+        
+        # 요청이 없는 동안 종료된 워커도 주기적으로 재시작
+        self.check_workers()
+        
+        with self._lock:
+            idle_sids = [
+                sid for sid, last_active in self._last_active.items()
+                if now - last_active > self.idle_timeout
+            ]
+        
+        return [sid for sid in idle_sids if self._remove(sid, 'evict', blocking=False)]
+    
+    def shutdown(self):
+        """
+        워커 프로세스 종료
+        """
+        with self._respawn_lock:
+            self._shutting_down = True
+        
+        for task_queue in self._task_queues:
+            if task_queue is not None:
+                task_queue.put(None)
+        for process in self._processes:
+            if process is None:
+                continue
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        if self._listener is not None:
+            self._listener.join(timeout=5)
+        for conn in self._result_conns:
+            if conn is not None:
+                conn.close()
+        
+        self._processes = []
+        self._task_queues = []
+        self._result_conns = []